@@ -42,47 +42,56 @@ def main():
     # Osa B vaatii muutoksia -> Esim. tulostuksien (print-funktio) muuttamisen.
     # Kutsutaan funkioita hae_varaukset, joka palauttaa kaikki varaukset oikeilla tietotyypeillä
     varaukset = hae_varaukset("varaukset.txt")
+    # Muutettu: kaikki viisi raporttia kerätään yhdellä läpikäynnillä ilman
+    # varaukset[1:]-kopioita, ja päivämäärä/kellonaika muotoillaan kerran per varaus.
+    vahvistetut = []
+    pitkat = []
+    statukset = []
+    vahvistetut_maara = 0
+    eivahvistetut_maara = 0
+    kokonaistulot = 0
+    rivit = iter(varaukset)
+    next(rivit, None)  # otsikkorivi
+    for varaus in rivit:
+        nimi = varaus[1]
+        tila = varaus[9]
+        pvm = varaus[4].strftime("%d.%m.%Y")
+        klo = varaus[5].strftime("%H.%M")
+        if varaus[8]:  # Vain vahvistetut varaukset
+            vahvistetut.append(f"- {nimi}, {tila}, {pvm} klo {klo}")
+            vahvistetut_maara += 1
+            kokonaistulot += varaus[7]
+            vahstatus = "Vahvistettu"
+        else:
+            eivahvistetut_maara += 1
+            vahstatus = "Ei vahvistettu"
+        if varaus[6] >= 3:
+            kesto = varaus[6]
+            pitkat.append(
+                f"- {nimi}, Päivämäärä: {pvm} , kellonaika: {klo} , kesto: {kesto} tuntia, tila: {tila}")
+        statukset.append(f"- {nimi}-> {vahstatus}")
+
     print("1) Vahvistetut varaukset")
-    for vahvaraus in varaukset[1:]:
-        if vahvaraus[8]:  # Vain vahvistetut varaukset
-            nimi = vahvaraus[1]
-            tila = vahvaraus[9]
-            pvm = vahvaraus[4].strftime("%d.%m.%Y")
-            klo = vahvaraus[5].strftime("%H.%M")
-            print(f"- {nimi}, {tila}, {pvm} klo {klo}")
+    for rivi in vahvistetut:
+        print(rivi)
     print("------------------------------------------------------")
     print("2) Pitkät varaukset(kesto vähintään 3 tuntia  )")
-    for pitvaraus in varaukset[1:]:
-        if pitvaraus[6] >= 3:
-            nimi = pitvaraus[1]
-            pvm = pitvaraus[4].strftime("%d.%m.%Y")
-            kelloaika = pitvaraus[5].strftime("%H.%M")
-            kesto = pitvaraus[6]
-            tila = pitvaraus[9]
-            print(
-                f"- {nimi}, Päivämäärä: {pvm} , kellonaika: {kelloaika} , kesto: {kesto} tuntia, tila: {tila}")
+    for rivi in pitkat:
+        print(rivi)
     print("------------------------------------------------------")
 
     print("3) Varausten vahvistus status:")
-    for status in varaukset[1:]:
-        if status[8]:
-            vahstatus = "Vahvistettu"
-        else:
-            vahstatus = "Ei vahvistettu"
-        nimi = status[1]
-        print(f"- {nimi}-> {vahstatus}")
+    for rivi in statukset:
+        print(rivi)
     print("------------------------------------------------------")
 
     print("4) Yhteenveto vahvistuksista:")
-    vahvistetut_maara = sum(1 for varaus in varaukset[1:] if varaus[8])
-    eivahvistetut_maara = sum(1 for varaus in varaukset[1:] if not varaus[8])
     print(f"- Vahvistettuja varauksia: {vahvistetut_maara}")
     print(f"- Ei vahvistettuja varauksia: {eivahvistetut_maara}")
 
     print("------------------------------------------------------")
 
     print("5) Vahvistettujen varausten kokonaistulot")
-    kokonaistulot = sum(varaus[7] for varaus in varaukset[1:] if varaus[8])
     muutettu_kokonaistulot = f"{kokonaistulot:.2f}".replace('.', ',')
     print(
         f"- Vahvistettujen varausten kokonaistulot: {muutettu_kokonaistulot} euroa")
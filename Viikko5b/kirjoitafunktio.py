@@ -1,14 +1,32 @@
 """Kirjoitusfunktio raportin viemiseen tekstitiedostoon."""
-from typing import List
+import importlib.util
+import os
+import sys
+from typing import Iterable
 
-def kirjoita_raportti(rivit: List[str], polku: str = "raportti.txt") -> None:
-    """Kirjoittaa annetut rivit tekstitiedostoon UTF-8-koodauksella."""
-    with open(polku, "w", encoding="utf-8") as f:
-        for r in rivit:
-            f.write(r + "\n")
 
+def _lataa_yhteiset() -> None:
+    """Rekisteröi repon yhteiset-paketin (../yhteiset) muuttamatta sys.pathia."""
+    if "yhteiset" in sys.modules:
+        return
+    hakemisto = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "yhteiset")
+    spec = importlib.util.spec_from_file_location(
+        "yhteiset", os.path.join(hakemisto, "__init__.py"), submodule_search_locations=[hakemisto])
+    paketti = importlib.util.module_from_spec(spec)
+    sys.modules["yhteiset"] = paketti
+    spec.loader.exec_module(paketti)
 
 
+_lataa_yhteiset()
 
+from yhteiset.raporttikirjoitin import kirjoita_atomisesti
 
 
+def kirjoita_raportti(rivit: Iterable[str], polku: str = "raportti.txt") -> None:
+    """Kirjoittaa annetut rivit tekstitiedostoon UTF-8-koodauksella.
+
+    Kirjoitus tehdään atomisesti väliaikaistiedoston kautta (ks.
+    yhteiset/raporttikirjoitin.py); virhetilanteessa vanha raportti säilyy
+    ehjänä ja virhe nostetaan.
+    """
+    kirjoita_atomisesti(rivit, polku)
@@ -1,7 +1,15 @@
 
 """CSV-lukufunktiot sähkönkäyttö- ja tuotantodatalle."""
 import csv
-from typing import List, Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from muunnafunktio import summaa_wh_csv, wh_kwh, yhdista_summat
+
+# Tätä pienemmät tiedostojoukot käsitellään samassa prosessissa:
+# prosessipoolin käynnistys maksaa enemmän kuin muutaman tiedoston lukeminen.
+RINNAKKAIN_VAHINTAAN = 8
 
 
 def lue_csv(tiedosto: str) -> List[Dict[str, str]]:
@@ -21,3 +29,37 @@ def lue_csvt(tiedostot: List[str]) -> List[Dict[str, str]]:
             print(f"VAROITUS: '{nimi}' ei löytynyt – ohitetaan.")
 
     return yhdistetty
+
+
+def _esikoosta(nimi: str) -> Optional[Dict[str, List[int]]]:
+    """Työprosessi: lukee yhden tiedoston ja palauttaa päiväkohtaiset Wh-summat.
+
+    Prosessien välillä kulkee vain pieni päiväsanakirja, ei rivejä.
+    Puuttuva tiedosto -> None.
+    """
+    try:
+        with open(nimi, newline="", encoding="utf-8") as f:
+            return summaa_wh_csv(csv.reader(f, delimiter=";"))
+    except FileNotFoundError:
+        return None
+
+
+def lue_ja_muunna(tiedostot: List[str], prosesseja: Optional[int] = None) -> Dict[str, List[float]]:
+    """Lukee tiedostot rinnakkain ja palauttaa saman tuloksen kuin muunna_data(lue_csvt(...)).
+
+    Jokainen tiedosto esikoostetaan päiväsummiksi omassa prosessissaan ja
+    osat yhdistetään pääprosessissa. Pienillä tiedostomäärillä (tai
+    prosesseja=1) työ tehdään suoraan tässä prosessissa.
+    """
+    if prosesseja == 1 or len(tiedostot) < RINNAKKAIN_VAHINTAAN:
+        osat = [_esikoosta(nimi) for nimi in tiedostot]
+    else:
+        prosesseja = prosesseja or os.cpu_count() or 1
+        koko = max(1, len(tiedostot) // (prosesseja * 4))
+        with ProcessPoolExecutor(max_workers=prosesseja) as pooli:
+            osat = list(pooli.map(_esikoosta, tiedostot, chunksize=koko))
+
+    for nimi, osa in zip(tiedostot, osat):
+        if osa is None:
+            print(f"VAROITUS: '{nimi}' ei löytynyt – ohitetaan.")
+    return wh_kwh(yhdista_summat(osa for osa in osat if osa is not None))
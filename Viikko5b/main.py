@@ -4,8 +4,8 @@
 
 """Pääohjelma, joka käyttää muita moduuleja CSV-tiedostojen lukemiseen,"""
 
-from luefunktio import lue_csvt
-from muunnafunktio import muunna_data, muodosta_viikkoraporttirivit
+from luefunktio import lue_ja_muunna
+from muunnafunktio import muodosta_viikkoraporttirivit
 from kirjoitafunktio import kirjoita_raportti
 
 
@@ -13,8 +13,7 @@ def main() -> None:
     """Lukee CSV-tiedostot, muuntaa datan ja kirjoittaa raportin."""
     tiedostot = ["viikko41.csv", "viikko42.csv", "viikko43.csv"]
 
-    datat = lue_csvt(tiedostot)
-    paivat = muunna_data(datat)
+    paivat = lue_ja_muunna(tiedostot)
     rivit = muodosta_viikkoraporttirivit(paivat)
     kirjoita_raportti(rivit, "raportti.txt")
     print("Valmis: raportti.txt luotu.")
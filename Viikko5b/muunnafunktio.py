@@ -1,8 +1,7 @@
 """Muuntaa CSV-rivit päivä- ja viikkosummiksi, sekä muodostaa raporttirivit."""
 
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 FI_WEEKDAYS = [
     "maanantai", "tiistai", "keskiviikko",
@@ -10,38 +9,137 @@ FI_WEEKDAYS = [
 ]
 
 
-def muunna_data(rivit: List[Dict[str, str]]) -> Dict[str, List[float]]:
-    """Ryhmittelee datan päivittäin ja laskee summat (Wh -> kWh, 2 desimaalia).
+SARAKKEET = [
+    "Kulutus vaihe 1 Wh", "Kulutus vaihe 2 Wh", "Kulutus vaihe 3 Wh",
+    "Tuotanto vaihe 1 Wh", "Tuotanto vaihe 2 Wh", "Tuotanto vaihe 3 Wh",
+]
 
-    Palauttaa:
-        dict: { 'dd.mm.YYYY': [kul_v1, kul_v2, kul_v3, tuo_v1, tuo_v2, tuo_v3] }
-              arvot kWh-yksikössä kahden desimaalin tarkkuudella.
+
+def _paiva_avain(aika: str) -> str:
+    """ISO-aikaleima -> päiväavain 'dd.mm.YYYY'.
+
+    Tavallisesti riittää aikaleiman alku 'YYYY-MM-DD' (tarkistetaan
+    date.fromisoformatilla), muuten jäsennetään koko aikaleima.
     """
-    paivat: Dict[str, List[float]] = defaultdict(lambda: [0, 0, 0, 0, 0, 0])
+    try:
+        return date.fromisoformat(aika[:10]).strftime("%d.%m.%Y")
+    except ValueError:
+        return datetime.fromisoformat(aika).strftime("%d.%m.%Y")
+
+
+def summaa_wh(rivit: Iterable[Dict[str, str]]) -> Dict[str, List[int]]:
+    """Ryhmittelee datan päivittäin ja laskee vaihekohtaiset summat Wh-kokonaislukuina.
+
+    Kokonaislukusummat voi yhdistää (yhdista_summat) ennen pyöristystä,
+    joten tiedostot voidaan käsitellä erikseen, esim. eri prosesseissa.
+    """
+    paivat: Dict[str, List[int]] = {}
+    # Päiväavain muodostetaan kerran päivää kohden, ei joka tunnille
+    avaimet: Dict[str, str] = {}
 
     for r in rivit:
         aika = r.get("Aika")
         if not aika:
             continue
-        # Päivä avaimena muodossa dd.mm.YYYY
-        pvm = datetime.fromisoformat(aika).strftime("%d.%m.%Y")
-
-        sarakkeet = [
-            "Kulutus vaihe 1 Wh", "Kulutus vaihe 2 Wh", "Kulutus vaihe 3 Wh",
-            "Tuotanto vaihe 1 Wh", "Tuotanto vaihe 2 Wh", "Tuotanto vaihe 3 Wh",
-        ]
-        for i, s in enumerate(sarakkeet):
+        alku = aika[:10]
+        pvm = avaimet.get(alku)
+        if pvm is None:
+            pvm = avaimet[alku] = _paiva_avain(aika)
+        summat = paivat.get(pvm)
+        if summat is None:
+            summat = paivat[pvm] = [0, 0, 0, 0, 0, 0]
+
+        for i, s in enumerate(SARAKKEET):
             try:
-                paivat[pvm][i] += int(r.get(s, 0))
+                summat[i] += int(r.get(s, 0))
             except (TypeError, ValueError):
                 # Jos puuttuu tai ei numeroa -> ohitetaan (käsitellään nollana)
                 pass
 
-    # Wh -> kWh ja pyöristys 2 desimaaliin
-    for pvm in paivat:
-        paivat[pvm] = [round(x / 1000, 2) for x in paivat[pvm]]
+    return paivat
+
+
+def summaa_wh_csv(rivit: Iterable[List[str]]) -> Dict[str, List[int]]:
+    """Sama kuin summaa_wh, mutta suoraan csv.reader-riveistä (ensimmäinen rivi otsikko).
+
+    Yhdistetty jäsennys ja koostus: sarakkeiden sijainnit haetaan otsikosta
+    kerran, päiväavain muodostetaan kerran päivää kohden ja rivin kuusi
+    arvoa lisätään suoraan päivän kokonaislukutaulukkoon. Rivikohtaisia
+    sanakirjoja ei luoda lainkaan.
+    """
+    rivit = iter(rivit)
+    otsikko = next(rivit, [])
+    if "Aika" not in otsikko:
+        return {}
+    i_aika = otsikko.index("Aika")
+    # Puuttuva sarake osoittaa rivin ulkopuolelle -> käsitellään nollana
+    sijainnit = [otsikko.index(s) if s in otsikko else len(otsikko) + 1 for s in SARAKKEET]
+    k1, k2, k3, t1, t2, t3 = sijainnit
+    pisin = max([i_aika] + sijainnit)
+
+    paivat: Dict[str, List[int]] = {}
+    avaimet: Dict[str, str] = {}
+    for r in rivit:
+        if len(r) <= i_aika:
+            continue
+        aika = r[i_aika]
+        if not aika:
+            continue
+        alku = aika[:10]
+        pvm = avaimet.get(alku)
+        if pvm is None:
+            pvm = avaimet[alku] = _paiva_avain(aika)
+        summat = paivat.get(pvm)
+        if summat is None:
+            summat = paivat[pvm] = [0, 0, 0, 0, 0, 0]
+
+        try:
+            # Nopea polku: kaikki kuusi arvoa ovat kokonaislukuja
+            if len(r) <= pisin:
+                raise IndexError
+            a, b, c, d, e, f = int(r[k1]), int(r[k2]), int(r[k3]), int(r[t1]), int(r[t2]), int(r[t3])
+        except (IndexError, ValueError):
+            for i, k in enumerate(sijainnit):
+                try:
+                    summat[i] += int(r[k])
+                except (IndexError, ValueError):
+                    pass
+            continue
+        summat[0] += a
+        summat[1] += b
+        summat[2] += c
+        summat[3] += d
+        summat[4] += e
+        summat[5] += f
+
+    return paivat
+
+
+def yhdista_summat(osat: Iterable[Dict[str, List[int]]]) -> Dict[str, List[int]]:
+    """Yhdistää summaa_wh-tulokset annetussa järjestyksessä (päivien järjestys säilyy)."""
+    yhdistetty: Dict[str, List[int]] = {}
+    for osa in osat:
+        for pvm, arvot in osa.items():
+            if pvm in yhdistetty:
+                yhdistetty[pvm] = [a + b for a, b in zip(yhdistetty[pvm], arvot)]
+            else:
+                yhdistetty[pvm] = list(arvot)
+    return yhdistetty
 
-    return dict(paivat)
+
+def wh_kwh(paivat: Dict[str, List[int]]) -> Dict[str, List[float]]:
+    """Wh -> kWh ja pyöristys 2 desimaaliin."""
+    return {pvm: [round(x / 1000, 2) for x in arvot] for pvm, arvot in paivat.items()}
+
+
+def muunna_data(rivit: List[Dict[str, str]]) -> Dict[str, List[float]]:
+    """Ryhmittelee datan päivittäin ja laskee summat (Wh -> kWh, 2 desimaalia).
+
+    Palauttaa:
+        dict: { 'dd.mm.YYYY': [kul_v1, kul_v2, kul_v3, tuo_v1, tuo_v2, tuo_v3] }
+              arvot kWh-yksikössä kahden desimaalin tarkkuudella.
+    """
+    return wh_kwh(summaa_wh(rivit))
 
 
 def _fmt(x: float) -> str:
@@ -49,59 +147,77 @@ def _fmt(x: float) -> str:
     return f"{x:.2f}".replace(".", ",")
 
 
-def _parse_pvm(pvm_str: str) -> datetime:
-    """Jäsentää 'dd.mm.YYYY' -> datetime."""
-    return datetime.strptime(pvm_str, "%d.%m.%Y")
+def _pvm_paivaksi(pvm_str: str) -> date:
+    """Nopea 'dd.mm.YYYY' -> date ilman strptimea (virheellinen -> ValueError)."""
+    pv, kk, vv = pvm_str.split(".")
+    return date(int(vv), int(kk), int(pv))
 
 
-def muodosta_viikkoraporttirivit(paivat: Dict[str, List[float]]) -> List[str]:
-    """Muotoilee raporttirivit viikkokohtaisilla otsikoilla ja taulukolla (41–43)."""
-    # Ryhmittele viikoiksi
-    weeks: Dict[int, Dict[Tuple[str, str], List[float]]] = defaultdict(dict)
-    for pvm_str, vals in paivat.items():
-        dt = _parse_pvm(pvm_str)
-        week = dt.isocalendar()[1]
-        weekday = FI_WEEKDAYS[dt.weekday()]
-        weeks[week][(weekday, pvm_str)] = vals
+def jarjesta_paivat(paivat: Dict[str, List[float]]) -> List[Tuple[date, str, List[float]]]:
+    """Jäsentää päiväavaimet kerran ja palauttaa rivit päivämääräjärjestyksessä.
 
-    rivit: List[str] = []
+    Palauttaa: [(date, 'dd.mm.YYYY', [kul_v1, ..., tuo_v3]), ...]
+    """
+    return sorted(((_pvm_paivaksi(p), p, v) for p, v in paivat.items()), key=lambda r: r[0])
 
-    for week in sorted(weeks.keys()):
-        # Tulostetaan vain viikot 41–43 (tehtävänanto)
-        if week not in (41, 42, 43):
-            continue
 
-        rivit.append(
-            f"Viikon {week} sähkönkulutus ja -tuotanto (kWh, vaiheittain)")
-        rivit.append(
-            "Päivä        Pvm           Kulutus [kWh]                   Tuotanto [kWh]")
-        rivit.append(
-            "                               v1      v2      v3         v1      v2      v3")
-        rivit.append("-" * 77)
+def _viikkovali(viikot: Iterable[int]) -> str:
+    """Viikkosuodattimen kuvaus yhteenvetoriville, esim. 'viikot 41–43' tai 'viikko 5'."""
+    v = sorted(set(viikot))
+    if len(v) == 1:
+        return f"viikko {v[0]}"
+    if v and v == list(range(v[0], v[-1] + 1)):
+        return f"viikot {v[0]}–{v[-1]}"
+    return "viikot " + ", ".join(str(x) for x in v)
 
-        items = list(weeks[week].items())
-        items.sort(key=lambda kv: _parse_pvm(kv[0][1]))
 
-        for (weekday, pvm_str), vals in items:
-            v1, v2, v3, t1, t2, t3 = vals
-            kul = f"{_fmt(v1):>7} {_fmt(v2):>7} {_fmt(v3):>7}"
-            tuo = f"{_fmt(t1):>7} {_fmt(t2):>7} {_fmt(t3):>7}"
-            rivit.append(f"{weekday:<12} {pvm_str:<12}  {kul:<25} {tuo}")
+def muodosta_viikkoraporttirivit(paivat: Dict[str, List[float]],
+                                 viikot: Optional[Iterable[int]] = (41, 42, 43)) -> List[str]:
+    """Muotoilee raporttirivit viikkokohtaisilla otsikoilla ja taulukolla.
 
-        rivit.append("")  # tyhjä rivi viikkojen väliin
+    viikot: tulostettavat ISO-viikkonumerot (oletus 41–43, tehtävänanto),
+            None = kaikki viikot.
+    Päiväavaimet jäsennetään kerran; viikkoryhmittely, viikon sisäinen
+    järjestys ja yhteissummat tehdään samalla läpikäynnillä.
+    """
+    sallitut = None if viikot is None else set(viikot)
+    rivit: List[str] = []
+    total = [0.0] * 6
+    nykyinen = None
 
-    # (Valinnainen) Kokonaissummat viikoista 41–43
-    total = [0.0]*6
-    for week, data in weeks.items():
-        if week not in (41, 42, 43):
+    for d, pvm_str, vals in jarjesta_paivat(paivat):
+        iso_vuosi, week, _ = d.isocalendar()
+        if sallitut is not None and week not in sallitut:
             continue
-        for vals in data.values():
-            for i in range(6):
-                total[i] += vals[i]
 
+        if (iso_vuosi, week) != nykyinen:
+            if nykyinen is not None:
+                rivit.append("")  # tyhjä rivi viikkojen väliin
+            nykyinen = (iso_vuosi, week)
+            rivit.append(
+                f"Viikon {week} sähkönkulutus ja -tuotanto (kWh, vaiheittain)")
+            rivit.append(
+                "Päivä        Pvm           Kulutus [kWh]                   Tuotanto [kWh]")
+            rivit.append(
+                "                               v1      v2      v3         v1      v2      v3")
+            rivit.append("-" * 77)
+
+        weekday = FI_WEEKDAYS[d.weekday()]
+        v1, v2, v3, t1, t2, t3 = vals
+        kul = f"{_fmt(v1):>7} {_fmt(v2):>7} {_fmt(v3):>7}"
+        tuo = f"{_fmt(t1):>7} {_fmt(t2):>7} {_fmt(t3):>7}"
+        rivit.append(f"{weekday:<12} {pvm_str:<12}  {kul:<25} {tuo}")
+        for i in range(6):
+            total[i] += vals[i]
+
+    if nykyinen is not None:
+        rivit.append("")
+
+    # (Valinnainen) Kokonaissummat valituista viikoista
     if any(total):
         v1, v2, v3, t1, t2, t3 = total
-        rivit.append("Yhteensä (viikot 41–43):")
+        otsikko = "kaikki viikot" if sallitut is None else _viikkovali(sallitut)
+        rivit.append(f"Yhteensä ({otsikko}):")
         rivit.append(
             f"{'':<12} {'':<12}  "
             f"{_fmt(v1):>7} {_fmt(v2):>7} {_fmt(v3):>7}    "
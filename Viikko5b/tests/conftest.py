@@ -0,0 +1,45 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Viikko5b:n testit: moduulit ovat skriptihakemistossa, joten se lisätään polulle.
+
+viikkotiedostot-fixture kirjoittaa satunnaisia viikkoXX.csv-muotoisia tiedostoja.
+"""
+
+import csv
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from muunnafunktio import SARAKKEET  # noqa: E402
+
+
+def _kirjoita_viikko(polku, alku: datetime, satunnainen: random.Random) -> None:
+    """Kirjoittaa viikon tuntirivit (osa tunneista puuttuu, osa soluista tyhjiä)."""
+    with open(polku, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["Aika"] + SARAKKEET)
+        for h in range(7 * 24):
+            if satunnainen.random() < 0.02:
+                continue
+            arvot = [satunnainen.randint(0, 2000) for _ in SARAKKEET]
+            if satunnainen.random() < 0.01:
+                arvot[satunnainen.randrange(6)] = ""
+            w.writerow([(alku + timedelta(hours=h)).isoformat()] + arvot)
+
+
+@pytest.fixture
+def viikkotiedostot(tmp_path):
+    """Kymmenen peräkkäistä viikkotiedostoa (viikot 38–47), polut listana."""
+    satunnainen = random.Random(5)
+    polut = []
+    for i in range(10):
+        polku = tmp_path / f"viikko{38 + i}.csv"
+        _kirjoita_viikko(polku, datetime(2025, 9, 15) + timedelta(weeks=i), satunnainen)
+        polut.append(str(polku))
+    return polut
@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import pytest
+
+from luefunktio import lue_csvt, lue_ja_muunna
+from muunnafunktio import muunna_data
+
+
+@pytest.mark.parametrize("prosesseja", [1, 2, None])
+def test_kuten_muunna_data(viikkotiedostot, prosesseja):
+    odotettu = muunna_data(lue_csvt(viikkotiedostot))
+    saatu = lue_ja_muunna(viikkotiedostot, prosesseja)
+    assert saatu == odotettu
+    assert list(saatu) == list(odotettu)
+
+
+def test_pieni_joukko_samassa_prosessissa(viikkotiedostot):
+    osa = viikkotiedostot[:3]
+    assert lue_ja_muunna(osa) == muunna_data(lue_csvt(osa))
+
+
+def test_puuttuva_tiedosto_ohitetaan(viikkotiedostot, tmp_path, capsys):
+    tiedostot = viikkotiedostot[:5] + [str(tmp_path / "puuttuu.csv")] + viikkotiedostot[5:]
+    assert lue_ja_muunna(tiedostot, 2) == muunna_data(lue_csvt(viikkotiedostot))
+    assert "puuttuu.csv" in capsys.readouterr().out
@@ -0,0 +1,139 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import csv
+import io
+import os
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from luefunktio import lue_csv, lue_csvt
+from muunnafunktio import (
+    FI_WEEKDAYS, SARAKKEET, _fmt, muodosta_viikkoraporttirivit, muunna_data, summaa_wh,
+    summaa_wh_csv, wh_kwh,
+)
+
+HAKEMISTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _alkuperainen(rivit):
+    """Alkuperäinen muunna_data: fromisoformat/strftime ja int() joka solulle."""
+    paivat = {}
+    for r in rivit:
+        aika = r.get("Aika")
+        if not aika:
+            continue
+        summat = paivat.setdefault(datetime.fromisoformat(aika).strftime("%d.%m.%Y"), [0] * 6)
+        for i, s in enumerate(SARAKKEET):
+            try:
+                summat[i] += int(r.get(s, 0))
+            except (TypeError, ValueError):
+                pass
+    return {p: [round(x / 1000, 2) for x in v] for p, v in paivat.items()}
+
+
+def _csv(teksti):
+    return list(csv.reader(io.StringIO(teksti), delimiter=";"))
+
+
+def test_yhdistetty_ydin_kuten_alkuperainen(viikkotiedostot):
+    for polku in viikkotiedostot:
+        odotettu = _alkuperainen(lue_csv(polku))
+        assert muunna_data(lue_csv(polku)) == odotettu
+        with open(polku, newline="", encoding="utf-8") as f:
+            saatu = wh_kwh(summaa_wh_csv(csv.reader(f, delimiter=";")))
+        assert saatu == odotettu
+        assert list(saatu) == list(odotettu)
+
+
+@pytest.mark.parametrize("teksti", [
+    # puuttuva sarake, tyhjä ja ei-numeerinen solu, lyhyt rivi, tyhjä aika
+    "Aika;Kulutus vaihe 1 Wh;Tuotanto vaihe 3 Wh\n"
+    "2025-10-06T00:00:00;10;x\n2025-10-06T01:00:00;;5\n2025-10-06T02:00:00\n;7;7\n",
+    # sarakkeet eri järjestyksessä ja aikaleima välilyönnillä ja vyöhykkeellä
+    "Tuotanto vaihe 1 Wh;Aika;Kulutus vaihe 2 Wh\n"
+    "3;2025-10-07 23:00:00+03:00;4\n1;2025-10-08T00:00:00;2\n",
+    "Aika\n2025-10-06T00:00:00\n",
+    "",
+])
+def test_poikkeavat_rivit_kuten_sanakirjapolku(teksti):
+    rivit = _csv(teksti)
+    sanakirjat = [dict(zip(rivit[0], r)) for r in rivit[1:]] if rivit else []
+    assert wh_kwh(summaa_wh_csv(rivit)) == _alkuperainen(sanakirjat)
+    assert wh_kwh(summaa_wh(sanakirjat)) == _alkuperainen(sanakirjat)
+
+
+def test_ilman_aikasaraketta_tyhja():
+    assert summaa_wh_csv(_csv("Kulutus vaihe 1 Wh\n5\n")) == {}
+
+
+def _alkuperainen_raportti(paivat):
+    """Alkuperäinen muodosta_viikkoraporttirivit (strptime, viikot 41–43)."""
+    viikot = defaultdict(dict)
+    for pvm, arvot in paivat.items():
+        dt = datetime.strptime(pvm, "%d.%m.%Y")
+        viikot[dt.isocalendar()[1]][(FI_WEEKDAYS[dt.weekday()], pvm)] = arvot
+    rivit = []
+    for viikko in sorted(viikot):
+        if viikko not in (41, 42, 43):
+            continue
+        rivit.append(f"Viikon {viikko} sähkönkulutus ja -tuotanto (kWh, vaiheittain)")
+        rivit.append("Päivä        Pvm           Kulutus [kWh]                   Tuotanto [kWh]")
+        rivit.append("                               v1      v2      v3         v1      v2      v3")
+        rivit.append("-" * 77)
+        for (paiva, pvm), v in sorted(viikot[viikko].items(),
+                                     key=lambda kv: datetime.strptime(kv[0][1], "%d.%m.%Y")):
+            kul = f"{_fmt(v[0]):>7} {_fmt(v[1]):>7} {_fmt(v[2]):>7}"
+            tuo = f"{_fmt(v[3]):>7} {_fmt(v[4]):>7} {_fmt(v[5]):>7}"
+            rivit.append(f"{paiva:<12} {pvm:<12}  {kul:<25} {tuo}")
+        rivit.append("")
+    yht = [0.0] * 6
+    for viikko, data in viikot.items():
+        if viikko in (41, 42, 43):
+            for v in data.values():
+                for i in range(6):
+                    yht[i] += v[i]
+    if any(yht):
+        rivit.append("Yhteensä (viikot 41–43):")
+        rivit.append(f"{'':<12} {'':<12}  "
+                     f"{_fmt(yht[0]):>7} {_fmt(yht[1]):>7} {_fmt(yht[2]):>7}    "
+                     f"{_fmt(yht[3]):>7} {_fmt(yht[4]):>7} {_fmt(yht[5]):>7}")
+    return rivit
+
+
+def test_raportti_kuten_alkuperainen(viikkotiedostot):
+    paivat = muunna_data(lue_csvt(viikkotiedostot))
+    assert muodosta_viikkoraporttirivit(paivat) == _alkuperainen_raportti(paivat)
+    # päivien syöttöjärjestys ei vaikuta raporttiin
+    kaannetty = dict(reversed(list(paivat.items())))
+    assert muodosta_viikkoraporttirivit(kaannetty) == _alkuperainen_raportti(paivat)
+
+
+def test_raportti_kuten_tallennettu():
+    tiedostot = [os.path.join(HAKEMISTO, f"viikko{v}.csv") for v in (41, 42, 43)]
+    with open(os.path.join(HAKEMISTO, "raportti.txt"), encoding="utf-8") as f:
+        tallennettu = f.read().splitlines()
+    assert muodosta_viikkoraporttirivit(muunna_data(lue_csvt(tiedostot))) == tallennettu
+
+
+def test_viikkosuodatin_ja_otsikko(viikkotiedostot):
+    paivat = muunna_data(lue_csvt(viikkotiedostot))
+    kaikki = muodosta_viikkoraporttirivit(paivat, None)
+    assert [r for r in kaikki if r.startswith("Viikon ")] == [
+        f"Viikon {v} sähkönkulutus ja -tuotanto (kWh, vaiheittain)" for v in range(38, 48)]
+    assert "Yhteensä (kaikki viikot):" in kaikki
+    assert "Yhteensä (viikko 40):" in muodosta_viikkoraporttirivit(paivat, [40])
+    assert "Yhteensä (viikot 39, 45):" in muodosta_viikkoraporttirivit(paivat, [45, 39])
+    assert muodosta_viikkoraporttirivit(paivat, [1]) == []
+
+
+def test_iso_vuoden_vaihde_samaan_viikkoon():
+    paivat = {"29.12.2025": [1.0] * 6, "01.01.2026": [2.0] * 6, "01.01.2025": [3.0] * 6}
+    rivit = muodosta_viikkoraporttirivit(paivat, None)
+    # 1.1.2025 on vuoden 2025 viikko 1, 29.12.2025 ja 1.1.2026 vuoden 2026 viikko 1
+    assert [r for r in rivit if r.startswith("Viikon ")] == [
+        "Viikon 1 sähkönkulutus ja -tuotanto (kWh, vaiheittain)"] * 2
+    paivarivit = [r.split()[1] for r in rivit if r.split()[:1] and r.split()[0] in FI_WEEKDAYS]
+    assert paivarivit == ["01.01.2025", "29.12.2025", "01.01.2026"]
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+
+"""Suorituskykyvertailu: muunna_data vs. yhdistetty jäsennys ja koostus (summaa_wh_csv).
+
+Luo vuoden tuntidatan (8760 riviä) väliaikaiseen CSV-tiedostoon, tarkistaa
+että molemmat polut antavat saman tuloksen ja tulostaa ajat.
+Ajo: python vertailu.py
+"""
+
+import csv
+import os
+import random
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+from luefunktio import lue_csv
+from muunnafunktio import SARAKKEET, muunna_data, summaa_wh_csv, wh_kwh
+
+
+def _luo_vuosi(polku: str) -> None:
+    """Kirjoittaa vuoden tuntirivit viikkoXX.csv-muodossa."""
+    alku = datetime(2025, 1, 1)
+    with open(polku, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["Aika"] + SARAKKEET)
+        for h in range(365 * 24):
+            aika = (alku + timedelta(hours=h)).isoformat()
+            w.writerow([aika] + [random.randint(0, 2000) for _ in SARAKKEET])
+
+
+def _fuusio(polku: str):
+    with open(polku, newline="", encoding="utf-8") as f:
+        return wh_kwh(summaa_wh_csv(csv.reader(f, delimiter=";")))
+
+
+def main() -> None:
+    """Ajaa vertailun ja tulostaa tulokset."""
+    with tempfile.TemporaryDirectory() as hakemisto:
+        polku = os.path.join(hakemisto, "vuosi.csv")
+        _luo_vuosi(polku)
+
+        if muunna_data(lue_csv(polku)) != _fuusio(polku):
+            raise SystemExit("VIRHE: tulokset eroavat")
+
+        kerrat = 10
+        vanha = timeit.timeit(lambda: muunna_data(lue_csv(polku)), number=kerrat) / kerrat
+        uusi = timeit.timeit(lambda: _fuusio(polku), number=kerrat) / kerrat
+        print(f"muunna_data(lue_csv):  {vanha * 1000:8.1f} ms")
+        print(f"summaa_wh_csv:         {uusi * 1000:8.1f} ms")
+        print(f"Nopeutus:              {vanha / uusi:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Aikavyöhyketietoinen päiväjako (Viikko6).
+
+Aikaleimat muunnetaan ensin UTC-sekunneiksi (epoch) ja päivä lasketaan
+valitun vyöhykkeen (esim. Europe/Helsinki) paikallisajassa, ei rivin oman
+poikkeaman mukaan. Vyöhykkeen kesäaikasiirtymät lasketaan vuosittain
+kerran siirtymätauluksi (siirtymähetki UTC-sekunteina -> poikkeama), joten
+rivikohtaisesti tarvitaan vain binäärihaku ja kokonaislukujakolasku:
+
+    paivanumero = (epoch + poikkeama) // 86400     (päiviä 1.1.1970 alkaen)
+
+Kesäajan alkamispäivässä on 23 tuntia ja päättymispäivässä 25; ne osuvat
+oikeille päiville, koska jako tehdään todellisen hetken perusteella.
+Kuukausiavain (vuosi * 12 + kk - 1) lasketaan päivänumerosta pelkillä
+kokonaisluvuilla, joten se toimii myös NumPy-taulukoille.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:  # numpy on valinnainen riippuvuus
+    np = None
+
+OLETUSVYOHYKE = "Europe/Helsinki"
+
+_PAIVA = 86400
+_EPOCH_ORDINAALI = date(1970, 1, 1).toordinal()
+
+
+def _vuoden_alku(vuosi: int) -> int:
+    """Vuoden alku (1.1. klo 00 UTC) epoch-sekunteina."""
+    return (date(vuosi, 1, 1).toordinal() - _EPOCH_ORDINAALI) * _PAIVA
+
+
+def paivanumero_paivaksi(paivanumero: int) -> date:
+    """Päivänumero (päiviä 1.1.1970 alkaen) -> date."""
+    return date.fromordinal(int(paivanumero) + _EPOCH_ORDINAALI)
+
+
+def paiva_paivanumeroksi(d: date) -> int:
+    return d.toordinal() - _EPOCH_ORDINAALI
+
+
+def kuukausiavain(paivanumero):
+    """Päivänumero -> vuosi * 12 + kk - 1 kokonaislukulaskuna (int tai NumPy-taulukko).
+
+    Algoritmi: H. Hinnant, "chrono-Compatible Low-Level Date Algorithms" (civil_from_days).
+    """
+    z = paivanumero + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    kk = mp + 3 - 12 * (mp >= 10)
+    vuosi = yoe + era * 400 + (kk <= 2)
+    return vuosi * 12 + kk - 1
+
+
+class Vyohyke:
+    """Vyöhykkeen poikkeamat esilaskettuna siirtymätauluna.
+
+    Taulu kattaa kokonaisia vuosia ja laajenee tarvittaessa: rajat[i] on
+    UTC-hetki, josta alkaen poikkeamat[i] (sekunteina) on voimassa.
+    """
+
+    def __init__(self, nimi: str = OLETUSVYOHYKE) -> None:
+        self.nimi = nimi
+        self._tz = ZoneInfo(nimi)
+        self._vuodet: Optional[Tuple[int, int]] = None
+        self._kattaa = (0, 0)   # taulun kattamat hetket [alku, loppu)
+        self.rajat: List[int] = []
+        self.poikkeamat: List[int] = []
+        self._np_rajat = None
+        self._np_poikkeamat = None
+
+    def _poikkeama_hetkella(self, t: int) -> int:
+        return int(datetime.fromtimestamp(t, self._tz).utcoffset().total_seconds())
+
+    def _vuoden_siirtymat(self, vuosi: int) -> List[Tuple[int, int]]:
+        """Vuoden siirtymät [(hetki, uusi poikkeama)]; ensimmäinen on vuoden alku.
+
+        Poikkeama tarkistetaan kerran vuorokaudessa; muutoskohdasta haetaan
+        siirtymän tarkka sekunti puolitushaulla.
+        """
+        alku = _vuoden_alku(vuosi)
+        siirtymat = [(alku, self._poikkeama_hetkella(alku))]
+        edellinen_t, edellinen = alku, siirtymat[0][1]
+        for t in range(alku + _PAIVA, _vuoden_alku(vuosi + 1) + 1, _PAIVA):
+            p = self._poikkeama_hetkella(t)
+            if p != edellinen:
+                a, b = edellinen_t, t   # poikkeama(a) = edellinen, poikkeama(b) = p
+                while b - a > 1:
+                    keski = (a + b) // 2
+                    if self._poikkeama_hetkella(keski) == edellinen:
+                        a = keski
+                    else:
+                        b = keski
+                if b < _vuoden_alku(vuosi + 1):
+                    siirtymat.append((b, p))
+                edellinen = p
+            edellinen_t = t
+        return siirtymat
+
+    def kata(self, ensimmainen: int, viimeinen: int) -> None:
+        """Varmistaa, että taulu kattaa vuodet ensimmainen..viimeinen."""
+        if self._vuodet is not None:
+            if self._vuodet[0] <= ensimmainen and viimeinen <= self._vuodet[1]:
+                return
+            ensimmainen = min(ensimmainen, self._vuodet[0])
+            viimeinen = max(viimeinen, self._vuodet[1])
+        rajat, poikkeamat = [], []
+        for vuosi in range(ensimmainen, viimeinen + 1):
+            for t, p in self._vuoden_siirtymat(vuosi):
+                if poikkeamat and poikkeamat[-1] == p:
+                    continue
+                rajat.append(t)
+                poikkeamat.append(p)
+        self.rajat, self.poikkeamat = rajat, poikkeamat
+        self._vuodet = (ensimmainen, viimeinen)
+        self._kattaa = (_vuoden_alku(ensimmainen), _vuoden_alku(viimeinen + 1))
+        self._np_rajat = self._np_poikkeamat = None
+
+    def _kata_hetket(self, pienin: int, suurin: int) -> None:
+        # UTC-vuosi +-1, jotta vuoden vaihteen paikallisaika on katettu
+        self.kata(datetime.fromtimestamp(pienin, timezone.utc).year - 1,
+                  datetime.fromtimestamp(suurin, timezone.utc).year + 1)
+
+    def siirtymat(self, vuosi: int) -> List[Tuple[datetime, int]]:
+        """Vuoden kesäaikasiirtymät: [(hetki UTC, uusi poikkeama sekunteina)]."""
+        self.kata(vuosi, vuosi)
+        a, b = _vuoden_alku(vuosi), _vuoden_alku(vuosi + 1)
+        return [
+            (datetime.fromtimestamp(t, timezone.utc), p)
+            for t, p in zip(self.rajat[1:], self.poikkeamat[1:])
+            if a <= t < b
+        ]
+
+    def poikkeama(self, epoch: int) -> int:
+        """Vyöhykkeen poikkeama UTC:stä sekunteina hetkellä epoch."""
+        if not self._kattaa[0] <= epoch < self._kattaa[1]:
+            self._kata_hetket(epoch, epoch)
+        return self.poikkeamat[bisect_right(self.rajat, epoch) - 1]
+
+    def paivanumero(self, epoch: int) -> int:
+        """Paikallisen päivän numero (päiviä 1.1.1970 alkaen) hetkelle epoch."""
+        return (epoch + self.poikkeama(epoch)) // _PAIVA
+
+    def paiva(self, epoch: int) -> date:
+        return paivanumero_paivaksi(self.paivanumero(epoch))
+
+    def paivan_alku(self, d: date) -> int:
+        """Paikallisen päivän d alkuhetki (klo 00.00) epoch-sekunteina."""
+        keskiyo = paiva_paivanumeroksi(d) * _PAIVA
+        # Keskiyön poikkeama: kokeillaan päivän alun poikkeamalla ja korjataan
+        t = keskiyo - self.poikkeama(keskiyo)
+        return keskiyo - self.poikkeama(t)
+
+    def paivan_tunnit(self, d: date) -> int:
+        """Paikallisen päivän pituus tunteina (23, 24 tai 25 kesäaikasiirtymien mukaan)."""
+        seuraava = date.fromordinal(d.toordinal() + 1)
+        return (self.paivan_alku(seuraava) - self.paivan_alku(d)) // 3600
+
+    def paikalliset(self, epochit: "np.ndarray") -> "np.ndarray":
+        """Vektoroitu: int64-epoch-taulukko -> paikallisaika sekunteina (epoch + poikkeama)."""
+        if len(epochit) == 0:
+            return np.zeros(0, dtype=np.int64)
+        pienin, suurin = int(epochit.min()), int(epochit.max())
+        if not (self._kattaa[0] <= pienin and suurin < self._kattaa[1]):
+            self._kata_hetket(pienin, suurin)
+        if self._np_rajat is None:
+            self._np_rajat = np.array(self.rajat, dtype=np.int64)
+            self._np_poikkeamat = np.array(self.poikkeamat, dtype=np.int64)
+        i = np.searchsorted(self._np_rajat, epochit, side="right") - 1
+        return epochit + self._np_poikkeamat[i]
+
+    def epochit_paikallisista(self, paikalliset: "np.ndarray") -> "np.ndarray":
+        """Vektoroitu käänteinen paikalliset: paikallisaika sekunteina -> int64-epoch.
+
+        Tulkinta on sama kuin aikaleima_epochiksi-funktiossa (fold=0): syksyllä
+        kahdesti esiintyvä hetki on ensimmäinen (kesäaika) ja keväällä puuttuva
+        hetki luetaan siirtymää edeltävällä poikkeamalla.
+        """
+        if len(paikalliset) == 0:
+            return np.zeros(0, dtype=np.int64)
+        pienin, suurin = int(paikalliset.min()), int(paikalliset.max())
+        if not (self._kattaa[0] <= pienin and suurin < self._kattaa[1]):
+            self._kata_hetket(pienin, suurin)
+        if self._np_rajat is None:
+            self._np_rajat = np.array(self.rajat, dtype=np.int64)
+            self._np_poikkeamat = np.array(self.poikkeamat, dtype=np.int64)
+        # Siirtymän i jälkeinen poikkeama on voimassa paikallisajasta
+        # rajat[i] + max(edellinen, uusi) alkaen (aukon tai toiston jälkeen)
+        poikkeamat = self._np_poikkeamat
+        paikalliset_rajat = self._np_rajat[1:] + np.maximum(poikkeamat[:-1], poikkeamat[1:])
+        i = np.searchsorted(paikalliset_rajat, paikalliset, side="right")
+        return paikalliset - poikkeamat[i]
+
+    def paivanumerot(self, epochit: "np.ndarray") -> "np.ndarray":
+        """Vektoroitu paivanumero: int64-epoch-taulukko -> int64-päivänumerot."""
+        return self.paikalliset(epochit) // _PAIVA
+
+
+_VYOHYKKEET: Dict[str, Vyohyke] = {}
+
+
+def hae_vyohyke(nimi: str = OLETUSVYOHYKE) -> Vyohyke:
+    """Palauttaa vyöhykkeen (siirtymätaulu lasketaan kerran nimeä kohden)."""
+    v = _VYOHYKKEET.get(nimi)
+    if v is None:
+        v = _VYOHYKKEET[nimi] = Vyohyke(nimi)
+    return v
+
+
+def aikaleima_epochiksi(aika: str, vyohyke: Optional[Vyohyke] = None) -> int:
+    """ISO-aikaleima -> UTC-sekunnit. Poikkeamaton aikaleima tulkitaan vyöhykkeen paikallisajaksi."""
+    dt = datetime.fromisoformat(aika)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=(vyohyke or hae_vyohyke())._tz)
+    return int(dt.timestamp())
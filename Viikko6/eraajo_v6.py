@@ -0,0 +1,88 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Eräajo (Viikko6): monta raporttia yhdellä käynnistyksellä ilman kyselyitä.
+
+Data etsitään ja luetaan kerran (osiovarasto_v6), minkä jälkeen ajetaan
+kaikki annetut raporttimääritteet. Sama raportti muodostetaan vain kerran
+(raporttimuisti_v6). Määritteet annetaan argumentteina tai tiedostosta
+(--tiedosto, yksi määrite riviä kohden, # aloittaa kommentin):
+
+    paivat 1.1.2025 31.3.2025 > q1.txt
+    kuukausi 3 2025 > maaliskuu.txt
+    vuosi 2025
+    vuosi 2024 mittari=talo2 > talo2_2024.txt
+
+Ilman "> polku" -osaa raportti tulostetaan. Saman tiedoston raportit
+kirjoitetaan peräkkäin samaan tiedostoon (kukin tiedosto kirjoitetaan kerran).
+Ajo: python eraajo_v6.py [--tiedosto=POLKU] [--mittari=NIMI] [--vyohyke=NIMI] [määrite ...]
+Paluuarvo: 0 = kaikki kirjoitettu, 1 = jonkin tiedoston kirjoitus epäonnistui
+(virhe virhevirtaan), 2 = virheellinen määrite. Määritteet ja niiden
+muodostus ovat moduulissa maarite_v6.
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+from kirjaaja_v6 import tallenna_raportti
+from maarite_v6 import Maarite, jasenna_maarite, lue_maaritteet, muodosta
+from osiovarasto_v6 import OLETUSMITTARI, Osiovarasto
+from raporttimuisti_v6 import Raporttimuisti
+
+
+def aja(varasto: Osiovarasto, maaritteet: List[Maarite],
+        muisti: Optional[Raporttimuisti] = None) -> Dict[Optional[str], List[str]]:
+    """Ajaa määritteet ja palauttaa rivit tulosteittain (None = tulostettavat).
+    Saman tulosteen raportit erotetaan tyhjällä rivillä, määritteiden järjestyksessä."""
+    if muisti is None:
+        muisti = Raporttimuisti(max(len(maaritteet), 1))
+    tulosteet: Dict[Optional[str], List[str]] = {}
+    for m in maaritteet:
+        rivit = tulosteet.setdefault(m.tuloste, [])
+        if rivit:
+            rivit.append("")
+        rivit.extend(muodosta(varasto, muisti, m))
+    return tulosteet
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Viikko6-raportit eräajona.")
+    parser.add_argument("maaritteet", nargs="*", help='esim. "kuukausi 3 2025 > maaliskuu.txt"')
+    parser.add_argument("--tiedosto", help="määritetiedosto (yksi määrite riviä kohden, - = vakiosyöte)")
+    parser.add_argument("--hakemisto", default=".", help="vuositiedostojen hakemisto")
+    parser.add_argument("--mittari", default=OLETUSMITTARI)
+    parser.add_argument("--vyohyke", help="päiväjaon aikavyöhyke, esim. Europe/Helsinki")
+    parser.add_argument("--virta", action="store_true", help="lue CSV rivi kerrallaan")
+    args = parser.parse_args(argv)
+
+    # Kaikki määritteet tarkistetaan ennen kuin yhtään dataa luetaan
+    try:
+        maaritteet = [jasenna_maarite(t, args.mittari) for t in args.maaritteet]
+        if args.tiedosto:
+            maaritteet += lue_maaritteet(args.tiedosto, args.mittari)
+    except (ValueError, OSError) as e:
+        print(f"Virheellinen määrite: {e}", file=sys.stderr)
+        return 2
+    if not maaritteet:
+        parser.print_usage(sys.stderr)
+        return 2
+
+    varasto = Osiovarasto.hakemistosta(args.hakemisto, args.virta, args.vyohyke)
+    tila = 0
+    for polku, rivit in aja(varasto, maaritteet).items():
+        if polku is None:
+            print("\n".join(rivit))
+            continue
+        try:
+            tallenna_raportti(rivit, polku)
+        except OSError as e:
+            # Muut tulosteet kirjoitetaan silti; virhe näkyy paluuarvossa
+            print(f"Virhe kirjoitettaessa tiedostoon {polku}: {e}", file=sys.stderr)
+            tila = 1
+    return tila
+
+
+if __name__ == "__main__":
+    sys.exit(main())
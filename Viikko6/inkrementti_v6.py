@@ -0,0 +1,113 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Inkrementaalinen lataus kasvavalle CSV-tiedostolle (Viikko6).
+
+Mittarivienti lisää 2025.csv:n loppuun uusia tunteja. Inkrementaalilataaja
+muistaa, mihin tavukohtaan asti tiedosto on jo luettu, ja päivitä() lukee
+vain uuden lopun. Päivä-, kuukausi- ja vuosisummat päivitetään paikallaan
+niin, että tulos on sama kuin täydellä uudelleenlaskennalla
+(muodosta_paivat -> muodosta_kuukaudet -> muodosta_vuosi).
+
+Korvattu tiedosto tunnistetaan laitteen ja i-solmun sekä jo luetun osan
+alun ja lopun (enintään 4 KiB kumpikin) perusteella; silloin, kuten
+lyhentyneelläkin tiedostolla, kaikki luetaan uudelleen.
+"""
+
+import os
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from laskenta_v6 import Paivakertyma, muodosta_vuosi
+from lukija_v6 import lue_lisatyt
+
+_TARKISTE = 4096   # verrattavien tavujen määrä luetun osan alusta ja lopusta
+
+Tunniste = Tuple[int, int, bytes, bytes]
+
+
+class Inkrementaalilataaja:
+    """Pitää paivat-, kkdata- ja vdata-rakenteet ajan tasalla tiedoston kasvaessa.
+
+    Rakenteet ovat samoja olioita koko elinkaaren ajan, joten niihin
+    tallennetut viittaukset näkevät päivitykset.
+    """
+
+    def __init__(self, polku: str = "2025.csv") -> None:
+        self.polku = polku
+        self.paivat: Dict[date, Dict[str, float]] = {}
+        self.kkdata: Dict[Tuple[int, int], Dict[str, float]] = {}
+        self.vdata: Dict[str, float] = {"kulutus": 0.0, "tuotanto": 0.0, "lampotila": 0.0}
+        self._nollaa()
+
+    def _nollaa(self) -> None:
+        """Tyhjentää tilan (käytetään myös, jos tiedosto on katkaistu tai korvattu)."""
+        self.kohta = 0
+        self._tunniste: Optional[Tunniste] = None
+        self._avaimet: List[str] = []
+        self._kertyma = Paivakertyma()
+        self._kk_paivat: Dict[Tuple[int, int], List[date]] = {}
+        self.paivat.clear()
+        self.kkdata.clear()
+        self.vdata.update({"kulutus": 0.0, "tuotanto": 0.0, "lampotila": 0.0})
+
+    def _lue_tunniste(self, kohta: int) -> Tunniste:
+        """Tiedoston (laite, i-solmu) ja tavujen [0, kohta) alku ja loppu."""
+        with open(self.polku, "rb") as f:
+            st = os.fstat(f.fileno())
+            alku = f.read(min(kohta, _TARKISTE))
+            f.seek(max(kohta - _TARKISTE, 0))
+            loppu = f.read(min(kohta, _TARKISTE))
+        return st.st_dev, st.st_ino, alku, loppu
+
+    def paivita(self) -> Set[date]:
+        """Lukee tiedostoon lisätyt rivit ja päivittää summat.
+
+        Palauttaa muuttuneet päivät. Jos tiedosto on lyhentynyt tai korvattu
+        (eri i-solmu tai jo luettu osa on muuttunut), se luetaan kokonaan
+        uudelleen.
+        """
+        if self.kohta and (os.path.getsize(self.polku) < self.kohta
+                           or self._lue_tunniste(self.kohta) != self._tunniste):
+            self._nollaa()
+        rivit, self.kohta, self._avaimet = lue_lisatyt(self.polku, self.kohta, self._avaimet)
+        self._tunniste = self._lue_tunniste(self.kohta)
+
+        # Sanakirja säilyttää uusien päivien esiintymisjärjestyksen
+        muuttuneet: Dict[date, None] = {}
+        for r in rivit:
+            d = self._kertyma.lisaa_rivi(r)
+            if d is not None:
+                muuttuneet[d] = None
+        if not muuttuneet:
+            return set()
+
+        for d in muuttuneet:
+            if d not in self.paivat:
+                self._kk_paivat.setdefault((d.year, d.month), []).append(d)
+            self.paivat[d] = self._kertyma.paiva(d)
+
+        for key in {(d.year, d.month) for d in muuttuneet}:
+            self._paivita_kuukausi(key)
+        self._paivita_vuosi()
+        return set(muuttuneet)
+
+    def _paivita_kuukausi(self, key: Tuple[int, int]) -> None:
+        """Laskee yhden kuukauden uudelleen sen päivistä (enintään 31)."""
+        kul = tuo = lam = 0.0
+        paivat = self._kk_paivat[key]
+        for d in paivat:
+            v = self.paivat[d]
+            kul += v["kulutus"]
+            tuo += v["tuotanto"]
+            lam += v["lampotila"]
+        self.kkdata[key] = {"kulutus": kul, "tuotanto": tuo, "lampotila": lam / max(len(paivat), 1)}
+
+    def _paivita_vuosi(self) -> None:
+        """Laskee vuosisummat uudelleen kaikista päivistä (enintään 366).
+
+        Summa lasketaan muodosta_vuosi-funktiolla (sum()), koska Python 3.12+
+        summaa kompensoidusti eikä juokseva +=-summa olisi sama.
+        """
+        self.vdata.update(muodosta_vuosi(self.paivat))
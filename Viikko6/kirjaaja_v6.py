@@ -1,15 +1,39 @@
 # Copyright (c) 2025 Juho Tiihonen
 # License: MIT
 
-"""Raportin tallennus tiedostoon (Viikko6)."""
-
-from typing import List
-
-def tallenna_raportti(rivit: List[str], tiedosto: str = "raportti.txt") -> None:
-    """Kirjoittaa raportin rivit tiedostoon UTF-8-koodauksella. """
-    try:
-        with open(tiedosto, "w", encoding="utf-8") as f:
-            for rivi in rivit:
-                f.write(rivi + "\n")
-    except Exception as e:
-        print(f"Virhe kirjoitettaessa tiedostoon {tiedosto}: {e}")
+"""Raportin tallennus tiedostoon (Viikko6).
+
+Kirjoitus tehdään yhteisellä raporttikirjoittajalla (yhteiset/raporttikirjoitin.py):
+rivit kirjoitetaan erissä väliaikaistiedostoon, joka nimetään lopuksi
+atomisesti kohteen päälle. Kesken kaatunut ajo ei jätä katkennutta
+raportti.txt:tä, ja rivit voivat tulla myös generaattorista.
+"""
+
+import importlib.util
+import os
+import sys
+from typing import Iterable
+
+def _lataa_yhteiset() -> None:
+    """Rekisteröi repon yhteiset-paketin (../yhteiset) muuttamatta sys.pathia."""
+    if "yhteiset" in sys.modules:
+        return
+    hakemisto = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "yhteiset")
+    spec = importlib.util.spec_from_file_location(
+        "yhteiset", os.path.join(hakemisto, "__init__.py"), submodule_search_locations=[hakemisto])
+    paketti = importlib.util.module_from_spec(spec)
+    sys.modules["yhteiset"] = paketti
+    spec.loader.exec_module(paketti)
+
+
+_lataa_yhteiset()
+
+from yhteiset.raporttikirjoitin import kirjoita_atomisesti
+
+
+def tallenna_raportti(rivit: Iterable[str], tiedosto: str = "raportti.txt") -> None:
+    """Kirjoittaa raportin rivit tiedostoon UTF-8-koodauksella.
+
+    Virhe (esim. OSError) nostetaan kutsujalle; vanha tiedosto säilyy ehjänä.
+    """
+    kirjoita_atomisesti(rivit, tiedosto)
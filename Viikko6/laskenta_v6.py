@@ -5,10 +5,21 @@
 """Aggregointi- ja laskentafunktiot (Viikko6).
 
 Muodostaa päivä-, kuukausi- ja vuosiyhteenvedot.
+Jos numpy on asennettu, päivä- ja kuukausiryhmittely tehdään vektoroidusti
+(np.bincount), muuten rivikohtaisesti sanakirjoihin. Päiväjaon voi tehdä valitun
+aikavyöhykkeen mukaan (vyohyke, ks. aikavyohyke_v6).
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, date
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy on valinnainen riippuvuus
+    np = None
+
+from aikavyohyke_v6 import Vyohyke, aikaleima_epochiksi
 
 FI_WEEKDAYS = [
     "maanantai", "tiistai", "keskiviikko",
@@ -32,38 +43,141 @@ def _to_float(s: str) -> float:
         return 0.0
 
 
-def muodosta_paivat(rivit: List[Dict[str, str]]) -> Dict[date, Dict[str, float]]:
+def _ryhmasummat(avaimet: "np.ndarray", *sarakkeet: "np.ndarray"):
+    """Vektoroitu group-by: palauttaa (avaimet, lukumäärät, summat sarakkeittain).
+
+    np.bincount summaa painot rivijärjestyksessä ilman kompensointia, joten
+    tulos on bitilleen sama kuin rivikohtaisessa += -summauksessa, jolla
+    päivä- ja kuukausisummat on aina laskettu. sum()-funktion tulosta
+    (vuosisummat) se ei vastaa Python 3.12:sta alkaen.
+    """
+    uniikit, indeksit = np.unique(avaimet, return_inverse=True)
+    n = len(uniikit)
+    lkm = np.bincount(indeksit, minlength=n)
+    summat = [np.bincount(indeksit, weights=s, minlength=n) for s in sarakkeet]
+    return uniikit, lkm, summat
+
+
+def _muodosta_paivat_sarakkeista(data: Dict[str, "np.ndarray"]) -> Dict[date, Dict[str, float]]:
+    """Päiväsummat lataa_vuosi_sarakkeet-muotoisesta datasta."""
+    paivat, lkm, (kul, tuo, lam) = _ryhmasummat(
+        data["paiva"], data["kulutus"], data["tuotanto"], data["keskilämpötila"])
+    lampotila = lam / np.maximum(lkm, 1)
+    return {
+        d: {"kulutus": float(k), "tuotanto": float(t), "lampotila": float(l)}
+        for d, k, t, l in zip(paivat.astype(object), kul, tuo, lampotila)
+    }
+
+
+def _paivasarakkeet(paivat: Dict[date, Dict[str, float]]):
+    """Muuntaa päivädatan taulukoiksi: (päivät, kulutus, tuotanto, lampotila)."""
+    n = len(paivat)
+    arvot = paivat.values()
+    return (
+        list(paivat.keys()),
+        np.fromiter((v["kulutus"] for v in arvot), dtype=np.float64, count=n),
+        np.fromiter((v["tuotanto"] for v in arvot), dtype=np.float64, count=n),
+        np.fromiter((v["lampotila"] for v in arvot), dtype=np.float64, count=n),
+    )
+
+
+class Paivakertyma:
+    """Inkrementaalinen päiväkertymä: rivit syötetään yksi kerrallaan.
+
+    Tila on päiväkohtainen ([kulutus, tuotanto, lämpötilasumma, rivejä]),
+    joten muistinkulutus kasvaa päivien, ei tuntien määrän mukaan.
+    Jos vyohyke on annettu, rivin päivä on vyöhykkeen paikallinen päivä.
+    """
+
+    def __init__(self, vyohyke: Optional[Vyohyke] = None) -> None:
+        self._summat: Dict[date, List[float]] = {}
+        self._vyohyke = vyohyke
+
+    def lisaa(self, d: date, kul: float, tuo: float, lam: float) -> None:
+        """Lisää yhden mittauksen päivälle d."""
+        s = self._summat.get(d)
+        if s is None:
+            s = self._summat[d] = [0.0, 0.0, 0.0, 0]
+        s[0] += kul
+        s[1] += tuo
+        s[2] += lam
+        s[3] += 1
+
+    def lisaa_rivi(self, r: Dict[str, str]) -> Optional[date]:
+        """Lisää yhden lataa_vuosi/iter_vuosi-muotoisen rivin.
+
+        Palauttaa rivin päivän, tai None jos rivillä ei ole aikaa (ohitetaan).
+        """
+        if not r.get("aika"):
+            return None
+        if self._vyohyke is not None:
+            d = self._vyohyke.paiva(aikaleima_epochiksi(r["aika"], self._vyohyke))
+        else:
+            d = _parse_iso(r["aika"]).date()
+        self.lisaa(
+            d,
+            _to_float(r.get("kulutus", "0")),
+            _to_float(r.get("tuotanto", "0")),
+            _to_float(r.get("keskilämpötila", "0")),
+        )
+        return d
+
+    def paiva(self, d: date) -> Dict[str, float]:
+        """Palauttaa yhden päivän summat (kuten muodosta_paivat)."""
+        s = self._summat[d]
+        return {"kulutus": s[0], "tuotanto": s[1], "lampotila": s[2] / max(s[3], 1)}
+
+    def paivat(self) -> Dict[date, Dict[str, float]]:
+        """Palauttaa päiväsummat samassa muodossa kuin muodosta_paivat."""
+        return {
+            d: {"kulutus": s[0], "tuotanto": s[1], "lampotila": s[2] / max(s[3], 1)}
+            for d, s in self._summat.items()
+        }
+
+    def kuukaudet(self) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Kuukausisummat kertymän päivistä."""
+        return muodosta_kuukaudet(self.paivat())
+
+    def vuosi(self) -> Dict[str, float]:
+        """Vuosisummat kertymän päivistä."""
+        return muodosta_vuosi(self.paivat())
+
+
+def muodosta_paivat(rivit: Union[Iterable[Dict[str, str]], Dict[str, "np.ndarray"]],
+                    vyohyke: Optional[Vyohyke] = None) -> Dict[date, Dict[str, float]]:
     """Laskee päiväkohtaiset summat.
 
+    Hyväksyy lataa_vuosi-rivit, iter_vuosi-generaattorin (yksi läpikäynti,
+    muisti rajattu päivien määrään) tai lataa_vuosi_sarakkeet-taulukot.
+    Jos vyohyke on annettu, päivät jaetaan sen paikallisajan mukaan
+    (kesäaikasiirtymien 23 ja 25 tunnin päivät oikein), muuten kunkin
+    rivin oman poikkeaman mukaan.
     Palauttaa: {date: {"kulutus": kWh, "tuotanto": kWh, "lampotila": °C}}
     """
-    paivat: Dict[date, Dict[str, float]] = {}
-    tuntia_per_paiva: Dict[date, int] = {}
+    if isinstance(rivit, dict):
+        if vyohyke is not None:
+            paiva = vyohyke.paivanumerot(rivit["aika"].astype(np.int64)).astype("datetime64[D]")
+            rivit = dict(rivit, paiva=paiva)
+        return _muodosta_paivat_sarakkeista(rivit)
 
+    kertyma = Paivakertyma(vyohyke)
     for r in rivit:
-        if not r.get("aika"):
-            continue
-        dt = _parse_iso(r["aika"])
-        d = dt.date()
-        kul = _to_float(r.get("kulutus", "0"))
-        tuo = _to_float(r.get("tuotanto", "0"))
-        lam = _to_float(r.get("keskilämpötila", "0"))
-        if d not in paivat:
-            paivat[d] = {"kulutus": 0.0, "tuotanto": 0.0, "_lam_sum": 0.0}
-            tuntia_per_paiva[d] = 0
-        paivat[d]["kulutus"] += kul
-        paivat[d]["tuotanto"] += tuo
-        paivat[d]["_lam_sum"] += lam
-        tuntia_per_paiva[d] += 1
-
-    for d in paivat:
-        n = max(tuntia_per_paiva.get(d, 0), 1)
-        paivat[d]["lampotila"] = paivat[d].pop("_lam_sum") / n
-    return paivat
+        kertyma.lisaa_rivi(r)
+    return kertyma.paivat()
 
 
 def muodosta_kuukaudet(paivat: Dict[date, Dict[str, float]]) -> Dict[Tuple[int, int], Dict[str, float]]:
     """Aggregoi päivädatasta kuukaudet: (vuosi, kk) -> kulutus, tuotanto, lampotila."""
+    if np is not None:
+        pvt, kul, tuo, lam = _paivasarakkeet(paivat)
+        avaimet = np.fromiter((d.year * 12 + d.month - 1 for d in pvt), dtype=np.int64, count=len(pvt))
+        uniikit, lkm, (kul, tuo, lam) = _ryhmasummat(avaimet, kul, tuo, lam)
+        lampotila = lam / np.maximum(lkm, 1)
+        return {
+            (int(a) // 12, int(a) % 12 + 1): {"kulutus": float(k), "tuotanto": float(t), "lampotila": float(l)}
+            for a, k, t, l in zip(uniikit, kul, tuo, lampotila)
+        }
+
     kk: Dict[Tuple[int, int], Dict[str, float]] = {}
     paivia: Dict[Tuple[int, int], int] = {}
     for d, v in paivat.items():
@@ -81,8 +195,16 @@ def muodosta_kuukaudet(paivat: Dict[date, Dict[str, float]]) -> Dict[Tuple[int,
     return kk
 
 
-def muodosta_vuosi(paivat: Dict[date, Dict[str, float]]) -> Dict[str, float]:
-    """Aggregoi koko vuoden: kulutus, tuotanto, lampotila (päiväkeskiarvon keskiarvo)."""
+def muodosta_vuosi(paivat: Dict[date, Dict[str, float]], vuosi: Optional[int] = None) -> Dict[str, float]:
+    """Aggregoi vuoden: kulutus, tuotanto, lampotila (päiväkeskiarvon keskiarvo).
+
+    Jos vuosi on annettu, mukaan otetaan vain sen vuoden päivät (data voi
+    kattaa useita vuosia); muuten kaikki annetut päivät.
+    """
+    if vuosi is not None:
+        paivat = {d: v for d, v in paivat.items() if d.year == vuosi}
+    # Vuosisummat lasketaan sum()-funktiolla myös numpyn kanssa: Python 3.12+
+    # summaa kompensoidusti, joten np.bincount (tai +=) antaisi eri tuloksen.
     days = max(len(paivat), 1)
     total_kul = sum(v["kulutus"] for v in paivat.values())
     total_tuo = sum(v["tuotanto"] for v in paivat.values())
@@ -95,3 +217,38 @@ def muodosta_vuosi(paivat: Dict[date, Dict[str, float]]) -> Dict[str, float]:
     }
 
 
+class Paivaindeksi:
+    """Päivädatan hakemisto aikavälikyselyille.
+
+    Pitää päivät järjestettynä listana, joten aikavälin rajat löytyvät
+    binäärihaulla O(log n) ajassa ja läpi käydään vain välin päivät.
+
+    Kumulatiivisia summia ei pidetä: päiväraportti tulostaa joka tapauksessa
+    kaikki välin päivät, joten summat kertyvät samalla kierroksella. Lisäksi
+    etuliitesummien erotus pyöristyy kahteen desimaaliin eri tavalla kuin
+    suora summa noin joka kahdennellakymmenennellä välillä (.xx5-rajat).
+    """
+
+    def __init__(self, paivat: Dict[date, Dict[str, float]]) -> None:
+        self.paivat: List[date] = sorted(paivat)
+        self.arvot: List[Dict[str, float]] = [paivat[d] for d in self.paivat]
+
+    @classmethod
+    def perakkain(cls, indeksit: Iterable["Paivaindeksi"]) -> "Paivaindeksi":
+        """Yhdistää indeksit, joiden päivät ovat annetussa järjestyksessä eivätkä
+        mene päällekkäin (esim. peräkkäiset vuodet). Ei järjestä uudelleen."""
+        indeksi = cls({})
+        for osa in indeksit:
+            indeksi.paivat.extend(osa.paivat)
+            indeksi.arvot.extend(osa.arvot)
+        return indeksi
+
+    def vali(self, alku: date, loppu: date) -> Tuple[int, int]:
+        """Palauttaa indeksivälin [i, j), jonka päivät ovat välillä alku..loppu."""
+        return bisect_left(self.paivat, alku), bisect_right(self.paivat, loppu)
+
+    def rivit(self, alku: date, loppu: date) -> Iterator[Tuple[date, Dict[str, float]]]:
+        """Tuottaa aikavälin päivät järjestyksessä (vain tulostettavat rivit)."""
+        i, j = self.vali(alku, loppu)
+        for k in range(i, j):
+            yield self.paivat[k], self.arvot[k]
@@ -7,10 +7,24 @@
 Lukee 2025.csv ja palauttaa rivit sanakirjoina.
 Avaimet normalisoidaan ja mapataan kanonisiin: aika, kulutus, tuotanto, keskilämpötila.
 Olettaa erotinmerkin ';' ja UTF-8-koodauksen.
+
+Sarakemuotoinen lataus (lataa_vuosi_sarakkeet) palauttaa rivien sijaan
+tyypitetyt NumPy-taulukot. Se vaatii numpy-paketin; ilman sitä käytetään
+tavallista rivikohtaista latausta. Päivän voi laskea rivin oman poikkeaman
+sijaan valitun aikavyöhykkeen mukaan (ks. aikavyohyke_v6).
 """
 
 import csv
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aikavyohyke_v6 import Vyohyke, hae_vyohyke
+
+try:
+    import numpy as np
+except ImportError:  # numpy on valinnainen riippuvuus
+    np = None
+
+SARAKETILA_SAATAVILLA = np is not None
 
 
 def _normalize_key(k: str) -> str:
@@ -57,13 +71,140 @@ def _normalize_key(k: str) -> str:
     return s
 
 
+def iter_vuosi(polku: str = "2025.csv") -> Iterator[Dict[str, str]]:
+    """Lukee CSV-tiedostoa rivi kerrallaan ja tuottaa rivit sanakirjoina (avaimet kanonisoitu).
+
+    Muistissa on kerrallaan vain yksi rivi, joten soveltuu suurille tiedostoille.
+    """
+    with open(polku, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        # Otsikot normalisoidaan kerran, ei joka rivillä
+        avaimet = [_normalize_key(k) for k in (reader.fieldnames or [])]
+        for r in reader:
+            yield {a: (v or "").strip() for a, v in zip(avaimet, r.values())}
+
+
+def lue_lisatyt(polku: str, kohta: int = 0,
+                avaimet: Optional[List[str]] = None) -> Tuple[List[Dict[str, str]], int, List[str]]:
+    """Lukee tiedoston kokonaiset rivit tavukohdasta `kohta` alkaen.
+
+    Kohdassa 0 luetaan ensin otsikkorivi. Keskeneräinen viimeinen rivi
+    (ei rivinvaihtoa) jätetään seuraavaan kertaan.
+    Palauttaa: (rivit, uusi tavukohta, kanonisoidut avaimet)
+    """
+    with open(polku, "rb") as f:
+        f.seek(kohta)
+        data = f.read()
+    loppu = data.rfind(b"\n") + 1
+    tekstirivit = data[:loppu].decode("utf-8").splitlines()
+    if kohta == 0 and tekstirivit:
+        avaimet = [_normalize_key(k) for k in next(csv.reader(tekstirivit[:1], delimiter=";"))]
+        tekstirivit = tekstirivit[1:]
+    avaimet = avaimet or []
+    rivit = [
+        {a: (v or "").strip() for a, v in zip(avaimet, r)}
+        for r in csv.reader(tekstirivit, delimiter=";")
+    ]
+    return rivit, kohta + loppu, avaimet
+
+
 def lataa_vuosi(polku: str = "2025.csv") -> List[Dict[str, str]]:
     """Lukee CSV-tiedoston ja palauttaa rivit sanakirjalistana (avaimet kanonisoitu)."""
+    return list(iter_vuosi(polku))
+
+
+def _liukuluvuiksi(arvot: List[str]) -> "np.ndarray":
+    """Muuntaa merkkijonot float64-taulukoksi (pilkku/piste, tyhjä/virhe -> 0.0)."""
+    taulu = np.char.replace(np.array(arvot, dtype=str), ",", ".")
+    try:
+        return taulu.astype(np.float64)
+    except ValueError:
+        # Hidas varapolku: joukossa tyhjiä tai virheellisiä arvoja
+        tulos = np.zeros(len(arvot), dtype=np.float64)
+        for i, s in enumerate(taulu):
+            try:
+                tulos[i] = float(s)
+            except ValueError:
+                pass
+        return tulos
+
+
+def _aikaleimoiksi(aikat: List[str], vyohyke: Optional[Vyohyke] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Muuntaa ISO-aikaleimat (esim. '2025-01-01T00:00:00.000+02:00') taulukoiksi.
+
+    Palauttaa (aika, paiva):
+        aika:  datetime64[s], UTC-hetki (aikavyöhykepoikkeama huomioitu)
+        paiva: datetime64[D], rivin oman paikallisajan päivämäärä
+    Poikkeamaton aikaleima on vyöhykkeen (oletus Europe/Helsinki) paikallisaikaa
+    kuten rivikohtaisessa aikaleima_epochiksi-muunnoksessa.
+    """
+    taulu = np.array(aikat, dtype=str)
+    paiva = taulu.astype("U10").astype("datetime64[D]")
+    paikallinen = taulu.astype("U19").astype("datetime64[s]")
+
+    # Poikkeamia (+02:00, +03:00) on vain muutama erilainen -> muunnetaan kerran
+    loput = np.array([a[19:] for a in aikat], dtype=str)
+    erilaiset, indeksit = np.unique(loput, return_inverse=True)
+    poikkeamat = [_poikkeama_sekunteina(p) for p in erilaiset]
+    sekunnit = np.array([p or 0 for p in poikkeamat], dtype=np.int64)
+    aika = paikallinen - sekunnit[indeksit].astype("timedelta64[s]")
+    ilman = np.array([p is None for p in poikkeamat], dtype=bool)[indeksit]
+    if ilman.any():
+        vyohyke = vyohyke or hae_vyohyke()
+        epochit = vyohyke.epochit_paikallisista(paikallinen[ilman].astype(np.int64))
+        aika[ilman] = epochit.astype("datetime64[s]")
+    return aika, paiva
+
+
+def _poikkeama_sekunteina(loppuosa: str) -> Optional[int]:
+    """Lukee aikaleiman loppuosasta (esim. '.000+02:00') UTC-poikkeaman sekunteina.
+
+    'Z' on UTC (0); None, jos poikkeamaa ei ole.
+    """
+    for merkki in ("+", "-"):
+        i = loppuosa.rfind(merkki)
+        if i != -1:
+            tunnit, _, minuutit = loppuosa[i + 1:].partition(":")
+            etumerkki = 1 if merkki == "+" else -1
+            return etumerkki * (int(tunnit) * 3600 + int(minuutit or 0) * 60)
+    return 0 if loppuosa.endswith(("Z", "z")) else None
+
+
+def lataa_vuosi_sarakkeet(polku: str = "2025.csv",
+                          vyohyke: Optional[Vyohyke] = None) -> Dict[str, "np.ndarray"]:
+    """Lukee CSV-tiedoston yhdellä läpikäynnillä sarakemuotoon.
+
+    Palauttaa: {"aika": datetime64[s] (UTC), "paiva": datetime64[D],
+                "kulutus": float64, "tuotanto": float64, "keskilämpötila": float64}
+    Rivit, joilla ei ole aikaleimaa, ohitetaan kuten muodosta_paivat tekee.
+    Jos vyohyke on annettu, paiva on vyöhykkeen paikallinen päivä, muuten
+    rivin oman poikkeaman mukainen päivä. Poikkeamattomat aikaleimat luetaan
+    vyöhykkeen (oletus Europe/Helsinki) paikallisaikana kuten rivilatauksessa.
+    """
+    if np is None:
+        raise ImportError("Sarakemuotoinen lataus vaatii numpy-paketin.")
+
+    kentat = ("aika", "kulutus", "tuotanto", "keskilämpötila")
     with open(polku, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f, delimiter=";")
-        rivit: List[Dict[str, str]] = []
+        reader = csv.reader(f, delimiter=";")
+        otsikot = [_normalize_key(k) for k in next(reader, [])]
+        sijainnit = {k: otsikot.index(k) if k in otsikot else None for k in kentat}
+        arvot: Dict[str, List[str]] = {k: [] for k in kentat}
+        i_aika = sijainnit["aika"]
         for r in reader:
-            # HUOM: käytä r.items() ja append vain kerran
-            norm = {_normalize_key(k): (v or "").strip() for k, v in r.items()}
-            rivit.append(norm)
-    return rivit
+            if i_aika is None or i_aika >= len(r) or not r[i_aika].strip():
+                continue
+            for k in kentat:
+                i = sijainnit[k]
+                arvot[k].append(r[i].strip() if i is not None and i < len(r) else "")
+
+    aika, paiva = _aikaleimoiksi(arvot["aika"], vyohyke)
+    if vyohyke is not None:
+        paiva = vyohyke.paivanumerot(aika.astype(np.int64)).astype("datetime64[D]")
+    return {
+        "aika": aika,
+        "paiva": paiva,
+        "kulutus": _liukuluvuiksi(arvot["kulutus"]),
+        "tuotanto": _liukuluvuiksi(arvot["tuotanto"]),
+        "keskilämpötila": _liukuluvuiksi(arvot["keskilämpötila"]),
+    }
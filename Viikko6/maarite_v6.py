@@ -0,0 +1,118 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Raporttimääritteet ja niiden muodostus (Viikko6).
+
+Maarite kuvaa yhden raporttipyynnön (tyyppi, parametrit, mittari ja
+tuloste). Sekä valikkokäyttöliittymä (main_v6) että eräajo (eraajo_v6)
+muodostavat raporttinsa täällä, joten sama kysely osuu samaan
+raporttimuistin avaimeen kummastakin. Määritteen tekstimuoto, esim.
+"kuukausi 3 2025 > maaliskuu.txt", on kuvattu eraajo_v6:ssa.
+"""
+
+import sys
+from datetime import date, datetime
+from typing import Hashable, List, NamedTuple, Optional, Tuple
+
+from osiovarasto_v6 import OLETUSMITTARI, Osiovarasto
+from raporttimuisti_v6 import Raporttimuisti
+from raportti_v6 import raportti_kuukausi, raportti_paivavalilta, raportti_vuosi
+
+TYYPIT = ("paivat", "kuukausi", "vuosi")
+
+
+class Maarite(NamedTuple):
+    """Yksi raporttipyyntö."""
+
+    tyyppi: str                 # "paivat", "kuukausi" tai "vuosi"
+    parametrit: Tuple           # (alku, loppu) | (vuosi, kk) | (vuosi,)
+    mittari: str = OLETUSMITTARI
+    tuloste: Optional[str] = None   # None = tulostetaan
+
+
+def _pvm(s: str) -> date:
+    try:
+        return datetime.strptime(s, "%d.%m.%Y").date()
+    except ValueError:
+        raise ValueError(f"virheellinen päivämäärä {s!r} (muoto pv.kk.vvvv)") from None
+
+
+def _luku(s: str, nimi: str, pienin: int, suurin: int) -> int:
+    if not s.isdigit() or not pienin <= int(s) <= suurin:
+        raise ValueError(f"virheellinen {nimi} {s!r} ({pienin}–{suurin})")
+    return int(s)
+
+
+def jasenna_maarite(teksti: str, mittari: str = OLETUSMITTARI) -> Maarite:
+    """Jäsentää määritteen, esim. "kuukausi 3 2025 > maaliskuu.txt". Virhe -> ValueError."""
+    teksti, _, tuloste = teksti.partition(">")
+    tuloste = tuloste.strip() or None
+    osat = []
+    for osa in teksti.split():
+        if osa.startswith("mittari="):
+            mittari = osa.split("=", 1)[1]
+        else:
+            osat.append(osa)
+    if not osat or osat[0] not in TYYPIT:
+        raise ValueError(f"tuntematon raportti {' '.join(osat)!r} (sallitut: {', '.join(TYYPIT)})")
+    tyyppi, arvot = osat[0], osat[1:]
+    odotettu = {"paivat": 2, "kuukausi": 2, "vuosi": 1}[tyyppi]
+    if len(arvot) != odotettu:
+        raise ValueError(f"{tyyppi} tarvitsee {odotettu} arvoa, annettiin {len(arvot)}")
+
+    if tyyppi == "paivat":
+        alku, loppu = _pvm(arvot[0]), _pvm(arvot[1])
+        if loppu < alku:
+            raise ValueError("päättymispäivä ei voi olla ennen aloituspäivää")
+        parametrit: Tuple = (alku, loppu)
+    elif tyyppi == "kuukausi":
+        parametrit = (_luku(arvot[1], "vuosi", 1, 9999), _luku(arvot[0], "kuukausi", 1, 12))
+    else:
+        parametrit = (_luku(arvot[0], "vuosi", 1, 9999),)
+    return Maarite(tyyppi, parametrit, mittari, tuloste)
+
+
+def lue_maaritteet(polku: str, mittari: str = OLETUSMITTARI) -> List[Maarite]:
+    """Lukee määritetiedoston ("-" = vakiosyöte). Virhe -> ValueError rivinumeron kanssa."""
+    tiedosto = sys.stdin if polku == "-" else open(polku, "r", encoding="utf-8")
+    try:
+        maaritteet = []
+        for i, rivi in enumerate(tiedosto, start=1):
+            rivi = rivi.split("#", 1)[0].strip()
+            if not rivi:
+                continue
+            try:
+                maaritteet.append(jasenna_maarite(rivi, mittari))
+            except ValueError as e:
+                raise ValueError(f"{polku}, rivi {i}: {e}") from None
+        return maaritteet
+    finally:
+        if tiedosto is not sys.stdin:
+            tiedosto.close()
+
+
+def _versiot(varasto: Osiovarasto, mittari: str, ensimmainen: int, viimeinen: int) -> Tuple[Hashable, ...]:
+    """Raportin datan versio: käytettyjen vuosiosioiden lähdetiedostojen versiot."""
+    return tuple(varasto.versio(v, mittari) for v in range(ensimmainen, viimeinen + 1))
+
+
+def muodosta(varasto: Osiovarasto, muisti: Raporttimuisti, m: Maarite) -> List[str]:
+    """Muodostaa määritteen raportin (tai hakee sen muistista)."""
+    if m.tyyppi == "paivat":
+        alku, loppu = m.parametrit
+        return muisti.hae(
+            ("paivavali", m.mittari, alku, loppu, _versiot(varasto, m.mittari, alku.year, loppu.year)),
+            lambda: raportti_paivavalilta(None, alku, loppu,
+                                          indeksi=varasto.paivaindeksi(alku, loppu, m.mittari)),
+        )
+    if m.tyyppi == "kuukausi":
+        vuosi, kk = m.parametrit
+        return muisti.hae(
+            ("kuukausi", m.mittari, vuosi, kk, _versiot(varasto, m.mittari, vuosi, vuosi)),
+            lambda: raportti_kuukausi(varasto.kkdata(vuosi, m.mittari), kk, vuosi),
+        )
+    (vuosi,) = m.parametrit
+    return muisti.hae(
+        ("vuosi", m.mittari, vuosi, _versiot(varasto, m.mittari, vuosi, vuosi)),
+        lambda: raportti_vuosi(varasto.vuosi(vuosi, m.mittari), vuosi),
+    )
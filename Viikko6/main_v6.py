@@ -2,30 +2,47 @@
 # Copyright (c) 2025 Juho Tiihonen
 # License: MIT
 
-"""Pääohjelma (Viikko6): lukee 2025.csv antaa käyttöliittymän."""
+"""Pääohjelma (Viikko6): lukee vuositiedostot (esim. 2025.csv) ja antaa käyttöliittymän.
+
+Vuositiedostot haetaan työhakemistosta ja mittarikohtaisista alihakemistoista
+(ks. osiovarasto_v6); vuoden data luetaan vasta, kun sitä tarvitaan.
+Valitsin --mittari=NIMI valitsee mittarin ja --vyohyke=NIMI (esim.
+Europe/Helsinki) jakaa päivät vyöhykkeen paikallisajan mukaan.
+
+Valitsin --virta lukee tiedoston rivi kerrallaan (muisti rajattu päivien määrään).
+Aggregaatit tallennetaan välimuistiin (valimuisti_v6), joten muuttumattoman
+tiedoston uudelleenkäynnistys ei lue CSV:tä lainkaan. Istunnon aikana
+muodostetut raportit pidetään LRU-muistissa (raporttimuisti_v6), joten
+toistuva kysely ei muodosta raporttia uudelleen.
+
+Ajastettuihin ajoihin ilman kyselyitä: eraajo_v6.py.
+"""
 
 from datetime import datetime, date
-from typing import List
+from typing import Collection, List, Optional
 import sys
-from lukija_v6 import lataa_vuosi
-from laskenta_v6 import muodosta_paivat, muodosta_kuukaudet, muodosta_vuosi
-from raportti_v6 import raportti_paivavalilta, raportti_kuukausi, raportti_vuosi
 from kirjaaja_v6 import tallenna_raportti
+from maarite_v6 import Maarite, muodosta
+from osiovarasto_v6 import OLETUSMITTARI, Osiovarasto
+from raporttimuisti_v6 import Raporttimuisti
 
+RAPORTTIMUISTIN_KOKO = 32
 
-def _kysy_pvm(teksti: str, allowed_year: int | None = 2025) -> date:
+
+def _kysy_pvm(teksti: str, sallitut_vuodet: Optional[Collection[int]] = None) -> date:
     """Kysyy päivämäärän muodossa pv.kk.vvvv ja palauttaa date.
-    Jos allowed_year on asetettu (esim. 2025), vuosi pakotetaan siihen.
+    Jos sallitut_vuodet on annettu (esim. vuodet, joilta on dataa), vuoden tulee olla niistä.
     """
     while True:
         s = input(teksti).strip()
         try:
             dt = datetime.strptime(s, "%d.%m.%Y")
             d = dt.date()
-            if allowed_year is not None and d.year != allowed_year:
+            if sallitut_vuodet and d.year not in sallitut_vuodet:
+                vuodet = ", ".join(str(v) for v in sorted(sallitut_vuodet))
                 print(
-                    f"Päivämäärän tulee olla vuodelta {allowed_year}. "
-                    f"Anna arvo muodossa pv.kk.vvvv (esim. 13.10.{allowed_year})."
+                    f"Päivämäärän tulee olla vuodelta {vuodet}. "
+                    f"Anna arvo muodossa pv.kk.vvvv (esim. 13.10.{max(sallitut_vuodet)})."
                 )
                 continue  # palaa kysymään ALKUpäivää uudelleen
             return d
@@ -33,6 +50,17 @@ def _kysy_pvm(teksti: str, allowed_year: int | None = 2025) -> date:
             print("Virheellinen muoto. Esimerkki: 13.10.2025")
 
 
+def _kysy_vuosi(vuodet: List[int]) -> int:
+    """Kysyy vuoden datan vuosista. Jos vuosia on vain yksi, sitä ei kysytä."""
+    if len(vuodet) == 1:
+        return vuodet[0]
+    while True:
+        s = input(f"Anna vuosi ({', '.join(str(v) for v in vuodet)}): ").strip()
+        if s.isdigit() and int(s) in vuodet:
+            return int(s)
+        print("Anna jokin luetelluista vuosista.")
+
+
 def _kysy_kk() -> int:
     """Kysyy kuukauden numeron 1–12."""
     while True:
@@ -51,7 +79,7 @@ def _valikko() -> int:
     print("\nValitse raporttityyppi:")
     print("1) Päiväkohtainen yhteenveto aikaväliltä")
     print("2) Kuukausikohtainen yhteenveto yhdelle kuukaudelle")
-    print("3) Vuoden 2025 kokonaisyhteenveto")
+    print("3) Vuoden kokonaisyhteenveto")
     print("4) Lopeta ohjelma")
     while True:
         s = input("Valinta (1–4): ").strip()
@@ -70,8 +98,12 @@ def _jatkovalikko(rivit: List[str]) -> bool:
     while True:
         s = input("Valinta (1–3): ").strip()
         if s == "1":
-            tallenna_raportti(rivit, "raportti.txt")
-            print("Raportti kirjoitettu: raportti.txt")
+            try:
+                tallenna_raportti(rivit, "raportti.txt")
+            except OSError as e:
+                print(f"Virhe kirjoitettaessa tiedostoon raportti.txt: {e}")
+            else:
+                print("Raportti kirjoitettu: raportti.txt")
             return True  # palataan uuteen raporttiin
         elif s == "2":
             return False
@@ -81,31 +113,56 @@ def _jatkovalikko(rivit: List[str]) -> bool:
             print("Anna arvo 1–3.")
 
 
+def _argumentti(nimi: str, argumentit: List[str]) -> Optional[str]:
+    """Palauttaa valitsimen --nimi=ARVO arvon tai None."""
+    for a in argumentit:
+        if a.startswith(f"--{nimi}="):
+            return a.split("=", 1)[1]
+    return None
+
+
+def _valitse_mittari(varasto: Osiovarasto, argumentit: List[str]) -> str:
+    """--mittari=NIMI, muuten oletusmittari (tai ainoa mittari)."""
+    mittari = _argumentti("mittari", argumentit)
+    if mittari is not None:
+        return mittari
+    mittarit = varasto.mittarit()
+    if OLETUSMITTARI not in mittarit and mittarit:
+        return mittarit[0]
+    return OLETUSMITTARI
+
+
 def main() -> None:
-    """Lukee datan, pyörittää valikkoa ja tulostaa raportteja."""
-    print("Ladataan dataa 2025.csv...")
-    rivit = lataa_vuosi("2025.csv")
-    paivat = muodosta_paivat(rivit)
-    kkdata = muodosta_kuukaudet(paivat)
-    vdata = muodosta_vuosi(paivat)
-    print("Valmis. Data ladattu.")
+    """Etsii datan, pyörittää valikkoa ja tulostaa raportteja."""
+    varasto = Osiovarasto.hakemistosta(".", virtana="--virta" in sys.argv[1:],
+                                       vyohyke=_argumentti("vyohyke", sys.argv[1:]))
+    mittari = _valitse_mittari(varasto, sys.argv[1:])
+    vuodet = varasto.vuodet(mittari)
+    if not vuodet:
+        print(f"Mittarille {mittari} ei löytynyt vuositiedostoja (esim. 2025.csv).")
+        return
+    print(f"Valmis. Dataa vuosilta {', '.join(str(v) for v in vuodet)}.")
+    muisti = Raporttimuisti(RAPORTTIMUISTIN_KOKO)
 
     while True:
         valinta = _valikko()
         if valinta == 1:
-            alku = _kysy_pvm("Alkupäivä (pv.kk.vvvv): ", allowed_year=2025)
-            loppu = _kysy_pvm("Loppupäivä (pv.kk.vvvv): ", allowed_year=2025)
+            alku = _kysy_pvm("Alkupäivä (pv.kk.vvvv): ", vuodet)
+            loppu = _kysy_pvm("Loppupäivä (pv.kk.vvvv): ", vuodet)
             if loppu < alku:
                 print("Päättymispäivä ei voi olla ennen aloituspäivää. Syötä tiedot uudelleen. \n")
                 continue
             
-            raportti = raportti_paivavalilta(paivat, alku, loppu)
+            raportti = muodosta(varasto, muisti, Maarite("paivat", (alku, loppu), mittari))
         elif valinta == 2:
+            vuosi = _kysy_vuosi(vuodet)
             kk = _kysy_kk()
-            raportti = raportti_kuukausi(kkdata, kk)
+            raportti = muodosta(varasto, muisti, Maarite("kuukausi", (vuosi, kk), mittari))
         elif valinta == 3:
-            raportti = raportti_vuosi(vdata)
+            vuosi = _kysy_vuosi(vuodet)
+            raportti = muodosta(varasto, muisti, Maarite("vuosi", (vuosi,), mittari))
         elif valinta == 4:
+            print(muisti.tilasto())
             print("Lopetetaan ohjelma.")
             break
 
@@ -0,0 +1,193 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Vuosi- ja mittarikohtaisesti osioitu päivädatan varasto (Viikko6).
+
+Jokainen osio on yhden mittarin yhden vuoden päivä-, kuukausi- ja
+vuosisummat. Osion lähde on vuoden CSV-tiedosto (esim. 2025.csv), ja se
+luetaan vasta, kun osiota kysytään ensimmäisen kerran (välimuistin kautta,
+ks. valimuisti_v6). Aikavälikysely lataa vain ne vuodet, joille väli osuu.
+Latausilmoitukset tulostetaan virhevirtaan, jotta eräajon (eraajo_v6)
+raportit voi ohjata vakiotulosteesta tiedostoon.
+Osion versio on lähdetiedoston (koko, mtime_ns); jos tiedosto muuttuu,
+osio luetaan seuraavalla kyselyllä uudelleen.
+
+Jos vyöhyke on annettu (esim. "Europe/Helsinki"), päivät jaetaan sen
+paikallisajan mukaan (ks. aikavyohyke_v6).
+
+Hakemistorakenne (hakemistosta):
+    2025.csv                 oletusmittarin vuosi 2025
+    <mittari>/2024.csv       mittarin <mittari> vuosi 2024
+"""
+
+import os
+import re
+import sys
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from aikavyohyke_v6 import hae_vyohyke
+from laskenta_v6 import Paivaindeksi, muodosta_kuukaudet, muodosta_paivat, muodosta_vuosi
+from lukija_v6 import iter_vuosi, lataa_vuosi, lataa_vuosi_sarakkeet, SARAKETILA_SAATAVILLA
+from valimuisti_v6 import Aggregaatit, lahteen_avain, lataa_valimuistista, tallenna_valimuistiin
+
+OLETUSMITTARI = "oletus"
+
+_VUOSITIEDOSTO = re.compile(r"^(\d{4})\.csv$")
+
+
+def lataa_aggregaatit(polku: str, virtana: bool = False, vyohyke: Optional[str] = None) -> Aggregaatit:
+    """Palauttaa (paivat, kkdata, vdata): välimuistista, jos lähde ei ole muuttunut,
+    muuten lukemalla ja aggregoimalla CSV:n (ja päivittämällä välimuistin)."""
+    # Avain ennen lukemista: luvun aikana lisätyt rivit mitätöivät tallennuksen
+    avain = lahteen_avain(polku)
+    data = lataa_valimuistista(polku, avain, vyohyke)
+    if data is not None:
+        print(f"Data ladattu välimuistista ({polku} ei ole muuttunut).", file=sys.stderr)
+        return data
+
+    print(f"Ladataan dataa {polku}...", file=sys.stderr)
+    jako = hae_vyohyke(vyohyke) if vyohyke else None
+    if virtana:
+        rivit = iter_vuosi(polku)
+    elif SARAKETILA_SAATAVILLA:
+        rivit = lataa_vuosi_sarakkeet(polku, jako)
+        jako = None   # päivät on jo jaettu vyöhykkeen mukaan
+    else:
+        rivit = lataa_vuosi(polku)
+    paivat = muodosta_paivat(rivit, jako)
+    kkdata = muodosta_kuukaudet(paivat)
+    vdata = muodosta_vuosi(paivat)
+    tallenna_valimuistiin(polku, avain, paivat, kkdata, vdata, vyohyke)
+    return paivat, kkdata, vdata
+
+
+class _Osio:
+    """Yhden (mittari, vuosi) -osion lähde ja laiskasti ladattu data."""
+
+    __slots__ = ("polku", "vuosi", "data", "indeksi", "versio")
+
+    def __init__(self, polku: str, vuosi: int) -> None:
+        self.polku = polku
+        self.vuosi = vuosi
+        self.data: Optional[Aggregaatit] = None
+        self.indeksi: Optional[Paivaindeksi] = None
+        self.versio: Optional[Tuple[int, int]] = None
+
+
+class Osiovarasto:
+    """Mittareiden päivädata vuosiosioina, ladataan osio kerrallaan tarpeen mukaan."""
+
+    def __init__(self, virtana: bool = False, vyohyke: Optional[str] = None) -> None:
+        self.virtana = virtana
+        self.vyohyke = vyohyke
+        self._osiot: Dict[Tuple[str, int], _Osio] = {}
+        # (mittari, alkuvuosi, loppuvuosi) -> (osioiden indeksit, yhdistetty indeksi)
+        self._yhdistetyt: Dict[Tuple[str, int, int], Tuple[Tuple[Paivaindeksi, ...], Paivaindeksi]] = {}
+
+    @classmethod
+    def hakemistosta(cls, hakemisto: str = ".", virtana: bool = False,
+                     vyohyke: Optional[str] = None) -> "Osiovarasto":
+        """Etsii vuositiedostot hakemistosta (oletusmittari) ja sen alihakemistoista (mittarit)."""
+        varasto = cls(virtana, vyohyke)
+        for nimi in sorted(os.listdir(hakemisto)):
+            polku = os.path.join(hakemisto, nimi)
+            osuma = _VUOSITIEDOSTO.match(nimi)
+            if osuma and os.path.isfile(polku):
+                varasto.lisaa(polku, int(osuma.group(1)))
+            elif os.path.isdir(polku) and not nimi.startswith((".", "_")):
+                for alinimi in sorted(os.listdir(polku)):
+                    osuma = _VUOSITIEDOSTO.match(alinimi)
+                    if osuma:
+                        varasto.lisaa(os.path.join(polku, alinimi), int(osuma.group(1)), nimi)
+        return varasto
+
+    def lisaa(self, polku: str, vuosi: int, mittari: str = OLETUSMITTARI) -> None:
+        """Rekisteröi osion lähdetiedoston. Tiedostoa ei lueta vielä."""
+        self._osiot[(mittari, vuosi)] = _Osio(polku, vuosi)
+
+    def mittarit(self) -> List[str]:
+        return sorted({m for m, _ in self._osiot})
+
+    def vuodet(self, mittari: str = OLETUSMITTARI) -> List[int]:
+        return sorted(v for m, v in self._osiot if m == mittari)
+
+    def ladatut(self) -> List[Tuple[str, int]]:
+        """Osiot, jotka on jo luettu muistiin."""
+        return sorted(k for k, o in self._osiot.items() if o.data is not None)
+
+    def versio(self, vuosi: int, mittari: str = OLETUSMITTARI) -> Optional[Tuple[int, int]]:
+        """Osion lähdetiedoston nykyinen (koko, mtime_ns); None, jos osiota ei ole."""
+        osio = self._osiot.get((mittari, vuosi))
+        if osio is None:
+            return None
+        try:
+            st = os.stat(osio.polku)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _osio(self, mittari: str, vuosi: int) -> Optional[_Osio]:
+        osio = self._osiot.get((mittari, vuosi))
+        if osio is None:
+            return None
+        versio = self.versio(vuosi, mittari)
+        if osio.data is None or osio.versio != versio:
+            paivat, kkdata, vdata = lataa_aggregaatit(osio.polku, self.virtana, self.vyohyke)
+            # Vuoden tiedostossa voi olla rajapäiviä muilta vuosilta; osioon kuuluu vain sen vuosi
+            if any(d.year != vuosi for d in paivat):
+                paivat = {d: v for d, v in paivat.items() if d.year == vuosi}
+                kkdata = muodosta_kuukaudet(paivat)
+                vdata = muodosta_vuosi(paivat, vuosi)
+            osio.data = (paivat, kkdata, vdata)
+            osio.indeksi = None
+            osio.versio = versio
+        return osio
+
+    def osio(self, vuosi: int, mittari: str = OLETUSMITTARI) -> Optional[Aggregaatit]:
+        """Osion (paivat, kkdata, vdata), ladataan tarvittaessa. None, jos osiota ei ole."""
+        osio = self._osio(mittari, vuosi)
+        return osio.data if osio is not None else None
+
+    def paivaindeksi(self, alku: date, loppu: date, mittari: str = OLETUSMITTARI) -> Paivaindeksi:
+        """Välin alku..loppu vuosien Paivaindeksi (raportti_paivavalilta(..., indeksi=)).
+
+        Osion indeksi rakennetaan kerran ja pidetään, kunnes osio luetaan
+        uudelleen. Usean vuoden indeksi kootaan osioiden indekseistä ilman
+        järjestämistä ja muistetaan, kunnes jokin sen osista vaihtuu.
+        """
+        if alku > loppu:
+            alku, loppu = loppu, alku
+        osat = []
+        for vuosi in range(alku.year, loppu.year + 1):
+            osio = self._osio(mittari, vuosi)
+            if osio is None:
+                continue
+            if osio.indeksi is None:
+                osio.indeksi = Paivaindeksi(osio.data[0])
+            osat.append(osio.indeksi)
+        if len(osat) == 1:
+            return osat[0]
+        avain = (mittari, alku.year, loppu.year)
+        muistettu = self._yhdistetyt.get(avain)
+        if muistettu is None or muistettu[0] != tuple(osat):
+            muistettu = self._yhdistetyt[avain] = (tuple(osat), Paivaindeksi.perakkain(osat))
+        return muistettu[1]
+
+    def paivat_valilta(self, alku: date, loppu: date,
+                       mittari: str = OLETUSMITTARI) -> Dict[date, Dict[str, float]]:
+        """Välin alku..loppu päivät. Lukee vain välille osuvien vuosien osiot."""
+        if alku > loppu:
+            alku, loppu = loppu, alku
+        return dict(self.paivaindeksi(alku, loppu, mittari).rivit(alku, loppu))
+
+    def kkdata(self, vuosi: int, mittari: str = OLETUSMITTARI) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Vuoden kuukausisummat {(vuosi, kk): ...}; tyhjä, jos osiota ei ole."""
+        data = self.osio(vuosi, mittari)
+        return data[1] if data is not None else {}
+
+    def vuosi(self, vuosi: int, mittari: str = OLETUSMITTARI) -> Dict[str, float]:
+        """Vuoden summat; nollat, jos osiota ei ole."""
+        data = self.osio(vuosi, mittari)
+        return data[2] if data is not None else muodosta_vuosi({})
@@ -8,7 +8,9 @@ Muodostaa raporttirivit päivä-, kuukausi- ja vuositasolle.
 """
 
 from datetime import date
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from laskenta_v6 import Paivaindeksi
 
 FI_WEEKDAYS = [
     "maanantai", "tiistai", "keskiviikko",
@@ -26,15 +28,25 @@ def _pvm(d: date) -> str:
     return f"{d.day}.{d.month}.{d.year}"
 
 
-def raportti_paivavalilta(paivat: Dict[date, Dict[str, float]],
-                          alku: date, loppu: date) -> List[str]:
-    """Muodostaa raportin päiväyhteenvetona annetulta aikaväliltä."""
+def raportti_paivavalilta(paivat: Optional[Dict[date, Dict[str, float]]],
+                          alku: date, loppu: date,
+                          indeksi: Optional[Paivaindeksi] = None) -> List[str]:
+    """Muodostaa raportin päiväyhteenvetona annetulta aikaväliltä.
+
+    Toistuvia kyselyitä varten kannattaa antaa valmiiksi rakennettu
+    Paivaindeksi (esim. Osiovarasto.paivaindeksi), jolloin paivat voi olla
+    None: väli haetaan binäärihaulla ja läpi käydään vain tulostettavat
+    päivät. Summat lasketaan sum()-funktiolla kuten ennenkin (Python 3.12+
+    summaa liukuluvut kompensoidusti, joten +=-kertymä antaisi eri tuloksen).
+    """
     if alku > loppu:
         alku, loppu = loppu, alku
-    valitut = {d: v for d, v in paivat.items() if alku <= d <= loppu}
-    total_kul = sum(v["kulutus"] for v in valitut.values())
-    total_tuo = sum(v["tuotanto"] for v in valitut.values())
-    avg_temp = (sum(v["lampotila"] for v in valitut.values()) / max(len(valitut), 1)) if valitut else 0.0
+    if indeksi is None:
+        indeksi = Paivaindeksi(paivat)
+    valitut = list(indeksi.rivit(alku, loppu))
+    total_kul = sum(v["kulutus"] for _, v in valitut)
+    total_tuo = sum(v["tuotanto"] for _, v in valitut)
+    avg_temp = (sum(v["lampotila"] for _, v in valitut) / len(valitut)) if valitut else 0.0
     netto = total_kul - total_tuo
 
     ots = f"Päiväkohtainen yhteenveto: {_pvm(alku)}–{_pvm(loppu)}"
@@ -43,8 +55,7 @@ def raportti_paivavalilta(paivat: Dict[date, Dict[str, float]],
         "-" * len(ots),
         "Päivä        Pvm           Kulutus [kWh]  Tuotanto [kWh]  Lämpötila [°C]",
     ]
-    for d in sorted(valitut.keys()):
-        v = valitut[d]
+    for d, v in valitut:
         wd = FI_WEEKDAYS[d.weekday()]
         rivit.append(
             f"{wd:<12} {_pvm(d):<12}  "
@@ -60,12 +71,13 @@ def raportti_paivavalilta(paivat: Dict[date, Dict[str, float]],
     return rivit
 
 
-def raportti_kuukausi(kkdata: Dict[Tuple[int, int], Dict[str, float]], kuukausi: int) -> List[str]:
-    """Muodostaa kuukauden yhteenvedon annetulle kuukaudelle (1–12)."""
-    key = (2025, kuukausi)
+def raportti_kuukausi(kkdata: Dict[Tuple[int, int], Dict[str, float]], kuukausi: int,
+                      vuosi: int) -> List[str]:
+    """Muodostaa kuukauden yhteenvedon annetulle vuodelle ja kuukaudelle (1–12)."""
+    key = (vuosi, kuukausi)
     v = kkdata.get(key, {"kulutus": 0.0, "tuotanto": 0.0, "lampotila": 0.0})
     netto = v["kulutus"] - v["tuotanto"]
-    ots = f"Kuukausiyhteenveto: {kuukausi}/2025"
+    ots = f"Kuukausiyhteenveto: {kuukausi}/{vuosi}"
     return [
         ots,
         "-" * len(ots),
@@ -76,10 +88,10 @@ def raportti_kuukausi(kkdata: Dict[Tuple[int, int], Dict[str, float]], kuukausi:
     ]
 
 
-def raportti_vuosi(vuosi: Dict[str, float]) -> List[str]:
-    """Muodostaa vuoden kokonaisyhteenvedon (2025)."""
+def raportti_vuosi(vuosi: Dict[str, float], vuosiluku: int) -> List[str]:
+    """Muodostaa vuoden kokonaisyhteenvedon (vuosi = muodosta_vuosi-summat)."""
     netto = vuosi["kulutus"] - vuosi["tuotanto"]
-    ots = "Vuoden 2025 kokonaisyhteenveto"
+    ots = f"Vuoden {vuosiluku} kokonaisyhteenveto"
     return [
         ots,
         "-" * len(ots),
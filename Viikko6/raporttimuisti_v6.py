@@ -0,0 +1,60 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Valmiiden raporttien LRU-välimuisti (Viikko6).
+
+Sama raportti (tyyppi, parametrit ja datan versio) muodostetaan vain
+kerran; toistuva kysely palauttaa muistissa olevan rivilistan. Muistissa
+pidetään enintään `koko` raporttia ja `enintaan_riveja` riviä yhteensä;
+vanhimmin käytetty poistetaan ensin. Datan versio kuuluu avaimeen, joten
+lähdetiedoston muuttuminen ohittaa vanhat raportit automaattisesti.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, List
+
+
+class Raporttimuisti:
+    """Rajattu LRU-välimuisti raporttien rivilistoille osuma- ja ohituslaskureineen."""
+
+    def __init__(self, koko: int = 32, enintaan_riveja: int = 100_000) -> None:
+        self.koko = koko
+        self.enintaan_riveja = enintaan_riveja
+        self._raportit: "OrderedDict[Hashable, List[str]]" = OrderedDict()
+        self._riveja = 0
+        self.osumat = 0
+        self.ohitukset = 0
+
+    def hae(self, avain: Hashable, muodosta: Callable[[], List[str]]) -> List[str]:
+        """Palauttaa avaimen raportin muistista tai muodostaa ja tallentaa sen.
+
+        Palautettua listaa ei saa muuttaa (sama lista palautetaan uudelleen).
+        """
+        rivit = self._raportit.get(avain)
+        if rivit is not None:
+            self._raportit.move_to_end(avain)
+            self.osumat += 1
+            return rivit
+        self.ohitukset += 1
+        rivit = muodosta()
+        if len(rivit) <= self.enintaan_riveja:
+            self._raportit[avain] = rivit
+            self._riveja += len(rivit)
+            while len(self._raportit) > self.koko or self._riveja > self.enintaan_riveja:
+                _, vanha = self._raportit.popitem(last=False)
+                self._riveja -= len(vanha)
+        return rivit
+
+    def tyhjenna(self) -> None:
+        self._raportit.clear()
+        self._riveja = 0
+
+    def __len__(self) -> int:
+        return len(self._raportit)
+
+    def tilasto(self) -> str:
+        kyselyt = self.osumat + self.ohitukset
+        osuus = 100.0 * self.osumat / kyselyt if kyselyt else 0.0
+        return (f"Raporttivälimuisti: {self.osumat} osumaa, {self.ohitukset} ohitusta "
+                f"({osuus:.0f} %), muistissa {len(self)} raporttia")
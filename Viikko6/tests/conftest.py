@@ -0,0 +1,44 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Viikko6:n testit: moduulit ovat skriptihakemistossa, joten se lisätään polulle.
+
+vuositiedosto-fixture kirjoittaa satunnaisen 2025.csv-muotoisen tuntitiedoston.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+OTSIKKO = "Aika;Kulutus (netotettu) kWh;Tuotanto (netotettu) kWh;Vuorokauden keskilämpötila"
+
+
+def _pilkulla(x: float, desimaaleja: int) -> str:
+    return f"{x:.{desimaaleja}f}".replace(".", ",")
+
+
+def _kirjoita_csv(polku, tunteja=24 * 400, siemen=3):
+    satunnainen = random.Random(siemen)
+    alku = datetime(2025, 1, 1)
+    rivit = [OTSIKKO]
+    for i in range(tunteja):
+        t = alku + timedelta(hours=i)
+        rivit.append(";".join((
+            f"{t:%Y-%m-%dT%H:%M:%S}.000+02:00",
+            _pilkulla(satunnainen.randint(0, 4000) / 1000, 3),
+            _pilkulla(satunnainen.randint(0, 2000) / 1000, 3),
+            _pilkulla(satunnainen.randint(-250, 250) / 10, 1),
+        )))
+    polku.write_text("\n".join(rivit) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def vuositiedosto(tmp_path):
+    polku = tmp_path / "2025.csv"
+    _kirjoita_csv(polku)
+    return str(polku)
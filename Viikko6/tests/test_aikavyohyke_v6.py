@@ -0,0 +1,60 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from aikavyohyke_v6 import Vyohyke, aikaleima_epochiksi, hae_vyohyke
+from laskenta_v6 import muodosta_paivat
+from lukija_v6 import _aikaleimoiksi, lataa_vuosi
+
+np = pytest.importorskip("numpy")
+
+
+def _seinakello(alku: datetime, tunteja: int, askel=timedelta(hours=1)):
+    """Poikkeamattomat aikaleimat seinäkellon mukaan (myös puuttuvat/toistuvat tunnit)."""
+    return [f"{alku + i * askel:%Y-%m-%dT%H:%M:%S}" for i in range(tunteja)]
+
+
+@pytest.mark.parametrize("nimi", ["Europe/Helsinki", "America/New_York", "Australia/Lord_Howe"])
+def test_paikallisaika_epochiksi_kuten_rivikohtaisesti(nimi):
+    vyohyke = Vyohyke(nimi)
+    aikat = _seinakello(datetime(2025, 1, 1), 4 * 24 * 365, timedelta(minutes=15))
+    odotettu = np.array([aikaleima_epochiksi(a, vyohyke) for a in aikat], dtype=np.int64)
+    paikalliset = np.array(aikat, dtype="datetime64[s]").astype(np.int64)
+    assert (vyohyke.epochit_paikallisista(paikalliset) == odotettu).all()
+
+
+def test_sekaisin_poikkeamalliset_ja_poikkeamattomat():
+    aikat = ["2025-03-30T03:30:00", "2025-03-30T03:30:00+03:00", "2025-10-26T03:30:00",
+             "2025-10-26T03:30:00.000+02:00", "2025-06-01T12:00:00Z", "2025-06-01T12:00:00"]
+    vyohyke = hae_vyohyke("Europe/Helsinki")
+    aika, _ = _aikaleimoiksi(aikat, vyohyke)
+    assert aika.astype(np.int64).tolist() == [aikaleima_epochiksi(a, vyohyke) for a in aikat]
+
+
+def test_poikkeamaton_tiedosto_samat_paivat_kaikilla_latauksilla(tmp_path):
+    from lukija_v6 import lataa_vuosi_sarakkeet
+
+    polku = tmp_path / "2025.csv"
+    rivit = ["Aika;Kulutus;Tuotanto;Lämpötila"]
+    rivit += [f"{a};1,0;0,5;2,0" for a in _seinakello(datetime(2025, 3, 25), 24 * 12)]
+    rivit += [f"{a};1,0;0,5;2,0" for a in _seinakello(datetime(2025, 10, 22), 24 * 10)]
+    polku.write_text("\n".join(rivit) + "\n", encoding="utf-8")
+    vyohyke = Vyohyke("Europe/Helsinki")
+
+    riveista = muodosta_paivat(lataa_vuosi(str(polku)), vyohyke)
+    sarakkeista = muodosta_paivat(lataa_vuosi_sarakkeet(str(polku), vyohyke))
+    uudelleen_jaettu = muodosta_paivat(lataa_vuosi_sarakkeet(str(polku)), vyohyke)
+    assert sarakkeista == riveista
+    assert uudelleen_jaettu == riveista
+    tunnit = [riveista[date(2025, 3, d)]["kulutus"] for d in (29, 30, 31)]
+    assert tunnit == [24.0, 24.0, 24.0]
+
+
+def test_paivan_tunnit_kesaaikasiirtymissa():
+    vyohyke = Vyohyke("Europe/Helsinki")
+    assert vyohyke.paivan_tunnit(date(2025, 3, 30)) == 23
+    assert vyohyke.paivan_tunnit(date(2025, 10, 26)) == 25
+    assert vyohyke.paivan_tunnit(date(2025, 6, 1)) == 24
@@ -0,0 +1,39 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import os
+
+from eraajo_v6 import aja, main
+from maarite_v6 import jasenna_maarite
+from osiovarasto_v6 import Osiovarasto
+from raporttimuisti_v6 import Raporttimuisti
+
+
+def test_kutsujan_tyhja_muisti_taytetaan(vuositiedosto):
+    varasto = Osiovarasto.hakemistosta(os.path.dirname(vuositiedosto))
+    muisti = Raporttimuisti(4)
+    maaritteet = [jasenna_maarite("vuosi 2025"), jasenna_maarite("kuukausi 3 2025")]
+    ensimmainen = aja(varasto, maaritteet, muisti)
+    assert len(muisti) == 2 and muisti.ohitukset == 2
+    assert aja(varasto, maaritteet, muisti) == ensimmainen
+    assert muisti.osumat == 2
+
+
+def test_kirjoitusvirhe_virhevirtaan_ja_paluuarvo(vuositiedosto, capsys):
+    hakemisto = os.path.dirname(vuositiedosto)
+    ok = os.path.join(hakemisto, "ok.txt")
+    tila = main(["--hakemisto", hakemisto,
+                 f"vuosi 2025 > {os.path.join(hakemisto, 'puuttuu', 'x.txt')}",
+                 f"kuukausi 3 2025 > {ok}", "vuosi 2025"])
+    tulos = capsys.readouterr()
+    assert tila == 1
+    assert "Virhe kirjoitettaessa tiedostoon" in tulos.err
+    assert "Virhe" not in tulos.out
+    assert tulos.out.startswith("Vuoden 2025 kokonaisyhteenveto")
+    with open(ok, encoding="utf-8") as f:
+        assert f.readline() == "Kuukausiyhteenveto: 3/2025\n"
+
+
+def test_virheellinen_maarite(capsys):
+    assert main(["vuosi 20x5"]) == 2
+    assert "Virheellinen määrite" in capsys.readouterr().err
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import os
+
+from inkrementti_v6 import Inkrementaalilataaja
+from laskenta_v6 import muodosta_kuukaudet, muodosta_paivat, muodosta_vuosi
+from lukija_v6 import lataa_vuosi
+
+
+def _taysi(polku):
+    """Täysi uudelleenlaskenta koko tiedostosta."""
+    paivat = muodosta_paivat(lataa_vuosi(polku))
+    return paivat, muodosta_kuukaudet(paivat), muodosta_vuosi(paivat)
+
+
+def _kuten_taysi(lataaja):
+    paivat, kkdata, vdata = _taysi(lataaja.polku)
+    assert lataaja.paivat == paivat
+    assert list(lataaja.paivat) == list(paivat)
+    assert lataaja.kkdata == kkdata
+    assert lataaja.vdata == vdata
+
+
+def _rivit(polku):
+    with open(polku, "rb") as f:
+        return f.read().splitlines(keepends=True)
+
+
+def test_lisatyt_rivit_kuten_taysi_laskenta(vuositiedosto):
+    rivit = _rivit(vuositiedosto)
+    with open(vuositiedosto, "wb") as f:
+        f.writelines(rivit[:1000])
+    lataaja = Inkrementaalilataaja(vuositiedosto)
+    lataaja.paivita()
+    _kuten_taysi(lataaja)
+
+    for alku in range(1000, len(rivit), 777):
+        with open(vuositiedosto, "ab") as f:
+            f.writelines(rivit[alku:alku + 777])
+        muuttuneet = lataaja.paivita()
+        assert muuttuneet
+        _kuten_taysi(lataaja)
+    assert lataaja.paivita() == set()
+
+
+def test_keskenerainen_rivi_odottaa_rivinvaihtoa(vuositiedosto):
+    rivit = _rivit(vuositiedosto)
+    with open(vuositiedosto, "wb") as f:
+        f.writelines(rivit[:50])
+        f.write(rivit[50][:10])
+    lataaja = Inkrementaalilataaja(vuositiedosto)
+    lataaja.paivita()
+    kohta = lataaja.kohta
+    with open(vuositiedosto, "ab") as f:
+        f.write(rivit[50][10:])
+    lataaja.paivita()
+    assert lataaja.kohta == kohta + len(rivit[50])
+    _kuten_taysi(lataaja)
+
+
+def test_korvattu_tai_muutettu_tiedosto_luetaan_uudelleen(vuositiedosto, tmp_path):
+    rivit = _rivit(vuositiedosto)
+    lataaja = Inkrementaalilataaja(vuositiedosto)
+    lataaja.paivita()
+
+    # Paikallaan muutettu sama koko: ensimmäisen datarivin kulutus vaihtuu
+    muutettu = rivit[:]
+    muutettu[1] = muutettu[1].replace(b";", b";9", 1)[:len(rivit[1]) - 1] + b"\n"
+    with open(vuositiedosto, "r+b") as f:
+        f.writelines(muutettu)
+    lataaja.paivita()
+    _kuten_taysi(lataaja)
+
+    # os.replace uudella, pidemmällä tiedostolla (eri i-solmu)
+    uusi = tmp_path / "uusi.csv"
+    uusi.write_bytes(b"".join(rivit[:1] + rivit[200:] + rivit[1:200]))
+    os.replace(uusi, vuositiedosto)
+    lataaja.paivita()
+    _kuten_taysi(lataaja)
+
+    # Lyhennetty tiedosto
+    with open(vuositiedosto, "wb") as f:
+        f.writelines(rivit[:300])
+    lataaja.paivita()
+    _kuten_taysi(lataaja)
@@ -0,0 +1,42 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import os
+import sys
+
+import pytest
+
+import kirjaaja_v6
+from kirjaaja_v6 import tallenna_raportti
+
+
+def test_ei_muuta_hakupolkua():
+    assert not any(p.rstrip(os.sep).endswith("yhteiset") for p in sys.path)
+    assert kirjaaja_v6.kirjoita_atomisesti.__module__ == "yhteiset.raporttikirjoitin"
+
+
+def test_kirjoittaa_rivit_generaattorista(tmp_path):
+    polku = tmp_path / "raportti.txt"
+    tallenna_raportti((f"rivi {i}" for i in range(25_000)), str(polku))
+    rivit = polku.read_text(encoding="utf-8").split("\n")
+    assert rivit[0] == "rivi 0" and rivit[-2] == "rivi 24999" and rivit[-1] == ""
+    assert os.listdir(tmp_path) == ["raportti.txt"]
+
+
+def test_virhe_sailyttaa_vanhan_raportin(tmp_path):
+    polku = tmp_path / "raportti.txt"
+    polku.write_text("vanha\n", encoding="utf-8")
+
+    def rivit():
+        yield "uusi"
+        raise RuntimeError("keskeytys")
+
+    with pytest.raises(RuntimeError):
+        tallenna_raportti(rivit(), str(polku))
+    assert polku.read_text(encoding="utf-8") == "vanha\n"
+    assert os.listdir(tmp_path) == ["raportti.txt"]
+
+
+def test_kirjoitusvirhe_nostetaan(tmp_path):
+    with pytest.raises(OSError):
+        tallenna_raportti(["rivi"], str(tmp_path / "puuttuu" / "raportti.txt"))
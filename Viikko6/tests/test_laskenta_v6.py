@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+from datetime import date, datetime
+
+import pytest
+
+import laskenta_v6
+from laskenta_v6 import Paivakertyma, muodosta_kuukaudet, muodosta_paivat, muodosta_vuosi
+from lukija_v6 import iter_vuosi, lataa_vuosi
+
+
+def _alkuperaiset(rivit):
+    """Alkuperäinen laskutapa: päivät ja kuukaudet +=, vuosi sum()."""
+    paivat, tunteja = {}, {}
+    for r in rivit:
+        d = datetime.fromisoformat(r["aika"]).date()
+        p = paivat.setdefault(d, {"kulutus": 0.0, "tuotanto": 0.0, "_lam": 0.0})
+        p["kulutus"] += float(r["kulutus"].replace(",", "."))
+        p["tuotanto"] += float(r["tuotanto"].replace(",", "."))
+        p["_lam"] += float(r["keskilämpötila"].replace(",", "."))
+        tunteja[d] = tunteja.get(d, 0) + 1
+    for d, p in paivat.items():
+        p["lampotila"] = p.pop("_lam") / tunteja[d]
+    kk, paivia = {}, {}
+    for d, v in paivat.items():
+        k = kk.setdefault((d.year, d.month), {"kulutus": 0.0, "tuotanto": 0.0, "_lam": 0.0})
+        k["kulutus"] += v["kulutus"]
+        k["tuotanto"] += v["tuotanto"]
+        k["_lam"] += v["lampotila"]
+        paivia[(d.year, d.month)] = paivia.get((d.year, d.month), 0) + 1
+    for a, k in kk.items():
+        k["lampotila"] = k.pop("_lam") / paivia[a]
+    vuosi = {
+        "kulutus": sum(v["kulutus"] for v in paivat.values()),
+        "tuotanto": sum(v["tuotanto"] for v in paivat.values()),
+        "lampotila": sum(v["lampotila"] for v in paivat.values()) / len(paivat),
+    }
+    return paivat, kk, vuosi
+
+
+@pytest.mark.parametrize("numpylla", [True, False])
+def test_summat_bitilleen_kuten_alkuperainen(vuositiedosto, monkeypatch, numpylla):
+    if numpylla:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(laskenta_v6, "np", None)
+    rivit = lataa_vuosi(vuositiedosto)
+    paivat, kk, vuosi = _alkuperaiset(rivit)
+
+    saadut = muodosta_paivat(rivit)
+    assert saadut == paivat
+    assert muodosta_kuukaudet(saadut) == kk
+    assert muodosta_vuosi(saadut) == vuosi
+
+
+def test_sarakelataus_bitilleen_kuten_rivilataus(vuositiedosto):
+    pytest.importorskip("numpy")
+    from lukija_v6 import lataa_vuosi_sarakkeet
+
+    paivat, kk, vuosi = _alkuperaiset(lataa_vuosi(vuositiedosto))
+    sarakkeista = muodosta_paivat(lataa_vuosi_sarakkeet(vuositiedosto))
+    assert sarakkeista == paivat
+    assert muodosta_kuukaudet(sarakkeista) == kk
+    assert muodosta_vuosi(sarakkeista) == vuosi
+
+
+def test_vuosi_rajaa_vuoden():
+    paivat = {date(2024, 12, 31): {"kulutus": 1.0, "tuotanto": 0.5, "lampotila": 2.0},
+              date(2025, 1, 1): {"kulutus": 2.0, "tuotanto": 0.25, "lampotila": 4.0}}
+    assert muodosta_vuosi(paivat, 2025) == {"kulutus": 2.0, "tuotanto": 0.25, "lampotila": 4.0}
+
+
+def test_virtaava_laskenta_kuten_alkuperainen(vuositiedosto):
+    paivat, kk, vuosi = _alkuperaiset(lataa_vuosi(vuositiedosto))
+    virrasta = muodosta_paivat(iter_vuosi(vuositiedosto))
+    assert virrasta == paivat
+    assert list(virrasta) == list(paivat)
+
+    kertyma = Paivakertyma()
+    for r in iter_vuosi(vuositiedosto):
+        kertyma.lisaa_rivi(r)
+    assert kertyma.paivat() == paivat
+    assert kertyma.kuukaudet() == kk
+    assert kertyma.vuosi() == vuosi
+    assert all(kertyma.paiva(d) == p for d, p in paivat.items())
+
+
+def test_kertyma_ohittaa_rivit_ilman_aikaa():
+    kertyma = Paivakertyma()
+    assert kertyma.lisaa_rivi({"aika": "", "kulutus": "1,0"}) is None
+    d = kertyma.lisaa_rivi({"aika": "2025-03-01T23:00:00+02:00", "kulutus": "1,5",
+                            "tuotanto": "0,5", "keskilämpötila": "-2,0"})
+    assert d == date(2025, 3, 1)
+    assert kertyma.paivat() == {d: {"kulutus": 1.5, "tuotanto": 0.5, "lampotila": -2.0}}
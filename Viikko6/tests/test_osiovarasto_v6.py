@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import os
+import shutil
+from datetime import date
+
+import pytest
+
+from laskenta_v6 import muodosta_kuukaudet, muodosta_paivat, muodosta_vuosi
+from lukija_v6 import lataa_vuosi
+from osiovarasto_v6 import Osiovarasto
+
+LISATTY = "2026-01-10T00:00:00.000+02:00;7,000;0,000;1,0\n"
+
+
+@pytest.fixture
+def hakemisto(vuositiedosto, tmp_path):
+    """2025.csv (ulottuu helmikuuhun 2026), 2026.csv sen vuoden 2026 riveistä ja mittari talli/2025.csv."""
+    with open(vuositiedosto, encoding="utf-8") as f:
+        otsikko, *rivit = f.readlines()
+    with open(tmp_path / "2026.csv", "w", encoding="utf-8") as f:
+        f.writelines([otsikko] + [r for r in rivit if r.startswith("2026")])
+    os.mkdir(tmp_path / "talli")
+    shutil.copy(vuositiedosto, tmp_path / "talli" / "2025.csv")
+    return tmp_path
+
+
+def _vuoden_paivat(polku, vuosi):
+    return {d: v for d, v in muodosta_paivat(lataa_vuosi(str(polku))).items() if d.year == vuosi}
+
+
+def test_osiot_ladataan_tarpeen_mukaan(hakemisto):
+    varasto = Osiovarasto.hakemistosta(str(hakemisto))
+    assert varasto.mittarit() == ["oletus", "talli"]
+    assert varasto.vuodet() == [2025, 2026]
+    assert varasto.ladatut() == []
+
+    paivat = _vuoden_paivat(hakemisto / "2025.csv", 2025)
+    assert varasto.paivat_valilta(date(2025, 3, 1), date(2025, 3, 31)) == {
+        d: v for d, v in paivat.items() if date(2025, 3, 1) <= d <= date(2025, 3, 31)}
+    assert varasto.ladatut() == [("oletus", 2025)]
+
+    # Osioon kuuluu vain sen vuosi, vaikka tiedostossa on rivejä seuraavalta
+    osio_paivat, kkdata, vdata = varasto.osio(2025)
+    assert osio_paivat == paivat
+    assert kkdata == muodosta_kuukaudet(paivat)
+    assert vdata == muodosta_vuosi(paivat, 2025)
+    assert varasto.osio(2024) is None
+    assert varasto.vuosi(2024) == muodosta_vuosi({})
+    assert varasto.kkdata(2025, "talli") == kkdata
+    assert ("talli", 2025) in varasto.ladatut()
+
+
+def test_monen_vuoden_vali_ja_uudelleenlataus(hakemisto):
+    varasto = Osiovarasto.hakemistosta(str(hakemisto))
+    alku, loppu = date(2025, 12, 20), date(2026, 1, 15)
+    odotettu = {**_vuoden_paivat(hakemisto / "2025.csv", 2025),
+                **_vuoden_paivat(hakemisto / "2026.csv", 2026)}
+    odotettu = {d: v for d, v in odotettu.items() if alku <= d <= loppu}
+
+    saatu = varasto.paivat_valilta(loppu, alku)
+    assert saatu == odotettu
+    assert list(saatu) == sorted(odotettu)
+    indeksi = varasto.paivaindeksi(alku, loppu)
+    assert varasto.paivaindeksi(alku, loppu) is indeksi
+
+    with open(hakemisto / "2026.csv", "a", encoding="utf-8") as f:
+        f.write(LISATTY)
+    uusi = varasto.paivaindeksi(alku, loppu)
+    assert uusi is not indeksi
+    assert dict(uusi.rivit(date(2026, 1, 10), date(2026, 1, 10))) == {
+        date(2026, 1, 10): _vuoden_paivat(hakemisto / "2026.csv", 2026)[date(2026, 1, 10)]}
+    assert varasto.vuosi(2026) == muodosta_vuosi(_vuoden_paivat(hakemisto / "2026.csv", 2026))
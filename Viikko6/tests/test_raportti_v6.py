@@ -0,0 +1,55 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import random
+from datetime import date, timedelta
+
+from laskenta_v6 import Paivaindeksi
+from raportti_v6 import _fmt, raportti_paivavalilta
+
+
+def _paivat(n=365, siemen=1):
+    satunnainen = random.Random(siemen)
+    alku = date(2025, 1, 1)
+    return {
+        alku + timedelta(days=i): {
+            "kulutus": satunnainen.randint(0, 60000) / 1000,
+            "tuotanto": satunnainen.randint(0, 30000) / 1000,
+            "lampotila": satunnainen.randint(-300, 300) / 10,
+        }
+        for i in range(n)
+    }
+
+
+def _yhteenveto(paivat, alku, loppu):
+    """Alkuperäinen laskutapa: sum() välin päivistä."""
+    valitut = [v for d, v in paivat.items() if alku <= d <= loppu]
+    kul = sum(v["kulutus"] for v in valitut)
+    tuo = sum(v["tuotanto"] for v in valitut)
+    lam = sum(v["lampotila"] for v in valitut) / len(valitut) if valitut else 0.0
+    return [
+        f"Yhteensä kulutus:  {_fmt(kul)} kWh",
+        f"Yhteensä tuotanto: {_fmt(tuo)} kWh",
+        f"Nettokuorma:       {_fmt(kul - tuo)} kWh",
+        f"Keskilämpötila:    {_fmt(lam)} °C",
+    ]
+
+
+def test_valin_summat_kuten_sum():
+    paivat = _paivat()
+    indeksi = Paivaindeksi(paivat)
+    satunnainen = random.Random(2)
+    for _ in range(500):
+        a, b = sorted(satunnainen.sample(sorted(paivat), 2))
+        odotettu = _yhteenveto(paivat, a, b)
+        assert raportti_paivavalilta(paivat, a, b)[-4:] == odotettu
+        assert raportti_paivavalilta(None, a, b, indeksi=indeksi)[-4:] == odotettu
+
+
+def test_paivarivit_ja_tyhja_vali():
+    paivat = _paivat(10)
+    rivit = raportti_paivavalilta(paivat, date(2025, 1, 3), date(2025, 1, 5))
+    assert len(rivit) == 3 + 3 + 5
+    assert rivit[3].startswith("perjantai    3.1.2025")
+    tyhja = raportti_paivavalilta(paivat, date(2026, 1, 1), date(2026, 1, 2))
+    assert tyhja[-1] == "Keskilämpötila:    0,00 °C"
@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+from raporttimuisti_v6 import Raporttimuisti
+
+
+def _muodostaja(kutsut, rivit):
+    def muodosta():
+        kutsut.append(rivit)
+        return [f"rivi {i}" for i in range(rivit)]
+    return muodosta
+
+
+def test_lru_poistaa_vanhimmin_kaytetyn():
+    muisti = Raporttimuisti(koko=2)
+    kutsut = []
+    a = muisti.hae("a", _muodostaja(kutsut, 1))
+    muisti.hae("b", _muodostaja(kutsut, 2))
+    assert muisti.hae("a", _muodostaja(kutsut, 1)) is a
+    muisti.hae("c", _muodostaja(kutsut, 3))   # b poistuu, a käytettiin viimeksi
+    assert len(muisti) == 2
+    muisti.hae("a", _muodostaja(kutsut, 1))
+    muisti.hae("b", _muodostaja(kutsut, 2))
+    assert kutsut == [1, 2, 3, 2]
+    assert (muisti.osumat, muisti.ohitukset) == (2, 4)
+    assert muisti.tilasto() == ("Raporttivälimuisti: 2 osumaa, 4 ohitusta (33 %), "
+                                "muistissa 2 raporttia")
+
+
+def test_riviraja():
+    muisti = Raporttimuisti(koko=10, enintaan_riveja=5)
+    kutsut = []
+    muisti.hae("iso", _muodostaja(kutsut, 6))      # yli rajan: ei tallenneta
+    assert len(muisti) == 0
+    muisti.hae("a", _muodostaja(kutsut, 3))
+    muisti.hae("b", _muodostaja(kutsut, 2))
+    muisti.hae("c", _muodostaja(kutsut, 1))        # 6 riviä -> a poistuu
+    assert len(muisti) == 2
+    muisti.hae("b", _muodostaja(kutsut, 2))
+    muisti.hae("a", _muodostaja(kutsut, 3))
+    assert kutsut == [6, 3, 2, 1, 3]
+
+    muisti.tyhjenna()
+    assert len(muisti) == 0
+    muisti.hae("d", _muodostaja(kutsut, 5))
+    assert len(muisti) == 1
+    assert muisti.tilasto().endswith("muistissa 1 raporttia")
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from aikavyohyke_v6 import Vyohyke
+from uudelleenotanta_v6 import JAKSOT, tunnista_naytevali, uudelleenota
+
+np = pytest.importorskip("numpy")
+
+HELSINKI = ZoneInfo("Europe/Helsinki")
+
+
+def _data(alku: datetime, naytteita: int, naytevali: int, aukot=(), siemen=1):
+    """UTC-aikaiset näytteet tasavälein; aukot: poistettavat näyteindeksit."""
+    satunnainen = random.Random(siemen)
+    epoch = [int(alku.timestamp()) + i * naytevali for i in range(naytteita) if i not in aukot]
+    return {
+        "aika": np.array(epoch, dtype="datetime64[s]"),
+        "kulutus": np.array([satunnainen.randint(0, 400) / 100 for _ in epoch]),
+        "tuotanto": np.array([satunnainen.randint(0, 200) / 100 for _ in epoch]),
+        "keskilämpötila": np.array([satunnainen.randint(-200, 200) / 10 for _ in epoch]),
+    }
+
+
+def _jakson_alku(t: datetime, jakso: str) -> datetime:
+    """Näytteen jakson alkuhetki (UTC): alle vuorokauden UTC:ssä, muut Helsingin ajassa."""
+    if jakso == "15min":
+        return t.replace(minute=t.minute - t.minute % 15, second=0)
+    if jakso == "tunti":
+        return t.replace(minute=0, second=0)
+    paikallinen = t.astimezone(HELSINKI).replace(hour=0, minute=0, second=0)
+    if jakso == "viikko":
+        paikallinen -= timedelta(days=paikallinen.weekday())
+    elif jakso == "kuukausi":
+        paikallinen = paikallinen.replace(day=1)
+    return paikallinen.replace(tzinfo=None).replace(tzinfo=HELSINKI).astimezone(timezone.utc)
+
+
+def _suoraan(data, jakso):
+    """Brute force: jakson alku -> [kulutus, tuotanto, lämpötilasumma, näytteitä]."""
+    tulos = {}
+    for i, a in enumerate(data["aika"].astype(np.int64).tolist()):
+        t = datetime.fromtimestamp(a, timezone.utc)
+        s = tulos.setdefault(_jakson_alku(t, jakso), [0.0, 0.0, 0.0, 0])
+        s[0] += data["kulutus"][i]
+        s[1] += data["tuotanto"][i]
+        s[2] += data["keskilämpötila"][i]
+        s[3] += 1
+    return tulos
+
+
+@pytest.mark.parametrize("jakso", JAKSOT)
+def test_kuten_suora_laskenta(jakso):
+    # 15 min näytteet yli kesäajan päättymisen (26.10.2025, 25 tunnin päivä), yksi aukko
+    data = _data(datetime(2025, 10, 1, tzinfo=timezone.utc), 4 * 24 * 40, 900, aukot=range(200, 300))
+    tulos = uudelleenota(data, jakso, Vyohyke("Europe/Helsinki"))
+    odotettu = _suoraan(data, jakso)
+
+    alut = [datetime.fromtimestamp(a, timezone.utc) for a in tulos["alku"].astype(np.int64).tolist()]
+    assert set(odotettu) <= set(alut)
+    assert (tulos["alku"][1:] == tulos["loppu"][:-1]).all()
+    for i, alku in enumerate(alut):
+        kul, tuo, lam, n = odotettu.get(alku, [0.0, 0.0, 0.0, 0])
+        assert tulos["naytteita"][i] == n
+        assert tulos["kulutus"][i] == pytest.approx(kul)
+        assert tulos["tuotanto"][i] == pytest.approx(tuo)
+        assert tulos["keskilämpötila"][i] == pytest.approx(lam / max(n, 1))
+        pituus = int(tulos["loppu"][i].astype(np.int64) - tulos["alku"][i].astype(np.int64))
+        assert tulos["odotettu"][i] == pituus // 900
+
+
+def test_kattavuus_ja_kesaajan_paivat():
+    data = _data(datetime(2025, 10, 24, 21, tzinfo=timezone.utc), 24 * 4, 3600, aukot={30})
+    tulos = uudelleenota(data, "paiva")
+    # 25.10. (24 h), 26.10. (25 h, yksi tunti puuttuu), 27.10. (24 h)
+    assert tulos["odotettu"].tolist()[:3] == [24, 25, 24]
+    assert tulos["naytteita"].tolist()[:3] == [24, 24, 24]
+    assert tulos["kattavuus"][1] == pytest.approx(24 / 25)
+
+    tunnit = uudelleenota(data, "tunti")
+    assert tunnit["naytteita"].tolist().count(0) == 1
+    assert len(tunnit["alku"]) == 24 * 4
+
+
+def test_naytevali_ja_virheet():
+    data = _data(datetime(2025, 1, 1, tzinfo=timezone.utc), 500, 3600, aukot={3, 4, 5})
+    assert tunnista_naytevali(data["aika"]) == 3600
+    assert tunnista_naytevali(data["aika"][::-1]) == 3600
+    with pytest.raises(ValueError):
+        uudelleenota(data, "15min")
+    with pytest.raises(ValueError):
+        uudelleenota(data, "vuosi")
+    assert len(uudelleenota(_data(datetime(2025, 1, 1), 0, 60), "tunti", naytevali=60)["alku"]) == 0
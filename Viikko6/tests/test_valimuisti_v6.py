@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+import os
+from datetime import date
+
+import osiovarasto_v6
+from osiovarasto_v6 import lataa_aggregaatit
+from valimuisti_v6 import lahteen_avain, lataa_valimuistista, valimuistin_polku
+
+LISATTY = "2026-02-05T00:00:00.000+02:00;9,000;0,000;1,0\n"
+
+
+def test_valimuisti_osuu_muuttumattomaan(vuositiedosto, capsys):
+    ensin = lataa_aggregaatit(vuositiedosto)
+    assert "Ladataan dataa" in capsys.readouterr().err
+    assert lataa_aggregaatit(vuositiedosto) == ensin
+    assert "välimuistista" in capsys.readouterr().err
+
+
+def test_luvun_aikana_lisatty_rivi_ei_jaa_vanhaan_valimuistiin(vuositiedosto, monkeypatch):
+    alkuperainen = osiovarasto_v6.muodosta_paivat
+
+    def muodosta_ja_lisaa(*args, **kwargs):
+        # Tunnin rivi lisätään lukemisen jälkeen mutta ennen välimuistin tallennusta
+        paivat = alkuperainen(*args, **kwargs)
+        with open(vuositiedosto, "a", encoding="utf-8") as f:
+            f.write(LISATTY)
+        return paivat
+
+    monkeypatch.setattr(osiovarasto_v6, "muodosta_paivat", muodosta_ja_lisaa)
+    ensin, _, _ = lataa_aggregaatit(vuositiedosto)
+    monkeypatch.undo()
+    assert date(2026, 2, 5) not in ensin
+    assert lataa_valimuistista(vuositiedosto, lahteen_avain(vuositiedosto)) is None
+
+    toinen, _, _ = lataa_aggregaatit(vuositiedosto)
+    assert toinen[date(2026, 2, 5)]["kulutus"] == 9.0
+
+
+def test_kirjoitusvirhe_virhevirtaan_ilman_jaanteita(vuositiedosto, capsys):
+    os.mkdir(valimuistin_polku(vuositiedosto))   # hakemisto estää korvauksen
+    lataa_aggregaatit(vuositiedosto)
+    tulos = capsys.readouterr()
+    assert tulos.out == ""
+    assert "Virhe kirjoitettaessa välimuistia" in tulos.err
+    assert not [n for n in os.listdir(os.path.dirname(vuositiedosto)) if n.endswith(".tmp")]
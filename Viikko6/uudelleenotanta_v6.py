@@ -0,0 +1,140 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Aikasarjan uudelleenotanta (Viikko6).
+
+Kokoaa lataa_vuosi_sarakkeet-muotoisen datan millä tahansa
+näyteväliltä (1 min, 15 min, tunti, ...) valittuihin jaksoihin:
+15 min, tunti, päivä, ISO-viikko tai kuukausi. Jokainen näyte saa
+jakson kokonaislukuavaimen yhdellä vektorilaskulla ja summat lasketaan
+np.bincount-funktiolla, kuten laskenta_v6:ssa.
+
+Jokaiselle jaksolle kerrotaan myös kattavuus: montako näytettä jaksossa
+on ja montako näyteväli huomioiden pitäisi olla. Jaksot, joista puuttuu
+kaikki data, ovat mukana (näytteitä 0), joten aukot näkyvät suoraan.
+
+Alle vuorokauden jaksot rajataan UTC-ajassa (kesäajan päättyessä toistuva
+tunti on kaksi eri jaksoa), päivä, viikko ja kuukausi vyöhykkeen
+paikallisajassa (23 ja 25 tunnin päivät, ks. aikavyohyke_v6).
+"""
+
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy on valinnainen riippuvuus
+    np = None
+
+from aikavyohyke_v6 import Vyohyke, hae_vyohyke, kuukausiavain, paivanumero_paivaksi
+
+JAKSOT = ("15min", "tunti", "paiva", "viikko", "kuukausi")
+
+_PAIVA = 86400
+# Alle vuorokauden jaksojen pituus sekunteina
+_KIINTEAT = {"15min": 900, "tunti": 3600}
+
+
+def tunnista_naytevali(aika: "np.ndarray") -> int:
+    """Arvioi näytevälin sekunteina (peräkkäisten aikaleimojen erotusten mediaani)."""
+    epoch = aika.astype("datetime64[s]").astype(np.int64)
+    erot = np.diff(epoch)
+    if (erot < 0).any():   # tiedosto on yleensä aikajärjestyksessä; muuten järjestetään
+        erot = np.diff(np.sort(epoch))
+    erot = erot[erot > 0]
+    if len(erot) == 0:
+        return 3600
+    return int(np.median(erot))
+
+
+def _avaimet(epoch: "np.ndarray", jakso: str, vyohyke: Vyohyke) -> "np.ndarray":
+    """Näytteiden jaksoavaimet (peräkkäiset kokonaisluvut peräkkäisille jaksoille)."""
+    if jakso in _KIINTEAT:
+        return epoch // _KIINTEAT[jakso]
+    paivat = vyohyke.paivanumerot(epoch)
+    if jakso == "paiva":
+        return paivat
+    if jakso == "viikko":
+        # 1.1.1970 oli torstai: (paiva + 3) // 7 vaihtuu maanantaisin
+        return (paivat + 3) // 7
+    return kuukausiavain(paivat)
+
+
+def _jakson_rajat(avaimet: "np.ndarray", jakso: str, vyohyke: Vyohyke):
+    """Jaksojen alku- ja loppuhetket UTC-sekunteina: (alut, loput)."""
+    if jakso in _KIINTEAT:
+        pituus = _KIINTEAT[jakso]
+        return avaimet * pituus, (avaimet + 1) * pituus
+    # Jakson ensimmäinen päivä päivänumerona, myös seuraavalle jaksolle
+    if jakso == "paiva":
+        ekat = avaimet
+        seuraavat = avaimet + 1
+    elif jakso == "viikko":
+        ekat = avaimet * 7 - 3
+        seuraavat = ekat + 7
+    else:
+        # Kuukausiavain -> kuukausia 1970-01 alkaen -> kuukauden ensimmäinen päivä
+        kuukaudet = avaimet - 1970 * 12
+        ekat = kuukaudet.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        seuraavat = (kuukaudet + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    # Paikallisen keskiyön hetki: jakson rajoja on vähän, joten lasketaan yksitellen
+    alku = {int(p): vyohyke.paivan_alku(paivanumero_paivaksi(p)) for p in np.union1d(ekat, seuraavat)}
+    alut = np.fromiter((alku[int(p)] for p in ekat), dtype=np.int64, count=len(ekat))
+    loput = np.fromiter((alku[int(p)] for p in seuraavat), dtype=np.int64, count=len(seuraavat))
+    return alut, loput
+
+
+def uudelleenota(data: Dict[str, "np.ndarray"], jakso: str,
+                 vyohyke: Optional[Vyohyke] = None,
+                 naytevali: Optional[int] = None) -> Dict[str, "np.ndarray"]:
+    """Kokoaa lataa_vuosi_sarakkeet-datan jaksoihin.
+
+    jakso: "15min", "tunti", "paiva", "viikko" (ISO, maanantaista) tai "kuukausi".
+    vyohyke: päivän, viikon ja kuukauden rajat (oletus Europe/Helsinki).
+    naytevali: näyteväli sekunteina; oletuksena tunnistetaan datasta.
+        Jakso ei voi olla näyteväliä lyhyempi (ValueError).
+
+    Palauttaa jaksoittain (myös tyhjät jaksot ensimmäisen ja viimeisen välissä):
+        {"alku": datetime64[s] (UTC), "loppu": datetime64[s] (UTC),
+         "kulutus": float64 (summa), "tuotanto": float64 (summa),
+         "keskilämpötila": float64 (näytteiden keskiarvo, tyhjälle 0.0),
+         "naytteita": int64, "odotettu": int64, "kattavuus": float64 (0.0–1.0)}
+    """
+    if np is None:
+        raise ImportError("Uudelleenotanta vaatii numpy-paketin.")
+    if jakso not in JAKSOT:
+        raise ValueError(f"Tuntematon jakso {jakso!r}, sallitut: {', '.join(JAKSOT)}")
+    vyohyke = vyohyke or hae_vyohyke()
+    epoch = data["aika"].astype("datetime64[s]").astype(np.int64)
+    naytevali = naytevali or tunnista_naytevali(data["aika"])
+    if _KIINTEAT.get(jakso, _PAIVA) < naytevali:
+        raise ValueError(f"Jakso {jakso} on lyhyempi kuin näyteväli ({naytevali} s)")
+
+    if len(epoch) == 0:
+        tyhja_f = np.zeros(0, dtype=np.float64)
+        tyhja_i = np.zeros(0, dtype=np.int64)
+        tyhja_t = np.zeros(0, dtype="datetime64[s]")
+        return {"alku": tyhja_t, "loppu": tyhja_t, "kulutus": tyhja_f, "tuotanto": tyhja_f,
+                "keskilämpötila": tyhja_f, "naytteita": tyhja_i, "odotettu": tyhja_i,
+                "kattavuus": tyhja_f}
+
+    avaimet = _avaimet(epoch, jakso, vyohyke)
+    pienin = int(avaimet.min())
+    n = int(avaimet.max()) - pienin + 1
+    indeksit = avaimet - pienin
+    naytteita = np.bincount(indeksit, minlength=n)
+    kul, tuo, lam = (np.bincount(indeksit, weights=data[k], minlength=n)
+                     for k in ("kulutus", "tuotanto", "keskilämpötila"))
+
+    alut, loput = _jakson_rajat(np.arange(pienin, pienin + n, dtype=np.int64), jakso, vyohyke)
+    odotettu = (loput - alut) // naytevali
+    return {
+        "alku": alut.astype("datetime64[s]"),
+        "loppu": loput.astype("datetime64[s]"),
+        "kulutus": kul,
+        "tuotanto": tuo,
+        "keskilämpötila": lam / np.maximum(naytteita, 1),
+        "naytteita": naytteita,
+        "odotettu": odotettu,
+        "kattavuus": naytteita / np.maximum(odotettu, 1),
+    }
@@ -0,0 +1,139 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Aggregaattien välimuisti levylle (Viikko6).
+
+Tallentaa paivat-, kkdata- ja vdata-rakenteet tiiviiseen binäärimuotoon
+CSV-tiedoston viereen. Välimuisti on sidottu lähdetiedoston polkuun, kokoon,
+muokkausaikaan ja sisällön SHA-256-tiivisteeseen; jos jokin muuttuu,
+välimuisti ohitetaan ja data lasketaan uudelleen.
+
+Tiedostomuoto (little-endian):
+    otsake:   MAGIC (6 tavua), versio (B)
+    avain:    polun tiiviste (32s), koko (Q), mtime_ns (q), sisällön tiiviste (32s)
+    määrät:   päiviä (I), kuukausia (I)
+    päivät:   ordinaali (i), kulutus, tuotanto, lampotila (3d)
+    kuukaudet: vuosi (H), kk (B), kulutus, tuotanto, lampotila (3d)
+    vuosi:    kulutus, tuotanto, lampotila (3d)
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+MAGIC = b"V6AGG\0"
+VERSIO = 1
+
+_OTSAKE = struct.Struct("<6sB32sQq32sII")
+_PAIVA = struct.Struct("<i3d")
+_KUUKAUSI = struct.Struct("<HB3d")
+_VUOSI = struct.Struct("<3d")
+
+Paivat = Dict[date, Dict[str, float]]
+Kuukaudet = Dict[Tuple[int, int], Dict[str, float]]
+Aggregaatit = Tuple[Paivat, Kuukaudet, Dict[str, float]]
+Avain = Tuple[bytes, int, int, bytes]
+
+
+def valimuistin_polku(polku: str, vyohyke: Optional[str] = None) -> str:
+    """Välimuistitiedoston nimi: CSV:n vieressä, esim. '.2025.csv.v6cache'.
+
+    Aikavyöhykkeen mukaan jaetuilla päivillä on oma välimuistinsa,
+    esim. '.2025.csv.Europe_Helsinki.v6cache'.
+    """
+    hakemisto, nimi = os.path.split(os.path.abspath(polku))
+    if vyohyke:
+        nimi = f"{nimi}.{vyohyke.replace('/', '_')}"
+    return os.path.join(hakemisto, f".{nimi}.v6cache")
+
+
+def _sisallon_tiiviste(polku: str) -> bytes:
+    """Laskee tiedoston SHA-256-tiivisteen 1 MiB paloina."""
+    h = hashlib.sha256()
+    with open(polku, "rb") as f:
+        for pala in iter(lambda: f.read(1 << 20), b""):
+            h.update(pala)
+    return h.digest()
+
+
+def lahteen_avain(polku: str) -> Avain:
+    """Lähdetiedoston sormenjälki: (polun tiiviste, koko, mtime_ns, sisällön tiiviste).
+
+    Avain otetaan ennen kuin lähde luetaan ja annetaan sitten
+    tallenna_valimuistiin-funktiolle: jos tiedostoon lisätään rivejä luvun
+    aikana, välimuisti jää vanhalle avaimelle ja lasketaan seuraavalla
+    kerralla uudelleen (eikä vanhoja summia tallenneta uuden tiedoston avaimella).
+    """
+    st = os.stat(polku)
+    polun_tiiviste = hashlib.sha256(os.path.abspath(polku).encode("utf-8")).digest()
+    return polun_tiiviste, st.st_size, st.st_mtime_ns, _sisallon_tiiviste(polku)
+
+
+def _arvot(v: Dict[str, float]) -> Tuple[float, float, float]:
+    return v["kulutus"], v["tuotanto"], v["lampotila"]
+
+
+def _sanakirja(kul: float, tuo: float, lam: float) -> Dict[str, float]:
+    return {"kulutus": kul, "tuotanto": tuo, "lampotila": lam}
+
+
+def tallenna_valimuistiin(polku: str, avain: Avain, paivat: Paivat, kkdata: Kuukaudet,
+                          vdata: Dict[str, float], vyohyke: Optional[str] = None) -> None:
+    """Kirjoittaa aggregaatit välimuistiin (väliaikaistiedosto + atominen korvaus).
+
+    avain on lahteen_avain(polku) ennen lähteen lukemista. Kirjoitusvirhe ei
+    keskeytä ajoa: ilmoitus tulostetaan virhevirtaan ja väliaikaistiedosto poistetaan.
+    """
+    kohde = valimuistin_polku(polku, vyohyke)
+    tmp = f"{kohde}.{os.getpid()}.tmp"
+    osat = [_OTSAKE.pack(MAGIC, VERSIO, *avain, len(paivat), len(kkdata))]
+    osat += [_PAIVA.pack(d.toordinal(), *_arvot(v)) for d, v in paivat.items()]
+    osat += [_KUUKAUSI.pack(v, k, *_arvot(a)) for (v, k), a in kkdata.items()]
+    osat.append(_VUOSI.pack(*_arvot(vdata)))
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b"".join(osat))
+        os.replace(tmp, kohde)
+    except OSError as e:
+        print(f"Virhe kirjoitettaessa välimuistia {kohde}: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def lataa_valimuistista(polku: str, avain: Avain, vyohyke: Optional[str] = None) -> Optional[Aggregaatit]:
+    """Palauttaa (paivat, kkdata, vdata) välimuistista tai None, jos se puuttuu tai on vanhentunut.
+
+    avain on lähteen nykyinen lahteen_avain(polku).
+    """
+    kohde = valimuistin_polku(polku, vyohyke)
+    try:
+        with open(kohde, "rb") as f:
+            data = f.read()
+        magic, versio, p_tiiviste, koko, mtime, s_tiiviste, n_pv, n_kk = _OTSAKE.unpack_from(data, 0)
+        if magic != MAGIC or versio != VERSIO:
+            return None
+        if (p_tiiviste, koko, mtime, s_tiiviste) != avain:
+            return None
+
+        kohta = _OTSAKE.size
+        paivat: Paivat = {}
+        for ordinaali, *arvot in _PAIVA.iter_unpack(data[kohta:kohta + n_pv * _PAIVA.size]):
+            paivat[date.fromordinal(ordinaali)] = _sanakirja(*arvot)
+        kohta += n_pv * _PAIVA.size
+        kkdata: Kuukaudet = {}
+        for vuosi, kk, *arvot in _KUUKAUSI.iter_unpack(data[kohta:kohta + n_kk * _KUUKAUSI.size]):
+            kkdata[(vuosi, kk)] = _sanakirja(*arvot)
+        kohta += n_kk * _KUUKAUSI.size
+        vdata = _sanakirja(*_VUOSI.unpack_from(data, kohta))
+        if kohta + _VUOSI.size != len(data):
+            return None
+        return paivat, kkdata, vdata
+    except (OSError, struct.error, ValueError):
+        # Puuttuva tai rikkinäinen välimuisti -> lasketaan uudelleen
+        return None
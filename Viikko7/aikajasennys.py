@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Nopeat jäsentimet varausrivien kiinteämuotoisille ajoille.
+# datetime.strptime on hidas, joten tunnettu muoto luetaan suoraan merkkien
+# paikoista (date.fromisoformat / kokonaisluvut). Jos merkkijono ei ole
+# odotettua muotoa, käytetään alkuperäistä tiukkaa strptime-jäsennystä,
+# jolloin virheelliset arvot hylätään samalla ValueErrorilla kuin ennenkin.
+# Päivämäärät ja kellonajat toistuvat varausdatassa paljon, joten ne muistetaan.
+
+from datetime import datetime, date, time
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def jasenna_paiva(s: str) -> date:
+    """'YYYY-MM-DD' -> date (kuten datetime.strptime(s, "%Y-%m-%d").date())."""
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and s.isascii():
+        try:
+            return date.fromisoformat(s)
+        except ValueError:
+            pass
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+@lru_cache(maxsize=4096)
+def jasenna_kellonaika(s: str) -> time:
+    """'HH:MM' -> time (kuten datetime.strptime(s, "%H:%M").time())."""
+    if len(s) == 5 and s[2] == ":" and s[:2].isdigit() and s[3:].isdigit() and s.isascii():
+        try:
+            return time(int(s[:2]), int(s[3:]))
+        except ValueError:
+            pass
+    return datetime.strptime(s, "%H:%M").time()
+
+
+def jasenna_aikaleima(s: str) -> datetime:
+    """'YYYY-MM-DD HH:MM:SS' -> datetime (kuten strptime muodolla "%Y-%m-%d %H:%M:%S")."""
+    if (len(s) == 19 and s[4] == "-" and s[7] == "-" and s[10] == " "
+            and s[13] == ":" and s[16] == ":" and s.isascii()
+            and s[0:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit()
+            and s[11:13].isdigit() and s[14:16].isdigit() and s[17:19].isdigit()):
+        try:
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]))
+        except ValueError:
+            pass
+    return datetime.strptime(s, "%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,241 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Valmiiksi kootut tulo- ja käyttökuutiot vahvistetuille varauksille.
+# Jokaiselle tasolle (paiva, viikko, kuukausi) pidetään taulu
+# jakso -> tila -> [tulot, tunnit, varauksia] sekä jakson kokonaissummat.
+# Kuutioita päivitetään sitä mukaa kuin varauksia ladataan (Varausvarasto.lisaa),
+# joten jakson summa on yksi sanakirjahaku eikä koko aineistoa tarvitse käydä läpi.
+# Tilojen järjestys (kärkilista) lasketaan jaksolle kerran ja pidetään muistissa,
+# kunnes jaksoon tulee uusi varaus.
+#
+# Kuutiot voi tallentaa tiedostoon ja yhdistää: usean varaustiedoston kuutiot
+# lasketaan yhteen yhdista()-funktiolla.
+# Ajo: python kuutiot.py [varaustiedosto ...]
+#
+# Tiedostomuoto (little-endian):
+#   otsake   MAGIC (8s), versio (H), tietueita (I), tiloja (I)
+#   tilat    pituus (H) + UTF-8-nimi, tiloja kpl
+#   tietueet taso (B), jakso (i), tila (I, tilan indeksi),
+#            tulot (d), tunnit (q), varauksia (q)
+#   Jakso on koodattu kokonaisluvuksi: paiva = ordinaali,
+#   viikko = vuosi * 100 + ISO-viikko, kuukausi = vuosi * 100 + kuukausi.
+
+import os
+import struct
+import sys
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+MAGIC = b"VARKUUT\0"
+VERSIO = 1
+
+TASOT = ("paiva", "viikko", "kuukausi")
+MITTARIT = ("tulot", "tunnit", "varauksia")
+
+_OTSAKE = struct.Struct("<8sHII")
+_PITUUS = struct.Struct("<H")
+_TIETUE = struct.Struct("<BiIdqq")
+
+
+class KuutioVirhe(ValueError):
+    """Kuutiotiedosto on rikki tai väärää versiota."""
+
+
+def _jaksot(paiva: date) -> Tuple[date, Tuple[int, int], Tuple[int, int]]:
+    """Päivän jaksot kaikilla tasoilla: (päivä, (ISO-vuosi, viikko), (vuosi, kuukausi))."""
+    iso = paiva.isocalendar()
+    return paiva, (iso[0], iso[1]), (paiva.year, paiva.month)
+
+
+def _koodaa(taso: str, jakso) -> int:
+    if taso == "paiva":
+        return jakso.toordinal()
+    return jakso[0] * 100 + jakso[1]
+
+
+def _pura(taso: str, koodi: int):
+    if taso == "paiva":
+        return date.fromordinal(koodi)
+    return divmod(koodi, 100)
+
+
+class Kuutiot:
+    """
+    Vahvistettujen varausten tulot (kesto * hinta), tunnit ja määrä tiloittain ja jaksoittain.
+    Jaksot: paiva = date, viikko = (ISO-vuosi, viikko), kuukausi = (vuosi, kuukausi).
+    """
+
+    def __init__(self, varaukset: Iterable[Dict] = ()) -> None:
+        # taso -> jakso -> tila -> [tulot, tunnit, varauksia]
+        self._solut: Dict[str, Dict[Hashable, Dict[str, List]]] = {t: {} for t in TASOT}
+        # taso -> jakso -> [tulot, tunnit, varauksia] kaikista tiloista
+        self._summat: Dict[str, Dict[Hashable, List]] = {t: {} for t in TASOT}
+        self._jarjestykset: Dict[Tuple[str, Hashable, str], List[Tuple[str, float]]] = {}
+        self._paivan_jaksot: Dict[date, Tuple] = {}
+        for varaus in varaukset:
+            self.lisaa(varaus)
+
+    def lisaa(self, varaus: Dict) -> None:
+        """Lisää varauksen kuutioihin. Vahvistamattomat ohitetaan (ei tuloja)."""
+        if not varaus["vahvistettu"]:
+            return
+        paiva = varaus["paiva"]
+        jaksot = self._paivan_jaksot.get(paiva)
+        if jaksot is None:
+            jaksot = self._paivan_jaksot[paiva] = _jaksot(paiva)
+        kohde = varaus["kohde"]
+        kesto = varaus["kesto"]
+        self._kirjaa(jaksot, kohde, kesto * varaus["hinta"], kesto, 1)
+
+    def _kirjaa(self, jaksot: Tuple, kohde: str, tulot: float, tunnit: int, lkm: int) -> None:
+        """Lisää luvut jakson soluun ja jakson summaan jokaisella tasolla (jaksot TASOT-järjestyksessä)."""
+        for taso, jakso in zip(TASOT, jaksot):
+            if jakso is None:
+                continue
+            tilat = self._solut[taso].get(jakso)
+            if tilat is None:
+                tilat = self._solut[taso][jakso] = {}
+                self._summat[taso][jakso] = [0.0, 0, 0]
+            solu = tilat.get(kohde)
+            if solu is None:
+                tilat[kohde] = [tulot, tunnit, lkm]
+            else:
+                solu[0] += tulot
+                solu[1] += tunnit
+                solu[2] += lkm
+            summa = self._summat[taso][jakso]
+            summa[0] += tulot
+            summa[1] += tunnit
+            summa[2] += lkm
+            if self._jarjestykset:
+                for mittari in MITTARIT:
+                    self._jarjestykset.pop((taso, jakso, mittari), None)
+
+    def jaksot(self, taso: str) -> List:
+        """Tason jaksot, joilla on vahvistettuja varauksia, aikajärjestyksessä."""
+        return sorted(self._summat[taso])
+
+    def tilat(self, taso: str, jakso) -> List[str]:
+        return list(self._solut[taso].get(jakso, ()))
+
+    def arvo(self, taso: str, jakso, mittari: str = "tulot", kohde: Optional[str] = None):
+        """Jakson tulot / tunnit / varausten määrä yhdessä tilassa tai kaikissa. O(1)."""
+        i = MITTARIT.index(mittari)
+        if kohde is None:
+            solu = self._summat[taso].get(jakso)
+        else:
+            solu = self._solut[taso].get(jakso, {}).get(kohde)
+        if solu is None:
+            return 0.0 if i == 0 else 0
+        return solu[i]
+
+    def tulot(self, taso: str, jakso, kohde: Optional[str] = None) -> float:
+        return self.arvo(taso, jakso, "tulot", kohde)
+
+    def tunnit(self, taso: str, jakso, kohde: Optional[str] = None) -> int:
+        return self.arvo(taso, jakso, "tunnit", kohde)
+
+    def karki(self, taso: str, jakso, mittari: str = "tulot",
+              n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Jakson tilat mittarin mukaan suurimmasta pienimpään: [(tila, arvo)].
+        Järjestys lasketaan kerran ja pidetään muistissa, kunnes jakso muuttuu."""
+        avain = (taso, jakso, mittari)
+        jarjestys = self._jarjestykset.get(avain)
+        if jarjestys is None:
+            i = MITTARIT.index(mittari)
+            tilat = self._solut[taso].get(jakso, {})
+            jarjestys = sorted(((k, s[i]) for k, s in tilat.items()), key=lambda p: (-p[1], p[0]))
+            self._jarjestykset[avain] = jarjestys
+        return jarjestys if n is None else jarjestys[:n]
+
+    def yhdista(self, muu: "Kuutiot") -> "Kuutiot":
+        """Lisää toisen kuution luvut tähän (esim. toisesta varaustiedostosta)."""
+        for taso in TASOT:
+            for jakso, tilat in muu._solut[taso].items():
+                jaksot = tuple(jakso if t == taso else None for t in TASOT)
+                for kohde, (tulot, tunnit, lkm) in tilat.items():
+                    self._kirjaa(jaksot, kohde, tulot, tunnit, lkm)
+        return self
+
+    def tallenna(self, polku: str) -> None:
+        """Kirjoittaa kuutiot tiedostoon (väliaikaistiedosto + os.replace)."""
+        tilat: Dict[str, int] = {}
+        tietueet = bytearray()
+        for t, taso in enumerate(TASOT):
+            for jakso, solut in self._solut[taso].items():
+                koodi = _koodaa(taso, jakso)
+                for kohde, (tulot, tunnit, lkm) in solut.items():
+                    i = tilat.setdefault(kohde, len(tilat))
+                    tietueet += _TIETUE.pack(t, koodi, i, tulot, tunnit, lkm)
+        nimet = bytearray()
+        for kohde in tilat:
+            b = kohde.encode("utf-8")
+            nimet += _PITUUS.pack(len(b)) + b
+        tmp = f"{polku}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_OTSAKE.pack(MAGIC, VERSIO, len(tietueet) // _TIETUE.size, len(tilat)))
+                f.write(nimet)
+                f.write(tietueet)
+            os.replace(tmp, polku)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def lataa(cls, polku: str) -> "Kuutiot":
+        """Lukee tallenna()-funktion kirjoittamat kuutiot. Rikki -> KuutioVirhe."""
+        with open(polku, "rb") as f:
+            data = f.read()
+        try:
+            magic, versio, n, tiloja = _OTSAKE.unpack_from(data, 0)
+            if magic != MAGIC:
+                raise KuutioVirhe("Ei varausten kuutiotiedosto")
+            if versio != VERSIO:
+                raise KuutioVirhe(f"Kuutiotiedoston versio {versio}, odotettiin {VERSIO}")
+            kohta = _OTSAKE.size
+            tilat = []
+            for _ in range(tiloja):
+                (pituus,) = _PITUUS.unpack_from(data, kohta)
+                kohta += _PITUUS.size
+                tilat.append(data[kohta:kohta + pituus].decode("utf-8"))
+                kohta += pituus
+            if len(data) != kohta + n * _TIETUE.size:
+                raise KuutioVirhe("Kuutiotiedoston koko ei täsmää otsakkeeseen")
+            kuutiot = cls()
+            for t, koodi, i, tulot, tunnit, lkm in _TIETUE.iter_unpack(data[kohta:]):
+                jaksot = [None] * len(TASOT)
+                jaksot[t] = _pura(TASOT[t], koodi)
+                kuutiot._kirjaa(tuple(jaksot), tilat[i], tulot, tunnit, lkm)
+        except KuutioVirhe:
+            raise
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise KuutioVirhe(f"Kuutiotiedosto on rikki: {e}") from e
+        return kuutiot
+
+
+def yhdista(osat: Iterable[Kuutiot]) -> Kuutiot:
+    """Yhdistää usean kuution (esim. eri varaustiedostoista) uudeksi kuutioksi."""
+    tulos = Kuutiot()
+    for osa in osat:
+        tulos.yhdista(osa)
+    return tulos
+
+
+def main():
+    # lue_varaukset tuodaan tässä, koska varasto (ja sitä kautta lue_varaukset) käyttää tätä moduulia
+    from lue_varaukset import hae_varasto
+
+    tiedostot = sys.argv[1:] or ["varaukset.txt"]
+    kuutiot = yhdista(hae_varasto(t).kuutiot for t in tiedostot)
+    for kuukausi in kuutiot.jaksot("kuukausi"):
+        vuosi, kk = kuukausi
+        print(f"{kk:02d}/{vuosi}: {kuutiot.tulot('kuukausi', kuukausi):.2f} €, "
+              f"{kuutiot.tunnit('kuukausi', kuukausi)} h")
+        for kohde, tulot in kuutiot.karki("kuukausi", kuukausi, n=3):
+            print(f"  - {kohde}: {tulot:.2f} €")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,21 @@
 # Tämä on selkeämpi kuin listat, koska viittaukset ovat nimillä (esim. varaus["nimi"])
 # eikä "mystisillä" indekseillä (varaus[1]). Koodi on luettavampi ja virhealttiutta on vähemmän.
 
-from datetime import datetime, date, time
-from typing import List, Dict
+import sys
+from typing import Iterable, Iterator, List, Dict, Optional, Union
+
+from aikajasennys import jasenna_aikaleima, jasenna_kellonaika, jasenna_paiva
+from muotoilu import OTSIKOT, lkm_rivit, pitka_rivi, status_rivi, tulot_rivi, vahvistettu_rivi
+from putki import jaa, muunna, putki, summaa, suodata
+from raporttimoottori import aja_raportit, oletusraportit
+from rinnakkain import aja as aja_rinnakkain
+from tietue import LaiskaVaraus, muunna_tietueeksi
+from tilannekuva import avaa as avaa_tilannekuva
+from varasto import Varausvarasto
+
+# Raportit hyväksyvät listan tai generaattorin (käydään läpi kerran) tai
+# indeksoidun varaston (käydään läpi vain tulostettavat varaukset).
+Varaukset = Union[Iterable[Dict], Varausvarasto]
 
 
 def muunna_varaustiedot(varaus: List[str]) -> Dict:
@@ -19,13 +32,13 @@ def muunna_varaustiedot(varaus: List[str]) -> Dict:
         "nimi": varaus[1].strip(),
         "sahkoposti": varaus[2].strip(),
         "puhelin": varaus[3].strip(),
-        "paiva": datetime.strptime(varaus[4], "%Y-%m-%d").date(),
-        "kellonaika": datetime.strptime(varaus[5], "%H:%M").time(),
+        "paiva": jasenna_paiva(varaus[4]),
+        "kellonaika": jasenna_kellonaika(varaus[5]),
         "kesto": int(varaus[6]),
         "hinta": float(varaus[7]),
         "vahvistettu": varaus[8].strip().lower() == "true",
         "kohde": varaus[9].strip(),
-        "luotu": datetime.strptime(varaus[10], "%Y-%m-%d %H:%M:%S"),
+        "luotu": jasenna_aikaleima(varaus[10]),
     }
 
 
@@ -38,9 +51,8 @@ def _is_header(parts: List[str]) -> bool:
         return True
 
 
-def hae_varaukset(varaustiedosto: str) -> List[Dict]:
-    #hakee varaukset
-    varaukset: List[Dict] = []
+def _lue_osat(varaustiedosto: str) -> Iterator[List[str]]:
+    """Tuottaa tiedoston varausrivit kenttälistoina (tyhjät ja otsikkorivi ohitetaan)."""
     with open(varaustiedosto, "r", encoding="utf-8") as f:
         for i, line in enumerate(f, start=1):
             line = line.strip()
@@ -50,63 +62,160 @@ def hae_varaukset(varaustiedosto: str) -> List[Dict]:
             # Jos tiedostossa on otsikkorivi, ohitetaan se
             if i == 1 and _is_header(parts):
                 continue
-            varaukset.append(muunna_varaustiedot(parts))
-    return varaukset
+            yield parts
+
+
+def iter_varaukset(varaustiedosto: str, kentat: Iterable[str] = (),
+                   tilannekuva: bool = False) -> Iterator[Union[LaiskaVaraus, Dict]]:
+    # tuottaa varaukset yksi kerrallaan laiskoina näkyminä; muistissa on vain käsiteltävä rivi
+    # Jos tilannekuva=True ja tiedostosta on käännetty ajantasainen tilannekuva
+    # (python tilannekuva.py), rivit luetaan siitä valmiina sanakirjoina
+    # tekstin jäsentämisen sijaan.
+    if tilannekuva:
+        kuva = avaa_tilannekuva(varaustiedosto)
+        if kuva is not None:
+            with kuva:
+                yield from kuva
+            return
+    kentat = tuple(kentat)
+    for parts in _lue_osat(varaustiedosto):
+        yield LaiskaVaraus(parts, kentat)
+
+
+def hae_varaukset(varaustiedosto: str, tilannekuva: bool = False) -> List[Dict]:
+    #hakee varaukset
+    # tilannekuva=True: varaukset luetaan ajantasaisesta tilannekuvasta, jos sellainen on
+    if tilannekuva:
+        kuva = avaa_tilannekuva(varaustiedosto)
+        if kuva is not None:
+            with kuva:
+                return list(kuva)
+    return [muunna_varaustiedot(parts) for parts in _lue_osat(varaustiedosto)]
+
+
+def hae_laiskat(varaustiedosto: str, kentat: Iterable[str] = ()) -> List[LaiskaVaraus]:
+    # hakee varaukset laiskoina näkyminä: vain kentat muunnetaan heti (ja tarkistetaan),
+    # muut vasta kun raportti lukee ne. Esim. hae_laiskat(tiedosto, ["vahvistettu"])
+    # riittää varausten_lkm-raportille eikä jäsennä yhtään päivämäärää.
+    return list(iter_varaukset(varaustiedosto, kentat))
+
+
+def hae_varasto(varaustiedosto: str) -> Varausvarasto:
+    # hakee varaukset indeksoituun varastoon tiiviinä Varaus-tietueina (ks. tietue.py)
+    return Varausvarasto(muunna_tietueeksi(parts) for parts in _lue_osat(varaustiedosto))
 
 
-def vahvistetut_varaukset(varaukset: List[Dict]) -> None:
+def _on_vahvistettu(varaus: Dict) -> bool:
+    return varaus["vahvistettu"]
+
+
+def _on_pitka(varaus: Dict) -> bool:
+    return varaus["kesto"] >= 3
+
+
+def _tulo(varaus: Dict) -> float:
+    return varaus["kesto"] * varaus["hinta"]
+
+
+# Raportit toimivat listalla, varastolla tai generaattorilla (iter_varaukset).
+# Lista ja generaattori käsitellään virtaavana putkena (ks. putki.py).
+def vahvistetut_varaukset(varaukset: Varaukset) -> None:
 
     print("-" * 0, end="")
-    for varaus in varaukset:
-        if varaus["vahvistettu"]:
-            print(
-                f"- {varaus['nimi']}, {varaus['kohde']}, {varaus['paiva'].strftime('%d.%m.%Y')} klo {varaus['kellonaika'].strftime('%H.%M')}")
+    if isinstance(varaukset, Varausvarasto):
+        valitut = varaukset.vahvistetut()
+    else:
+        valitut = putki(varaukset, suodata(_on_vahvistettu))
+    for varaus in valitut:
+        print(vahvistettu_rivi(varaus))
     print()
 
 
-def pitkat_varaukset(varaukset: List[Dict]) -> None:
-    for varaus in varaukset:
-        if varaus["kesto"] >= 3:
-            print(f"- {varaus['nimi']}, {varaus['paiva'].strftime('%d.%m.%Y')} klo {varaus['kellonaika'].strftime('%H.%M')}, kesto {varaus['kesto']} h, {varaus['kohde']}")
+def pitkat_varaukset(varaukset: Varaukset) -> None:
+    if isinstance(varaukset, Varausvarasto):
+        valitut = varaukset.kesto_vahintaan(3)
+    else:
+        valitut = putki(varaukset, suodata(_on_pitka))
+    for varaus in valitut:
+        print(pitka_rivi(varaus))
     print()
 
 
-def varausten_vahvistusstatus(varaukset: List[Dict]) -> None:
-    for varaus in varaukset:
-        if varaus["vahvistettu"]:
-            print(f"{varaus['nimi']} → Vahvistettu")
-        else:
-            print(f"{varaus['nimi']} → EI vahvistettu")
+def varausten_vahvistusstatus(varaukset: Varaukset) -> None:
+    for rivi in putki(varaukset, muunna(status_rivi)):
+        print(rivi)
     print()
 
 
-def varausten_lkm(varaukset: List[Dict]) -> None:
-    vahvistetut = sum(1 for v in varaukset if v["vahvistettu"])
-    ei_vahvistetut = len(varaukset) - vahvistetut
-    print(f"- Vahvistettuja varauksia: {vahvistetut} kpl")
-    print(f"- Ei-vahvistettuja varauksia: {ei_vahvistetut} kpl")
+def varausten_lkm(varaukset: Varaukset) -> None:
+    if isinstance(varaukset, Varausvarasto):
+        vahvistetut = varaukset.vahvistetut_lkm
+        ei_vahvistetut = len(varaukset) - vahvistetut
+    else:
+        vahvistetut, ei_vahvistetut = jaa(varaukset, _on_vahvistettu)
+    for rivi in lkm_rivit(vahvistetut, ei_vahvistetut):
+        print(rivi)
     print()
 
 
-def varausten_kokonaistulot(varaukset: List[Dict]) -> None:
-    tulot = sum(v["kesto"] * v["hinta"] for v in varaukset if v["vahvistettu"])
-    print("Vahvistettujen varausten kokonaistulot:",
-          f"{tulot:.2f}".replace('.', ','), "€")
+def varausten_kokonaistulot(varaukset: Varaukset) -> None:
+    if isinstance(varaukset, Varausvarasto):
+        tulot = varaukset.vahvistetut_tulot
+    else:
+        tulot = summaa(putki(varaukset, suodata(_on_vahvistettu), muunna(_tulo)))
+    print(tulot_rivi(tulot))
     print()
 
 
+def virtaa_raportit(varaustiedosto: str) -> None:
+    # Jokainen raportti saa oman generaattorinsa ja tulostaa rivit sitä mukaa.
+    # Tietoinen vaihtokauppa: tiedosto luetaan ja jäsennetään viidesti (kerran
+    # raporttia kohden), mutta muistissa on kerrallaan vain yksi varaus.
+    # Yhdellä läpikäynnillä raporttien 2 ja 3 rivit pitäisi puskuroida, koska
+    # ne tulostetaan vasta raportin 1 jälkeen (ks. main). Kentät muunnetaan
+    # vasta kun raportti lukee ne, joten raportit 4 ja 5 eivät jäsennä päivämääriä.
+    raportit = (
+        (vahvistetut_varaukset, ()),
+        (pitkat_varaukset, ()),
+        (varausten_vahvistusstatus, ()),
+        (varausten_lkm, ("vahvistettu",)),
+        (varausten_kokonaistulot, ("vahvistettu",)),
+    )
+    for otsikko, (raportti, kentat) in zip(OTSIKOT, raportit):
+        print(otsikko)
+        raportti(iter_varaukset(varaustiedosto, kentat))
+
+
+def _prosesseja(argumentit: List[str]) -> Optional[int]:
+    """--rinnakkain -> 0 (prosesseja ytimien määrä), --rinnakkain=N -> N, muuten None."""
+    for a in argumentit:
+        if a == "--rinnakkain":
+            return 0
+        if a.startswith("--rinnakkain="):
+            return int(a.split("=", 1)[1])
+    return None
+
+
 def main():
-    varaukset = hae_varaukset("varaukset.txt")
-    print("1) Vahvistetut varaukset")
-    vahvistetut_varaukset(varaukset)
-    print("2) Pitkät varaukset (≥ 3 h)")
-    pitkat_varaukset(varaukset)
-    print("3) Varausten vahvistusstatus")
-    varausten_vahvistusstatus(varaukset)
-    print("4) Yhteenveto vahvistuksista")
-    varausten_lkm(varaukset)
-    print("5) Vahvistettujen varausten kokonaistulot")
-    varausten_kokonaistulot(varaukset)
+    argumentit = sys.argv[1:]
+    if "--virta" in argumentit:
+        virtaa_raportit("varaukset.txt")
+        return
+    prosesseja = _prosesseja(argumentit)
+    if prosesseja is not None:
+        # Tiedosto paloina prosessipoolissa, osatulokset yhdistetään (ks. rinnakkain.py)
+        raportit = aja_rinnakkain("varaukset.txt", prosesseja or None)
+    else:
+        # Kaikki viisi raporttia yhdellä läpikäynnillä (ks. raporttimoottori.py).
+        # Moottori tarvitsee vain rivivirran: varaston indeksejä ei rakenneta, ja
+        # laiskat varaukset jäsentävät vain raporttien lukemat kentät. Ajantasainen
+        # tilannekuva (python tilannekuva.py) luetaan tekstin sijaan.
+        raportit = aja_raportit(iter_varaukset("varaukset.txt", tilannekuva=True), oletusraportit())
+    for raportti in raportit:
+        print(raportti.otsikko)
+        for rivi in raportti.rivit():
+            print(rivi)
+        print()
 
 
 if __name__ == "__main__":
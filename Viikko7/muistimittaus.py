@@ -0,0 +1,40 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Mittaa varausten muistinkäytön: sanakirja (muunna_varaustiedot) vs. tiivis
+# Varaus-tietue (muunna_tietueeksi). Tiedoston rivit monistetaan, jotta
+# mittaus ei jää muutaman varauksen varaan.
+# Ajo: python muistimittaus.py [varaustiedosto] [kopioita]
+
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from lue_varaukset import _lue_osat, muunna_varaustiedot
+from tietue import muunna_tietueeksi
+
+
+def muistia_per_varaus(osat: List[List[str]], muunna: Callable) -> float:
+    """Palauttaa muunnettujen varausten muistinkulutuksen tavuina per varaus."""
+    tracemalloc.start()
+    alku = tracemalloc.get_traced_memory()[0]
+    varaukset = [muunna(p) for p in osat]
+    kaytetty = tracemalloc.get_traced_memory()[0] - alku
+    tracemalloc.stop()
+    return kaytetty / max(len(varaukset), 1)
+
+
+def main():
+    tiedosto = sys.argv[1] if len(sys.argv) > 1 else "varaukset.txt"
+    kopioita = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    osat = list(_lue_osat(tiedosto)) * kopioita
+
+    sanakirja = muistia_per_varaus(osat, muunna_varaustiedot)
+    tietue = muistia_per_varaus(osat, muunna_tietueeksi)
+    print(f"Varauksia: {len(osat)}")
+    print(f"- sanakirja: {sanakirja:7.1f} tavua / varaus")
+    print(f"- Varaus:    {tietue:7.1f} tavua / varaus")
+    print(f"- säästö:    {100 * (1 - tietue / sanakirja):7.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Raporttien otsikot ja rivien muotoilu. Erillään tulostuksesta, jotta samoja
+# rivejä voivat käyttää peräkkäinen ajo, raporttimoottori ja rinnakkaiset työprosessit.
+# Päivämäärän ja kellonajan voi antaa valmiiksi muotoiltuna (pvm, klo), jolloin
+# strftime-kutsuja ei tehdä uudelleen.
+
+from typing import Dict, List, Optional
+
+OTSIKOT = (
+    "1) Vahvistetut varaukset",
+    "2) Pitkät varaukset (≥ 3 h)",
+    "3) Varausten vahvistusstatus",
+    "4) Yhteenveto vahvistuksista",
+    "5) Vahvistettujen varausten kokonaistulot",
+)
+
+
+def muotoile_pvm(varaus: Dict) -> str:
+    return varaus["paiva"].strftime("%d.%m.%Y")
+
+
+def muotoile_klo(varaus: Dict) -> str:
+    return varaus["kellonaika"].strftime("%H.%M")
+
+
+def vahvistettu_rivi(varaus: Dict, pvm: Optional[str] = None, klo: Optional[str] = None) -> str:
+    pvm = pvm or muotoile_pvm(varaus)
+    klo = klo or muotoile_klo(varaus)
+    return f"- {varaus['nimi']}, {varaus['kohde']}, {pvm} klo {klo}"
+
+
+def pitka_rivi(varaus: Dict, pvm: Optional[str] = None, klo: Optional[str] = None) -> str:
+    pvm = pvm or muotoile_pvm(varaus)
+    klo = klo or muotoile_klo(varaus)
+    return f"- {varaus['nimi']}, {pvm} klo {klo}, kesto {varaus['kesto']} h, {varaus['kohde']}"
+
+
+def status_rivi(varaus: Dict) -> str:
+    if varaus["vahvistettu"]:
+        return f"{varaus['nimi']} → Vahvistettu"
+    return f"{varaus['nimi']} → EI vahvistettu"
+
+
+def lkm_rivit(vahvistetut: int, ei_vahvistetut: int) -> List[str]:
+    return [f"- Vahvistettuja varauksia: {vahvistetut} kpl",
+            f"- Ei-vahvistettuja varauksia: {ei_vahvistetut} kpl"]
+
+
+def tulot_rivi(tulot: float) -> str:
+    return "Vahvistettujen varausten kokonaistulot: " + f"{tulot:.2f}".replace('.', ',') + " €"
@@ -0,0 +1,44 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Virtaava käsittelyputki: lähde on generaattori (esim. lue_varaukset.iter_varaukset)
+# ja vaiheet ovat funktioita iteraattorista iteraattoriin. Mitään vaihetta ei
+# kerätä listaksi, joten muistinkäyttö ei riipu tiedoston koosta.
+# Esim. putki(iter_varaukset(t), suodata(lambda v: v["vahvistettu"]), muunna(vahvistettu_rivi))
+
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+Vaihe = Callable[[Iterable[Any]], Iterator[Any]]
+
+
+def putki(lahde: Iterable[Any], *vaiheet: Vaihe) -> Iterator[Any]:
+    """Kytkee vaiheet peräkkäin lähteen perään ja palauttaa tuloksen iteraattorina."""
+    virta = iter(lahde)
+    for vaihe in vaiheet:
+        virta = vaihe(virta)
+    return virta
+
+
+def suodata(ehto: Callable[[Any], bool]) -> Vaihe:
+    """Vaihe, joka päästää läpi vain ehdon täyttävät alkiot."""
+    return lambda virta: (x for x in virta if ehto(x))
+
+
+def muunna(f: Callable[[Any], Any]) -> Vaihe:
+    """Vaihe, joka muuntaa jokaisen alkion funktiolla f."""
+    return lambda virta: map(f, virta)
+
+
+def summaa(virta: Iterable[float]) -> float:
+    """Kooste: alkioiden summa sum()-funktiolla (Python 3.12+ summaa liukuluvut kompensoiden)."""
+    return sum(virta)
+
+
+def jaa(virta: Iterable[Any], ehto: Callable[[Any], bool]) -> Tuple[int, int]:
+    """Kooste: (ehdon täyttävien määrä, muiden määrä) yhdellä läpikäynnillä."""
+    kylla = ei = 0
+    for x in virta:
+        if ehto(x):
+            kylla += 1
+        else:
+            ei += 1
+    return kylla, ei
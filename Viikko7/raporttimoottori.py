@@ -0,0 +1,165 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Raporttimoottori: jokainen raportti on "vierailija", joka saa varaukset yksi
+# kerrallaan. Moottori käy datan läpi kerran ja syöttää jokaisen varauksen
+# kaikille raporteille. Päivämäärä ja kellonaika muotoillaan kerran per varaus
+# (Ajat), ja vain jos jokin raportti niitä tarvitsee.
+# Saman raportin osatulokset (esim. tiedoston paloista, ks. rinnakkain.py)
+# voi yhdistää yhdista()-metodilla: listat jatketaan ja määrät lasketaan yhteen.
+# Tulot pidetään rivikohtaisina erinä ja summataan vasta lopuksi sum()-funktiolla,
+# kuten alkuperäisessä (Python 3.12+ summaa kompensoidusti, joten += tai
+# osasummien yhteenlasku antaisi eri tuloksen).
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List
+
+from muotoilu import (OTSIKOT, lkm_rivit, muotoile_klo, muotoile_pvm, pitka_rivi,
+                      status_rivi, tulot_rivi, vahvistettu_rivi)
+
+
+class Ajat:
+    """Varauksen muotoillut päivämäärä (dd.mm.yyyy) ja kellonaika (hh.mm), laskettu laiskasti."""
+
+    __slots__ = ("_varaus", "_pvm", "_klo")
+
+    def __init__(self, varaus: Dict) -> None:
+        self._varaus = varaus
+        self._pvm = None
+        self._klo = None
+
+    @property
+    def pvm(self) -> str:
+        if self._pvm is None:
+            self._pvm = muotoile_pvm(self._varaus)
+        return self._pvm
+
+    @property
+    def klo(self) -> str:
+        if self._klo is None:
+            self._klo = muotoile_klo(self._varaus)
+        return self._klo
+
+
+class Raportti(ABC):
+    """Raportin perusluokka: kasittele() kutsutaan jokaiselle varaukselle, rivit() lopuksi."""
+
+    otsikko = ""
+
+    @abstractmethod
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        """Käsittelee yhden varauksen."""
+
+    @abstractmethod
+    def rivit(self) -> List[str]:
+        """Palauttaa raportin tulostettavat rivit."""
+
+    @abstractmethod
+    def yhdista(self, toinen: "Raportti") -> None:
+        """Lisää saman raportin seuraavan osan (tiedostossa myöhemmän) tuloksen tähän."""
+
+
+class VahvistetutRaportti(Raportti):
+    otsikko = OTSIKOT[0]
+
+    def __init__(self) -> None:
+        self._rivit: List[str] = []
+
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        if varaus["vahvistettu"]:
+            self._rivit.append(vahvistettu_rivi(varaus, ajat.pvm, ajat.klo))
+
+    def rivit(self) -> List[str]:
+        return self._rivit
+
+    def yhdista(self, toinen: Raportti) -> None:
+        self._rivit.extend(toinen._rivit)
+
+
+class PitkatRaportti(Raportti):
+    otsikko = OTSIKOT[1]
+
+    def __init__(self, vahintaan: int = 3) -> None:
+        self.vahintaan = vahintaan
+        self._rivit: List[str] = []
+
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        if varaus["kesto"] >= self.vahintaan:
+            self._rivit.append(pitka_rivi(varaus, ajat.pvm, ajat.klo))
+
+    def rivit(self) -> List[str]:
+        return self._rivit
+
+    def yhdista(self, toinen: Raportti) -> None:
+        self._rivit.extend(toinen._rivit)
+
+
+class StatusRaportti(Raportti):
+    otsikko = OTSIKOT[2]
+
+    def __init__(self) -> None:
+        self._rivit: List[str] = []
+
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        self._rivit.append(status_rivi(varaus))
+
+    def rivit(self) -> List[str]:
+        return self._rivit
+
+    def yhdista(self, toinen: Raportti) -> None:
+        self._rivit.extend(toinen._rivit)
+
+
+class LkmRaportti(Raportti):
+    otsikko = OTSIKOT[3]
+
+    def __init__(self) -> None:
+        self.vahvistetut = 0
+        self.yhteensa = 0
+
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        self.yhteensa += 1
+        if varaus["vahvistettu"]:
+            self.vahvistetut += 1
+
+    def rivit(self) -> List[str]:
+        return lkm_rivit(self.vahvistetut, self.yhteensa - self.vahvistetut)
+
+    def yhdista(self, toinen: Raportti) -> None:
+        self.vahvistetut += toinen.vahvistetut
+        self.yhteensa += toinen.yhteensa
+
+
+class TulotRaportti(Raportti):
+    otsikko = OTSIKOT[4]
+
+    def __init__(self) -> None:
+        self._erat: List[float] = []   # vahvistettujen varausten kesto * hinta
+
+    def kasittele(self, varaus: Dict, ajat: Ajat) -> None:
+        if varaus["vahvistettu"]:
+            self._erat.append(varaus["kesto"] * varaus["hinta"])
+
+    @property
+    def tulot(self) -> float:
+        return sum(self._erat)
+
+    def rivit(self) -> List[str]:
+        return [tulot_rivi(self.tulot)]
+
+    def yhdista(self, toinen: Raportti) -> None:
+        self._erat.extend(toinen._erat)
+
+
+def oletusraportit() -> List[Raportti]:
+    """Viikko7:n viisi raporttia tulostusjärjestyksessä."""
+    return [VahvistetutRaportti(), PitkatRaportti(), StatusRaportti(), LkmRaportti(), TulotRaportti()]
+
+
+def aja_raportit(varaukset: Iterable[Dict], raportit: List[Raportti]) -> List[Raportti]:
+    """Käy varaukset läpi kerran ja syöttää jokaisen kaikille raporteille."""
+    kasittelijat = [r.kasittele for r in raportit]
+    for varaus in varaukset:
+        ajat = Ajat(varaus)
+        for kasittele in kasittelijat:
+            kasittele(varaus, ajat)
+    return raportit
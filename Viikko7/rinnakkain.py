@@ -0,0 +1,48 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Rinnakkainen ajotapa lue_varaukset.main-raporteille (python lue_varaukset.py --rinnakkain[=N]).
+# varaukset.txt jaetaan rivirajoilla paloihin (skanneri.jaa_palat). Jokainen pala
+# ajetaan raporttimoottorilla omassa prosessissaan, joka palauttaa raporttien
+# osatulokset: vain tulostettavat rivit, määrät sekä vahvistettujen varausten
+# tulot yhtenä liukulukuna riviä kohden (ei osasummia, ks. raporttimoottori).
+# Palat palautuvat tiedoston järjestyksessä, joten pääprosessi yhdistää ne
+# Raportti.yhdista-metodilla ilman järjestämistä, ja tuloste on sama kuin
+# peräkkäisessä ajossa.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from raporttimoottori import Raportti, aja_raportit, oletusraportit
+from skanneri import jaa_palat, skannaa
+from tietue import LaiskaVaraus
+
+# Paloja prosessia kohden: tasaa kuormaa, jos palat ovat eri hitaita
+PALOJA_PROSESSILLE = 4
+
+
+def kasittele_pala(tehtava: Tuple[str, int, int]) -> List[Raportti]:
+    """Työprosessi: ajaa oletusraportit tavuvälin [alku, loppu) riveille."""
+    polku, alku, loppu = tehtava
+    varaukset = (LaiskaVaraus(kentat) for _, kentat in skannaa(polku, None, alku, loppu))
+    return aja_raportit(varaukset, oletusraportit())
+
+
+def aja(varaustiedosto: str, prosesseja: Optional[int] = None) -> List[Raportti]:
+    """Ajaa oletusraportit tiedostolle prosessipoolissa ja palauttaa yhdistetyt raportit."""
+    prosesseja = prosesseja or os.cpu_count() or 1
+    tehtavat = [(varaustiedosto, a, b)
+                for a, b in jaa_palat(varaustiedosto, prosesseja * PALOJA_PROSESSILLE)]
+    if prosesseja == 1:
+        return _yhdista(map(kasittele_pala, tehtavat))
+    with ProcessPoolExecutor(max_workers=prosesseja) as pooli:
+        # map palauttaa osat tehtävien (eli tiedoston) järjestyksessä
+        return _yhdista(pooli.map(kasittele_pala, tehtavat))
+
+
+def _yhdista(osat: Iterable[List[Raportti]]) -> List[Raportti]:
+    raportit = oletusraportit()
+    for osa in osat:
+        for raportti, osaraportti in zip(raportit, osa):
+            raportti.yhdista(osaraportti)
+    return raportit
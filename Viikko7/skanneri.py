@@ -0,0 +1,94 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Muistikartoitettu (mmap) lukija pystyviivaeroteltulle varaukset.txt:lle.
+# Tiedostoa käsitellään tavuina: rivin ja kenttien rajat haetaan find-kutsuilla
+# ja vain pyydetyt kentät dekoodataan merkkijonoiksi. Käyttöjärjestelmä tuo
+# sivut muistiin tarpeen mukaan, joten prosessin muistinkäyttö ei kasva
+# tiedoston koon mukana. Lukemisen voi aloittaa mistä tahansa tavukohdasta,
+# joten tiedoston voi jakaa paloihin rinnakkaista käsittelyä varten.
+
+import mmap
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from tietue import KENTAT
+
+_TYHJA = b" \t\r\n"
+
+
+def _kenttanumerot(kentat: Optional[Iterable[str]]) -> List[int]:
+    """Kenttien nimet -> sarakenumerot (None = kaikki kentät)."""
+    if kentat is None:
+        return list(range(len(KENTAT)))
+    return [KENTAT.index(k) for k in kentat]
+
+
+def _on_otsikko(ensimmainen: bytes) -> bool:
+    """Kuten lue_varaukset._is_header: ensimmäinen kenttä ei ole kokonaisluku."""
+    try:
+        int(ensimmainen)
+        return False
+    except ValueError:
+        return True
+
+
+def skannaa(polku: str, kentat: Optional[Iterable[str]] = None,
+            alku: int = 0, loppu: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Käy läpi rivit, jotka alkavat tavuväliltä [alku, loppu).
+    Jos alku osuu keskelle riviä, rivi kuuluu edelliselle palalle ja ohitetaan.
+    Tuottaa (rivin alkukohta tavuina, [pyydetyt kentät merkkijonoina]).
+    Tyhjät rivit ja tiedoston alun otsikkorivi ohitetaan kuten hae_varaukset tekee.
+    """
+    numerot = _kenttanumerot(kentat)
+    viimeinen = max(numerot, default=0)
+    if os.path.getsize(polku) == 0:
+        return
+    with open(polku, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        koko = len(mm)
+        loppu = koko if loppu is None else min(loppu, koko)
+        kohta = alku
+        if kohta > 0 and mm[kohta - 1:kohta] != b"\n":
+            rivinvaihto = mm.find(b"\n", kohta)
+            kohta = koko if rivinvaihto == -1 else rivinvaihto + 1
+
+        while kohta < loppu:
+            rivin_alku = kohta
+            rivinvaihto = mm.find(b"\n", kohta)
+            rivin_loppu = koko if rivinvaihto == -1 else rivinvaihto
+            kohta = rivin_loppu + 1
+
+            # Rivin alun ja lopun tyhjät pois (vastaa line.strip())
+            a, b = rivin_alku, rivin_loppu
+            while a < b and mm[a] in _TYHJA:
+                a += 1
+            while b > a and mm[b - 1] in _TYHJA:
+                b -= 1
+            if a == b:
+                continue
+
+            # Kenttien rajat vain viimeiseen pyydettyyn kenttään asti
+            rajat = [a]
+            while len(rajat) <= viimeinen + 1:
+                p = mm.find(b"|", rajat[-1], b)
+                if p == -1:
+                    rajat.append(b + 1)
+                    break
+                rajat.append(p + 1)
+            if rivin_alku == 0 and _on_otsikko(mm[rajat[0]:rajat[1] - 1]):
+                continue
+            if len(rajat) <= viimeinen + 1:
+                raise ValueError(f"Liian vähän kenttiä rivillä tavukohdassa {rivin_alku}")
+            yield rivin_alku, [mm[rajat[i]:rajat[i + 1] - 1].decode("utf-8") for i in numerot]
+
+
+def jaa_palat(polku: str, n: int) -> List[Tuple[int, int]]:
+    """Jakaa tiedoston n suunnilleen yhtä suureen tavuväliin.
+
+    Välit voi antaa skannaa-funktiolle sellaisenaan: rivit, jotka ylittävät
+    rajan, käsittelee aina se pala, jossa rivi alkaa.
+    """
+    koko = os.path.getsize(polku)
+    n = max(1, min(n, koko or 1))
+    rajat = [koko * i // n for i in range(n + 1)]
+    return list(zip(rajat[:-1], rajat[1:]))
@@ -0,0 +1,38 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Viikko7:n testit: moduulit ovat skriptihakemistossa, joten se lisätään polulle.
+# varaustiedosto-fixture kirjoittaa satunnaisen varaukset.txt-muotoisen tiedoston.
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TILAT = ("Metsätila 1", "Kukkahuone", "Punainen Huone", "Kokoustila A", "Sauna")
+
+
+def varausrivit(n: int, siemen: int = 7):
+    """n satunnaista varausriviä (id|nimi|...|luotu), hinnat senttiä."""
+    satunnainen = random.Random(siemen)
+    alku = datetime(2025, 1, 1, 8, 0)
+    for i in range(n):
+        hetki = alku + timedelta(days=satunnainen.randrange(365), minutes=15 * satunnainen.randrange(40))
+        luotu = hetki - timedelta(seconds=satunnainen.randrange(1, 90 * 86400))
+        yield "|".join((
+            str(1000 + i), f"Asiakas {i}", f"asiakas{i}@example.org", f"040{i:07d}",
+            f"{hetki:%Y-%m-%d}", f"{hetki:%H:%M}", str(satunnainen.randint(1, 6)),
+            f"{satunnainen.randint(500, 9999) / 100:.2f}",
+            satunnainen.choice(("True", "False")), satunnainen.choice(TILAT),
+            f"{luotu:%Y-%m-%d %H:%M:%S}",
+        ))
+
+
+@pytest.fixture
+def varaustiedosto(tmp_path):
+    polku = tmp_path / "varaukset.txt"
+    polku.write_text("\n".join(varausrivit(3000)) + "\n", encoding="utf-8")
+    return str(polku)
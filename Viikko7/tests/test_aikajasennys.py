@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+from datetime import datetime
+
+import pytest
+
+from aikajasennys import jasenna_aikaleima, jasenna_kellonaika, jasenna_paiva
+
+
+def _strptime(s, muoto):
+    try:
+        return datetime.strptime(s, muoto)
+    except ValueError:
+        return ValueError
+
+
+def _jasennetty(funktio, s):
+    try:
+        return funktio(s)
+    except ValueError:
+        return ValueError
+
+
+@pytest.mark.parametrize("s", [
+    "2025-10-31", "2024-02-29", "2025-02-29", "2025-13-01", "2025-1-05",
+    "2025-01-5", "20251031", "2025/10/31", "２０２５-10-31", " 2025-10-31", "",
+])
+def test_paiva_kuten_strptime(s):
+    odotettu = _strptime(s, "%Y-%m-%d")
+    assert _jasennetty(jasenna_paiva, s) == (odotettu if odotettu is ValueError else odotettu.date())
+
+
+@pytest.mark.parametrize("s", [
+    "00:00", "09:05", "23:59", "24:00", "12:60", "9:05", "09:5", "+9:05",
+    " 9:05", "09:-5", "０９:05", "0905", "",
+])
+def test_kellonaika_kuten_strptime(s):
+    odotettu = _strptime(s, "%H:%M")
+    assert _jasennetty(jasenna_kellonaika, s) == (odotettu if odotettu is ValueError else odotettu.time())
+
+
+@pytest.mark.parametrize("s", [
+    "2025-10-31 23:59:59", "2024-02-29 00:00:00", "2025-02-29 10:00:00",
+    "2025-10-31 24:00:00", "2025-10-31 9:05:00", "2025-10-31 +9:05:00",
+    "+025-10-31 10:00:00", "2025-+1-31 10:00:00", "2025-10-31 10:0 :00",
+    "2025-10-31T10:00:00", "2025-10-31 10:00", "２０２５-10-31 10:00:00",
+])
+def test_aikaleima_kuten_strptime(s):
+    assert _jasennetty(jasenna_aikaleima, s) == _strptime(s, "%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import pytest
+
+from kuutiot import TASOT, KuutioVirhe, Kuutiot, yhdista
+from lue_varaukset import hae_varaukset
+
+
+def _jakso(taso, paiva):
+    if taso == "paiva":
+        return paiva
+    if taso == "viikko":
+        return tuple(paiva.isocalendar()[:2])
+    return paiva.year, paiva.month
+
+
+def _suoraan(varaukset):
+    """Brute force: taso -> jakso -> tila -> [tulot, tunnit, varauksia] (+= tiedoston järjestyksessä)."""
+    tulos = {t: {} for t in TASOT}
+    for v in varaukset:
+        if not v["vahvistettu"]:
+            continue
+        for taso in TASOT:
+            for kohde in (v["kohde"], None):
+                solu = tulos[taso].setdefault(_jakso(taso, v["paiva"]), {}).setdefault(kohde, [0.0, 0, 0])
+                solu[0] += v["kesto"] * v["hinta"]
+                solu[1] += v["kesto"]
+                solu[2] += 1
+    return tulos
+
+
+def _vertaa(kuutiot, odotettu, tilat_tarkasti=True, summat_tarkasti=True):
+    for taso in TASOT:
+        assert kuutiot.jaksot(taso) == sorted(odotettu[taso])
+        for jakso, tilat in odotettu[taso].items():
+            assert sorted(kuutiot.tilat(taso, jakso)) == sorted(k for k in tilat if k is not None)
+            for kohde, (tulot, tunnit, lkm) in tilat.items():
+                tarkasti = summat_tarkasti if kohde is None else tilat_tarkasti
+                assert kuutiot.tulot(taso, jakso, kohde) == (tulot if tarkasti else pytest.approx(tulot))
+                assert kuutiot.tunnit(taso, jakso, kohde) == tunnit
+                assert kuutiot.arvo(taso, jakso, "varauksia", kohde) == lkm
+
+
+def test_kuten_suora_laskenta(varaustiedosto):
+    varaukset = hae_varaukset(varaustiedosto)
+    _vertaa(Kuutiot(varaukset), _suoraan(varaukset))
+    assert Kuutiot(varaukset).tulot("paiva", varaukset[0]["paiva"].replace(year=1999)) == 0.0
+
+
+def test_karki_paivittyy(varaustiedosto):
+    varaukset = [v for v in hae_varaukset(varaustiedosto) if v["vahvistettu"]]
+    kuutiot = Kuutiot(varaukset[:-1])
+    kk = _jakso("kuukausi", varaukset[-1]["paiva"])
+    ennen = kuutiot.karki("kuukausi", kk, "tunnit")
+    assert ennen == sorted(ennen, key=lambda p: (-p[1], p[0]))
+    kuutiot.lisaa(varaukset[-1])
+    jalkeen = dict(kuutiot.karki("kuukausi", kk, "tunnit"))
+    kohde = varaukset[-1]["kohde"]
+    assert jalkeen[kohde] == dict(ennen).get(kohde, 0) + varaukset[-1]["kesto"]
+    assert kuutiot.karki("kuukausi", kk, n=2) == kuutiot.karki("kuukausi", kk)[:2]
+
+
+def test_tallennus_ja_yhdistaminen(varaustiedosto, tmp_path):
+    varaukset = hae_varaukset(varaustiedosto)
+    kokonaan = Kuutiot(varaukset)
+    polku = str(tmp_path / "kuutiot.bin")
+    kokonaan.tallenna(polku)
+    # Tiedostossa on vain tilakohtaiset solut; jakson summa kootaan niistä
+    _vertaa(Kuutiot.lataa(polku), _suoraan(varaukset), summat_tarkasti=False)
+
+    osat = [Kuutiot(varaukset[i:i + 1000]) for i in range(0, len(varaukset), 1000)]
+    _vertaa(yhdista(osat), _suoraan(varaukset), tilat_tarkasti=False, summat_tarkasti=False)
+
+    with open(polku, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 5)
+    with pytest.raises(KuutioVirhe):
+        Kuutiot.lataa(polku)
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import os
+import pickle
+import shutil
+import sys
+
+import pytest
+
+import lue_varaukset
+from lue_varaukset import _prosesseja
+from rinnakkain import kasittele_pala
+
+
+@pytest.mark.parametrize("argumentit, odotettu", [
+    ([], None),
+    (["--virta"], None),
+    (["--rinnakkain"], 0),
+    (["--rinnakkain=3"], 3),
+    (["--muu", "--rinnakkain=1"], 1),
+])
+def test_prosesseja(argumentit, odotettu):
+    assert _prosesseja(argumentit) == odotettu
+
+
+def _aja_main(monkeypatch, capsys, *argumentit):
+    monkeypatch.setattr(sys, "argv", ["lue_varaukset.py", *argumentit])
+    lue_varaukset.main()
+    return capsys.readouterr().out
+
+
+def test_ajotavat_tulostavat_saman(varaustiedosto, tmp_path, monkeypatch, capsys):
+    hakemisto = tmp_path / "ajo"
+    hakemisto.mkdir()
+    shutil.copy(varaustiedosto, hakemisto / "varaukset.txt")
+    monkeypatch.chdir(hakemisto)
+
+    oletus = _aja_main(monkeypatch, capsys)
+    assert oletus.count("€") == 1
+    assert _aja_main(monkeypatch, capsys, "--rinnakkain=2") == oletus
+    assert _aja_main(monkeypatch, capsys, "--rinnakkain=1") == oletus
+    assert _aja_main(monkeypatch, capsys, "--virta") == oletus
+    assert os.listdir(hakemisto) == ["varaukset.txt"]
+
+
+def test_osatulos_ei_sisalla_varauksia(varaustiedosto):
+    osa = kasittele_pala((varaustiedosto, 0, os.path.getsize(varaustiedosto)))
+    # Prosessista palautetaan vain rivit, määrät ja tuloerät
+    assert b"LaiskaVaraus" not in pickle.dumps(osa)
+    assert all(isinstance(x, float) for x in osa[-1]._erat)
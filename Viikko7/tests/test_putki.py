@@ -0,0 +1,44 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import pytest
+
+from lue_varaukset import (
+    hae_varasto, hae_varaukset, iter_varaukset, pitkat_varaukset, vahvistetut_varaukset,
+    varausten_kokonaistulot, varausten_lkm, varausten_vahvistusstatus,
+)
+from putki import jaa, muunna, putki, summaa, suodata
+
+RAPORTIT = (vahvistetut_varaukset, pitkat_varaukset, varausten_vahvistusstatus,
+            varausten_lkm, varausten_kokonaistulot)
+
+
+def test_vaiheet_ovat_laiskoja():
+    nahdyt = []
+
+    def lahde():
+        for i in range(10):
+            nahdyt.append(i)
+            yield i
+
+    virta = putki(lahde(), suodata(lambda x: x % 2), muunna(lambda x: x * 10))
+    assert nahdyt == []
+    assert next(virta) == 10
+    assert nahdyt == [0, 1]
+    assert list(virta) == [30, 50, 70, 90]
+
+
+def test_koosteet():
+    luvut = [0.1] * 10 + [1e16, 1.0, -1e16]
+    assert summaa(iter(luvut)) == sum(luvut)
+    assert jaa(iter(range(7)), lambda x: x < 3) == (3, 4)
+
+
+@pytest.mark.parametrize("raportti", RAPORTIT)
+def test_raportit_samat_listalla_virralla_ja_varastolla(varaustiedosto, capsys, raportti):
+    raportti(hae_varaukset(varaustiedosto))
+    listalla = capsys.readouterr().out
+    raportti(iter_varaukset(varaustiedosto))
+    assert capsys.readouterr().out == listalla
+    raportti(hae_varasto(varaustiedosto))
+    assert capsys.readouterr().out == listalla
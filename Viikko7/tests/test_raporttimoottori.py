@@ -0,0 +1,35 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+from lue_varaukset import hae_varaukset
+from raporttimoottori import TulotRaportti, aja_raportit, oletusraportit
+from rinnakkain import aja as aja_rinnakkain
+
+
+def _odotetut_tulot(varaukset):
+    """Alkuperäinen laskutapa: sum() vahvistettujen varausten tuloista."""
+    return sum(v["kesto"] * v["hinta"] for v in varaukset if v["vahvistettu"])
+
+
+def test_tulot_kuten_sum(varaustiedosto):
+    varaukset = hae_varaukset(varaustiedosto)
+    (raportti,) = aja_raportit(varaukset, [TulotRaportti()])
+    assert raportti.tulot == _odotetut_tulot(varaukset)
+
+
+def test_osien_yhdistaminen_kuten_perakkain(varaustiedosto):
+    varaukset = hae_varaukset(varaustiedosto)
+    perakkain = aja_raportit(varaukset, oletusraportit())
+    yhdistetyt = oletusraportit()
+    for alku in range(0, len(varaukset), 700):
+        osa = aja_raportit(varaukset[alku:alku + 700], oletusraportit())
+        for raportti, osaraportti in zip(yhdistetyt, osa):
+            raportti.yhdista(osaraportti)
+    assert [r.rivit() for r in yhdistetyt] == [r.rivit() for r in perakkain]
+    assert yhdistetyt[-1].tulot == _odotetut_tulot(varaukset)
+
+
+def test_rinnakkain_kuten_perakkain(varaustiedosto):
+    perakkain = [r.rivit() for r in aja_raportit(hae_varaukset(varaustiedosto), oletusraportit())]
+    for prosesseja in (1, 3):
+        assert [r.rivit() for r in aja_rinnakkain(varaustiedosto, prosesseja)] == perakkain
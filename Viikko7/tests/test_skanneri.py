@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import pytest
+
+from lue_varaukset import _lue_osat
+from skanneri import jaa_palat, skannaa
+from tietue import KENTAT
+
+
+def _kentat(polku, kentat=None):
+    return [osat for _, osat in skannaa(polku, kentat)]
+
+
+def test_kuten_rivilukija(varaustiedosto):
+    assert _kentat(varaustiedosto) == list(_lue_osat(varaustiedosto))
+    valitut = ["kohde", "id", "vahvistettu"]
+    odotettu = [[osat[KENTAT.index(k)] for k in valitut] for osat in _lue_osat(varaustiedosto)]
+    assert _kentat(varaustiedosto, valitut) == odotettu
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 64])
+def test_palat_kattavat_rivit_kerran(varaustiedosto, n):
+    koko = []
+    for alku, loppu in jaa_palat(varaustiedosto, n):
+        koko.extend(skannaa(varaustiedosto, ["id"], alku, loppu))
+    assert koko == list(skannaa(varaustiedosto, ["id"]))
+
+
+def test_otsikko_tyhjat_rivit_ja_rivinvaihdot(tmp_path, varaustiedosto):
+    with open(varaustiedosto, encoding="utf-8") as f:
+        rivit = f.read().splitlines()[:5]
+    polku = tmp_path / "erikoinen.txt"
+    polku.write_bytes(("id|nimi\r\n\n" + "\r\n  \n".join(rivit)).encode("utf-8"))
+    assert _kentat(str(polku)) == list(_lue_osat(str(polku)))
+    # Pieni tiedosto jaetaan enintään tavujen määrään palaan
+    assert len(jaa_palat(str(polku), 10 ** 6)) == polku.stat().st_size
+
+
+def test_tyhja_ja_lyhyt_rivi(tmp_path):
+    tyhja = tmp_path / "tyhja.txt"
+    tyhja.write_bytes(b"")
+    assert _kentat(str(tyhja)) == []
+    assert jaa_palat(str(tyhja), 4) == [(0, 0)]
+
+    lyhyt = tmp_path / "lyhyt.txt"
+    lyhyt.write_bytes(b"1|Nimi|a@b|040\n")
+    assert _kentat(str(lyhyt), ["id", "nimi"]) == [["1", "Nimi"]]
+    with pytest.raises(ValueError):
+        _kentat(str(lyhyt), ["kohde"])
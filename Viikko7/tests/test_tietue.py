@@ -0,0 +1,69 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import pytest
+
+from lue_varaukset import hae_laiskat, hae_varasto, hae_varaukset, muunna_varaustiedot, varausten_lkm
+from tietue import KENTAT, LaiskaVaraus, muunna_tietueeksi
+
+
+def _osat(polku):
+    with open(polku, encoding="utf-8") as f:
+        return [rivi.rstrip("\n").split("|") for rivi in f]
+
+
+def test_tietue_kuten_sanakirja(varaustiedosto):
+    for osat in _osat(varaustiedosto):
+        sanakirja = muunna_varaustiedot(osat)
+        tietue = muunna_tietueeksi(osat)
+        assert tietue.sanakirjaksi() == sanakirja
+        assert tietue == sanakirja
+        assert tietue == muunna_tietueeksi(osat)
+        assert all(tietue[k] == sanakirja[k] for k in KENTAT)
+        assert list(tietue.keys()) == list(sanakirja)
+        assert tietue.get("puuttuu", 1) == 1
+        with pytest.raises(KeyError):
+            tietue["puuttuu"]
+
+
+def test_tietue_kelpaa_joukkoon(varaustiedosto):
+    osat = _osat(varaustiedosto)[0]
+    a, b = muunna_tietueeksi(osat), muunna_tietueeksi(list(osat))
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+    osat[7] = "1.00"
+    assert len({a, muunna_tietueeksi(osat)}) == 2
+
+
+def test_kohde_internoidaan(varaustiedosto):
+    kohteet = {}
+    for varaus in hae_varasto(varaustiedosto):
+        assert kohteet.setdefault(varaus.kohde, varaus.kohde) is varaus.kohde
+
+
+def test_laiska_kuten_sanakirja(varaustiedosto):
+    laiskat = hae_laiskat(varaustiedosto)
+    assert [v.sanakirjaksi() for v in laiskat] == hae_varaukset(varaustiedosto)
+    varaus = laiskat[0]
+    assert varaus["paiva"] is varaus["paiva"]
+    assert varaus.get("puuttuu") is None
+
+
+def test_laiska_muuntaa_vain_luetut_kentat(varaustiedosto, capsys):
+    osat = _osat(varaustiedosto)[0]
+    osat[4] = "2025-02-30"
+    varaus = LaiskaVaraus(osat, ["vahvistettu"])
+    assert varaus["kesto"] == int(osat[6])
+    with pytest.raises(ValueError):
+        varaus["paiva"]
+
+    # Pyydetty kenttä muunnetaan heti, jolloin virheellinen rivi huomataan luettaessa
+    with pytest.raises(ValueError):
+        LaiskaVaraus(osat, ["paiva"])
+
+    with open(varaustiedosto, "a", encoding="utf-8") as f:
+        f.write("|".join(osat) + "\n")
+    laiskat = hae_laiskat(varaustiedosto, ["vahvistettu"])
+    varausten_lkm(laiskat)
+    vahvistetut = sum(1 for v in laiskat if v["vahvistettu"])
+    assert f"- Vahvistettuja varauksia: {vahvistetut} kpl" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import random
+from datetime import date, datetime, time, timedelta
+
+from tilaindeksi import Tilaindeksi, varauksen_vali
+
+TILAT = ("A", "B")
+
+
+def _varaukset(n=600, siemen=11):
+    satunnainen = random.Random(siemen)
+    varaukset = []
+    for _ in range(n):
+        kesto = satunnainen.choice((0, 1, 1, 2, 3, 8, 30, 75))   # myös usean päivän varauksia
+        varaukset.append({
+            "kohde": satunnainen.choice(TILAT),
+            "paiva": date(2025, 3, 1) + timedelta(days=satunnainen.randrange(40)),
+            "kellonaika": time(satunnainen.randrange(24), satunnainen.choice((0, 15, 30, 45))),
+            "kesto": kesto,
+        })
+    return varaukset
+
+
+def _hetki(minuutit):
+    return datetime.fromordinal(minuutit // 1440) + timedelta(minutes=minuutit % 1440)
+
+
+def _osuvat(varaukset, kohde, a, b):
+    """Suora läpikäynti: välit, jotka leikkaavat [a, b), alun mukaan järjestettynä."""
+    valit = [(*varauksen_vali(v), i) for i, v in enumerate(varaukset) if v["kohde"] == kohde]
+    return [varaukset[i] for alku, loppu, i in sorted(valit) if alku < b and loppu > a]
+
+
+def test_kyselyt_kuten_suora_lapikaynti():
+    varaukset = _varaukset()
+    indeksi = Tilaindeksi(varaukset)
+    satunnainen = random.Random(12)
+    alku = datetime(2025, 2, 25).toordinal() * 1440
+    for _ in range(2000):
+        a = alku + satunnainen.randrange(50 * 1440)
+        b = a + satunnainen.choice((1, 30, 60, 600, 1440, 3 * 1440, 20 * 1440))
+        kohde = satunnainen.choice(TILAT)
+        odotetut = _osuvat(varaukset, kohde, a, b)
+        assert indeksi.varaukset_valilla(kohde, _hetki(a), _hetki(b)) == odotetut
+        assert indeksi.on_vapaa(kohde, _hetki(a), _hetki(b)) == (not odotetut)
+
+
+def test_kayttoaste_vapaat_ajat_ja_paallekkaiset():
+    varaukset = _varaukset(200)
+    indeksi = Tilaindeksi(varaukset)
+    a, b = datetime(2025, 3, 5), datetime(2025, 3, 12)
+    vapaat = indeksi.vapaat_ajat("A", a, b)
+    vapaata = sum((y - x).total_seconds() / 60 for x, y in vapaat)
+    assert abs(indeksi.kayttoaste("A", a, b) - (1 - vapaata / ((b - a).total_seconds() / 60))) < 1e-12
+    for x, y in vapaat:
+        assert indeksi.on_vapaa("A", x, y)
+
+    parit = indeksi.paallekkaiset("A")
+    odotetut = []
+    valit = sorted((*varauksen_vali(v), i) for i, v in enumerate(varaukset) if v["kohde"] == "A")
+    for k, (a1, b1, i) in enumerate(valit):
+        for a2, b2, j in valit[:k]:
+            if b2 > a1:
+                odotetut.append((varaukset[j], varaukset[i]))
+    assert sorted(map(repr, parit)) == sorted(map(repr, odotetut))
+
+
+def test_lisaysjarjestys_ei_vaikuta():
+    varaukset = _varaukset(300)
+    sekoitettu = varaukset[:]
+    random.Random(5).shuffle(sekoitettu)
+    a, b = datetime(2025, 3, 10, 6), datetime(2025, 3, 14, 18)
+    assert (Tilaindeksi(sekoitettu).vapaat_ajat("B", a, b) == Tilaindeksi(varaukset).vapaat_ajat("B", a, b))
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+import os
+
+import pytest
+
+import tilannekuva
+from lue_varaukset import hae_varaukset, iter_varaukset
+from tilannekuva import Tilannekuva, TilannekuvaVirhe, avaa, kaanna
+
+
+def test_tilannekuva_kuten_tekstitiedosto(varaustiedosto, monkeypatch):
+    monkeypatch.setattr(tilannekuva, "ERA", 700)   # useampi erä läpikäynnissä
+    odotettu = hae_varaukset(varaustiedosto)
+    polku = kaanna(varaustiedosto)
+    with Tilannekuva(polku, varaustiedosto) as kuva:
+        kuva.tarkista()
+        assert len(kuva) == len(odotettu)
+        assert list(kuva) == odotettu
+        assert [kuva[i] for i in (0, 1234, -1)] == [odotettu[i] for i in (0, 1234, -1)]
+        assert kuva[10:20] == odotettu[10:20]
+        with pytest.raises(IndexError):
+            kuva[len(odotettu)]
+    assert hae_varaukset(varaustiedosto, tilannekuva=True) == odotettu
+    assert list(iter_varaukset(varaustiedosto, tilannekuva=True)) == odotettu
+
+
+def test_sulkeminen(varaustiedosto):
+    kuva = Tilannekuva(kaanna(varaustiedosto))
+    kuva.close()
+    kuva.close()
+    with pytest.raises(ValueError):
+        kuva[0]
+
+
+def test_vanhentunut_tai_rikki_ohitetaan(varaustiedosto):
+    polku = kaanna(varaustiedosto)
+    avattu = avaa(varaustiedosto)
+    assert avattu is not None
+    avattu.close()
+
+    # Lähde muuttunut kääntämisen jälkeen
+    with open(varaustiedosto, "a", encoding="utf-8") as f:
+        f.write("\n")
+    st = os.stat(varaustiedosto)
+    os.utime(polku, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert avaa(varaustiedosto) is None
+    with pytest.raises(TilannekuvaVirhe):
+        Tilannekuva(polku, varaustiedosto)
+
+    kaanna(varaustiedosto)
+    with open(polku, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        vika = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([vika[0] ^ 0xFF]))
+    with Tilannekuva(polku) as kuva, pytest.raises(TilannekuvaVirhe):
+        kuva.tarkista()
+
+    with open(polku, "r+b") as f:
+        f.truncate(os.path.getsize(polku) - 3)
+    assert avaa(varaustiedosto) is None
+    with open(polku, "r+b") as f:
+        f.write(b"XXXXXXXX")
+    with pytest.raises(TilannekuvaVirhe):
+        Tilannekuva(polku)
@@ -0,0 +1,28 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+
+from lue_varaukset import hae_varaukset
+from varasto import Varausvarasto
+
+
+def _odotetut_tulot(varaukset):
+    """Alkuperäinen laskutapa: sum() vahvistettujen varausten tuloista."""
+    return sum(v["kesto"] * v["hinta"] for v in varaukset if v["vahvistettu"])
+
+
+def test_tulot_kuten_sum(varaustiedosto):
+    varaukset = hae_varaukset(varaustiedosto)
+    varasto = Varausvarasto(varaukset[:-100])
+    assert varasto.vahvistetut_tulot == _odotetut_tulot(varaukset[:-100])
+    for varaus in varaukset[-100:]:
+        varasto.lisaa(varaus)
+    assert varasto.vahvistetut_tulot == _odotetut_tulot(varaukset)
+    assert varasto.vahvistetut_lkm == sum(1 for v in varaukset if v["vahvistettu"])
+
+
+def test_indeksit_sailyttavat_jarjestyksen(varaustiedosto):
+    varaukset = hae_varaukset(varaustiedosto)
+    varasto = Varausvarasto(varaukset)
+    assert list(varasto.vahvistetut()) == [v for v in varaukset if v["vahvistettu"]]
+    assert list(varasto.kesto_vahintaan(3)) == [v for v in varaukset if v["kesto"] >= 3]
+    assert list(varasto.kohteessa("Sauna")) == [v for v in varaukset if v["kohde"] == "Sauna"]
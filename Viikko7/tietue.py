@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Tiivis varaustietue: __slots__-luokka sanakirjan sijaan.
+# Päivämäärä tallennetaan ordinaalina (int), kellonaika minuutteina (int) ja
+# luontiaika sekunteina (int); date/time/datetime-oliot luodaan vasta luettaessa.
+# Tilan nimi (kohde) internoidaan, joten samannimiset tilat jakavat saman merkkijonon.
+# Tietuetta voi lukea kuten sanakirjaa (varaus["nimi"]), joten raportit toimivat sellaisenaan.
+# LaiskaVaraus puolestaan säilyttää rivin raakakentät ja muuntaa kentän vasta,
+# kun sitä luetaan ensimmäisen kerran (tulos muistetaan).
+
+from datetime import datetime, date, time, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from aikajasennys import jasenna_aikaleima, jasenna_kellonaika, jasenna_paiva
+
+KENTAT = ("id", "nimi", "sahkoposti", "puhelin", "paiva", "kellonaika",
+          "kesto", "hinta", "vahvistettu", "kohde", "luotu")
+
+_KOHTEET: Dict[str, str] = {}
+_INDEKSI = {k: i for i, k in enumerate(KENTAT)}
+
+
+def _internoi_kohde(kohde: str) -> str:
+    """Palauttaa jaetun merkkijono-olion samalle tilan nimelle."""
+    return _KOHTEET.setdefault(kohde, kohde)
+
+
+class Varaus:
+    """Yksi varaus tiiviissä muodossa. Kentät kuten muunna_varaustiedot-sanakirjassa."""
+
+    __slots__ = ("id", "nimi", "sahkoposti", "puhelin", "_paiva", "_klo",
+                 "kesto", "hinta", "vahvistettu", "kohde", "_luotu")
+
+    def __init__(self, id: int, nimi: str, sahkoposti: str, puhelin: str,
+                 paiva: date, kellonaika: time, kesto: int, hinta: float,
+                 vahvistettu: bool, kohde: str, luotu: datetime) -> None:
+        self.id = id
+        self.nimi = nimi
+        self.sahkoposti = sahkoposti
+        self.puhelin = puhelin
+        self._paiva = paiva.toordinal()
+        self._klo = kellonaika.hour * 60 + kellonaika.minute
+        self.kesto = kesto
+        self.hinta = hinta
+        self.vahvistettu = vahvistettu
+        self.kohde = _internoi_kohde(kohde)
+        self._luotu = luotu.toordinal() * 86400 + luotu.hour * 3600 + luotu.minute * 60 + luotu.second
+
+    @property
+    def paiva(self) -> date:
+        return date.fromordinal(self._paiva)
+
+    @property
+    def kellonaika(self) -> time:
+        return time(*divmod(self._klo, 60))
+
+    @property
+    def luotu(self) -> datetime:
+        paivat, sekunnit = divmod(self._luotu, 86400)
+        return datetime.fromordinal(paivat) + timedelta(seconds=sekunnit)
+
+    def __getitem__(self, avain: str):
+        if avain not in KENTAT:
+            raise KeyError(avain)
+        return getattr(self, avain)
+
+    def get(self, avain: str, oletus=None):
+        return getattr(self, avain) if avain in KENTAT else oletus
+
+    def keys(self):
+        return KENTAT
+
+    def sanakirjaksi(self) -> Dict:
+        """Palauttaa varauksen muunna_varaustiedot-muotoisena sanakirjana."""
+        return {k: getattr(self, k) for k in KENTAT}
+
+    def __eq__(self, toinen) -> bool:
+        if isinstance(toinen, Varaus):
+            toinen = toinen.sanakirjaksi()
+        return self.sanakirjaksi() == toinen
+
+    def __hash__(self) -> int:
+        # Yhtäsuuruus vertaa kaikkia kenttiä, joten tiiviste lasketaan samoista
+        # kentistä. Tietuetta ei pidä muuttaa, kun se on joukossa tai avaimena.
+        return hash(tuple(getattr(self, k) for k in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"Varaus({self.sanakirjaksi()!r})"
+
+
+def muunna_tietueeksi(varaus: List[str]) -> Varaus:
+    """Kuten muunna_varaustiedot, mutta palauttaa tiiviin Varaus-tietueen."""
+    return Varaus(
+        int(varaus[0]),
+        varaus[1].strip(),
+        varaus[2].strip(),
+        varaus[3].strip(),
+        jasenna_paiva(varaus[4]),
+        jasenna_kellonaika(varaus[5]),
+        int(varaus[6]),
+        float(varaus[7]),
+        varaus[8].strip().lower() == "true",
+        varaus[9].strip(),
+        jasenna_aikaleima(varaus[10]),
+    )
+
+
+def _totuusarvo(s: str) -> bool:
+    return s.strip().lower() == "true"
+
+
+# Kenttäkohtaiset muunnokset KENTAT-järjestyksessä (kuten muunna_varaustiedot)
+MUUNTIMET: Tuple[Callable[[str], Any], ...] = (
+    int, str.strip, str.strip, str.strip, jasenna_paiva, jasenna_kellonaika,
+    int, float, _totuusarvo, str.strip, jasenna_aikaleima,
+)
+
+_PUUTTUU = object()
+
+
+class LaiskaVaraus:
+    """Varaus, jonka kentät muunnetaan vasta ensimmäisellä lukukerralla.
+
+    Esim. vahvistusten laskenta lukee vain kentän "vahvistettu", jolloin
+    päivämääriä ei jäsennetä lainkaan.
+    """
+
+    __slots__ = ("_osat", "_arvot")
+
+    def __init__(self, osat: List[str], kentat: Iterable[str] = ()) -> None:
+        self._osat = osat
+        self._arvot = [_PUUTTUU] * len(KENTAT)
+        # Pyydetyt kentät muunnetaan heti, jolloin virheellinen rivi huomataan luettaessa
+        for k in kentat:
+            self._muunna(_INDEKSI[k])
+
+    def _muunna(self, i: int):
+        """Muuntaa kentän i (jos ei jo muunnettu) ja palauttaa sen arvon."""
+        arvo = self._arvot[i]
+        if arvo is _PUUTTUU:
+            arvo = self._arvot[i] = MUUNTIMET[i](self._osat[i])
+        return arvo
+
+    def __getitem__(self, avain: str):
+        return self._muunna(_INDEKSI[avain])
+
+    def get(self, avain: str, oletus=None):
+        return self[avain] if avain in _INDEKSI else oletus
+
+    def keys(self):
+        return KENTAT
+
+    def sanakirjaksi(self) -> Dict:
+        """Muuntaa kaikki kentät ja palauttaa muunna_varaustiedot-muotoisen sanakirjan."""
+        return {k: self[k] for k in KENTAT}
+
+    def __repr__(self) -> str:
+        return f"LaiskaVaraus({'|'.join(self._osat)!r})"
@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Tilakohtainen aikaväli-indeksi varauksille.
+# Jokainen varaus on aikaväli [alku, alku + kesto h) tilassa "kohde". Tilan
+# aikajana on jaettu vuorokauden lokeroihin: lokerossa ovat ne varaukset
+# (minuutteina, alkuhetken mukaan järjestettynä), jotka ovat voimassa jonain
+# hetkenä kyseisenä päivänä. Usean päivän varaus on jokaisen päivänsä lokerossa.
+# Kysely välille [alku, loppu) käy läpi vain välin päivien lokerot, joten sen
+# hinta on O(välin päivät + niiden lokeroiden varaukset) eikä riipu tilan
+# varausten kokonaismäärästä; pitkä varaus näkyy vain omien päiviensä
+# kyselyissä. Lisäys on O(varauksen päivät * lokeron koko), eikä indeksiä
+# tarvitse rakentaa uudelleen.
+#
+# Esim. onko Kokoustila A vapaa 31.10. klo 10:
+#     indeksi.on_vapaa("Kokoustila A", datetime(2025, 10, 31, 10, 0))
+
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _minuutit(hetki: datetime) -> int:
+    """datetime -> minuutit ajanlaskun alusta (kokonaisluku, helppo vertailla)."""
+    return hetki.toordinal() * 1440 + hetki.hour * 60 + hetki.minute
+
+
+def _hetki(minuutit: int) -> datetime:
+    paiva, m = divmod(minuutit, 1440)
+    return datetime.fromordinal(paiva) + timedelta(minutes=m)
+
+
+def varauksen_vali(varaus: Dict) -> Tuple[int, int]:
+    """Varauksen aikaväli minuutteina: (alku, loppu)."""
+    alku = varaus["paiva"].toordinal() * 1440 + varaus["kellonaika"].hour * 60 + varaus["kellonaika"].minute
+    return alku, alku + varaus["kesto"] * 60
+
+
+_PAIVA = 1440
+
+
+class _Tila:
+    """Yhden tilan varaukset päivälokeroittain."""
+
+    __slots__ = ("lokerot", "varaukset")
+
+    def __init__(self) -> None:
+        # päivän numero (minuutit // 1440) -> [(alku, loppu, järjestysnumero)] alun mukaan
+        self.lokerot: Dict[int, List[Tuple[int, int, int]]] = {}
+        self.varaukset: Dict[int, Dict] = {}
+
+    def valit(self) -> Iterator[Tuple[int, int, int]]:
+        """Kaikki tilan välit alkuhetken mukaan järjestettynä."""
+        for paiva in sorted(self.lokerot):
+            for vali in self.lokerot[paiva]:
+                if vali[0] // _PAIVA == paiva:   # vain alkupäivän lokerosta
+                    yield vali
+
+
+class Tilaindeksi:
+    """Varausten aikavälit tiloittain: päällekkäisyys-, vapaa-aika- ja käyttöastekyselyt."""
+
+    def __init__(self, varaukset: Iterable[Dict] = ()) -> None:
+        self._tilat: Dict[str, _Tila] = {}
+        self._n = 0
+        for varaus in varaukset:
+            self.lisaa(varaus)
+
+    def lisaa(self, varaus: Dict) -> None:
+        """Lisää varauksen jokaisen päivänsä lokeroon (lokeron järjestys säilyy)."""
+        tila = self._tilat.setdefault(varaus["kohde"], _Tila())
+        alku, loppu = varauksen_vali(varaus)
+        vali = (alku, loppu, self._n)
+        for paiva in range(alku // _PAIVA, (max(loppu, alku + 1) - 1) // _PAIVA + 1):
+            insort(tila.lokerot.setdefault(paiva, []), vali)
+        tila.varaukset[self._n] = varaus
+        self._n += 1
+
+    def tilat(self) -> List[str]:
+        return list(self._tilat)
+
+    def _osuvat(self, kohde: str, alku: int, loppu: int) -> List[Tuple[int, int, int]]:
+        """Välit, jotka leikkaavat väliä [alku, loppu), alkuhetken mukaan järjestettynä.
+
+        Käy läpi vain välin päivien lokerot. Usean päivän varaus otetaan
+        ensimmäiseltä välille osuvalta päivältään, joten se tulee kerran.
+        """
+        tila = self._tilat.get(kohde)
+        if tila is None or loppu <= alku:
+            return []
+        ensimmainen = alku // _PAIVA
+        osuvat = []
+        for paiva in range(ensimmainen, (loppu - 1) // _PAIVA + 1):
+            lokero = tila.lokerot.get(paiva)
+            if not lokero:
+                continue
+            for k in range(bisect_left(lokero, (loppu,))):
+                vali = lokero[k]
+                if vali[1] > alku and max(vali[0] // _PAIVA, ensimmainen) == paiva:
+                    osuvat.append(vali)
+        return osuvat
+
+    def varaukset_valilla(self, kohde: str, alku: datetime, loppu: datetime) -> List[Dict]:
+        """Tilan varaukset, jotka ovat voimassa jollain hetkellä välillä [alku, loppu)."""
+        tila = self._tilat.get(kohde)
+        return [tila.varaukset[n] for _, _, n in self._osuvat(kohde, _minuutit(alku), _minuutit(loppu))]
+
+    def on_vapaa(self, kohde: str, alku: datetime, loppu: Optional[datetime] = None) -> bool:
+        """Onko tila vapaa hetkellä alku (tai koko välillä [alku, loppu))?"""
+        a = _minuutit(alku)
+        b = _minuutit(loppu) if loppu is not None else a + 1
+        return not self._osuvat(kohde, a, b)
+
+    def _varatut_jaksot(self, kohde: str, alku: int, loppu: int) -> List[Tuple[int, int]]:
+        """Yhdistetyt varatut jaksot välin [alku, loppu) sisällä."""
+        jaksot: List[Tuple[int, int]] = []
+        for a, b, _ in self._osuvat(kohde, alku, loppu):
+            a, b = max(a, alku), min(b, loppu)
+            if jaksot and a <= jaksot[-1][1]:
+                jaksot[-1] = (jaksot[-1][0], max(jaksot[-1][1], b))
+            else:
+                jaksot.append((a, b))
+        return jaksot
+
+    def vapaat_ajat(self, kohde: str, alku: datetime, loppu: datetime) -> List[Tuple[datetime, datetime]]:
+        """Tilan vapaat jaksot välillä [alku, loppu)."""
+        a, b = _minuutit(alku), _minuutit(loppu)
+        vapaat = []
+        kohta = a
+        for va, vb in self._varatut_jaksot(kohde, a, b):
+            if va > kohta:
+                vapaat.append((_hetki(kohta), _hetki(va)))
+            kohta = max(kohta, vb)
+        if kohta < b:
+            vapaat.append((_hetki(kohta), _hetki(b)))
+        return vapaat
+
+    def kayttoaste(self, kohde: str, alku: datetime, loppu: datetime) -> float:
+        """Varattu osuus välistä [alku, loppu), 0.0–1.0 (päällekkäiset varaukset kerran)."""
+        a, b = _minuutit(alku), _minuutit(loppu)
+        if b <= a:
+            return 0.0
+        varattu = sum(vb - va for va, vb in self._varatut_jaksot(kohde, a, b))
+        return varattu / (b - a)
+
+    def paallekkaiset(self, kohde: Optional[str] = None) -> List[Tuple[Dict, Dict]]:
+        """Päällekkäiset varausparit (yhdessä tai kaikissa tiloissa), pyyhkäisyllä."""
+        parit = []
+        for nimi in ([kohde] if kohde is not None else self._tilat):
+            tila = self._tilat.get(nimi)
+            if tila is None:
+                continue
+            avoimet: List[Tuple[int, int]] = []   # (loppu, järjestysnumero)
+            for alku, loppu, n in tila.valit():
+                avoimet = [(b, m) for b, m in avoimet if b > alku]
+                for _, m in avoimet:
+                    parit.append((tila.varaukset[m], tila.varaukset[n]))
+                avoimet.append((loppu, n))
+        return parit
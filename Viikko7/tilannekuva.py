@@ -0,0 +1,276 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Binäärinen sarakemuotoinen tilannekuva varaustiedostosta.
+# kaanna() muuntaa pystyviivatiedoston kerran tiedostoksi, jossa jokainen kenttä
+# on oma kiinteän levyinen sarakkeensa ja merkkijonot (nimi, sahkoposti, puhelin,
+# kohde) ovat yhteisessä merkkijonotaulussa. avaa() muistikartoittaa tiedoston ja
+# tarkistaa vain otsakkeen, joten lataus on käytännössä vakioaikainen; rivit
+# muodostetaan sarakkeista vasta luettaessa. Tilannekuva suljetaan
+# close()-metodilla tai with-lauseella.
+#
+# Tiedostomuoto (little-endian, osiot tasattu 8 tavuun):
+#   otsake   MAGIC (8s), versio (H), rivejä (I), merkkijonoja (I),
+#            lähteen koko (Q), lähteen mtime_ns (q), crc32 datasta (I)
+#   sarakkeet id (q), paiva ordinaali (i), kellonaika minuutteina (h), kesto (i),
+#            hinta (d), vahvistettu (B), luotu sekunteina (q),
+#            nimi, sahkoposti, puhelin, kohde (I, merkkijonotaulun indeksi)
+#   merkkijonotaulu: alkukohdat (I, merkkijonoja + 1) ja UTF-8-data
+# Ajo: python tilannekuva.py [varaustiedosto]
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional
+
+from tietue import KENTAT
+
+MAGIC = b"VARSNAP\0"
+VERSIO = 1
+ERA = 8192   # läpikäynnissä kerralla muodostettavat rivit
+
+_OTSAKE = struct.Struct("<8sHIIQqI")
+# (kenttä, array/memoryview-tyyppikoodi, tavuja)
+_SARAKKEET = (
+    ("id", "q", 8), ("paiva", "i", 4), ("kellonaika", "h", 2), ("kesto", "i", 4),
+    ("hinta", "d", 8), ("vahvistettu", "B", 1), ("luotu", "q", 8),
+    ("nimi", "I", 4), ("sahkoposti", "I", 4), ("puhelin", "I", 4), ("kohde", "I", 4),
+)
+_MERKKIJONOT = ("nimi", "sahkoposti", "puhelin", "kohde")
+
+
+class TilannekuvaVirhe(ValueError):
+    """Tilannekuva on rikki, väärää versiota tai ei vastaa lähdetiedostoa."""
+
+
+def tilannekuvan_polku(varaustiedosto: str) -> str:
+    return varaustiedosto + ".snap"
+
+
+def _tasaa(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _osiot(rivit: int, merkkijonot: int) -> Dict[str, int]:
+    """Laskee osioiden alkukohdat otsakkeen perusteella."""
+    kohta = _tasaa(_OTSAKE.size)
+    osiot = {}
+    for nimi, _, koko in _SARAKKEET:
+        osiot[nimi] = kohta
+        kohta = _tasaa(kohta + rivit * koko)
+    osiot["_alut"] = kohta
+    osiot["_data"] = _tasaa(kohta + (merkkijonot + 1) * 4)
+    return osiot
+
+
+def kaanna(varaustiedosto: str, kohde: Optional[str] = None) -> str:
+    """Kääntää varaustiedoston tilannekuvaksi ja palauttaa sen polun."""
+    # lue_varaukset tuodaan tässä, koska se itse käyttää tätä moduulia
+    from lue_varaukset import hae_varaukset
+
+    kohde = kohde or tilannekuvan_polku(varaustiedosto)
+    st = os.stat(varaustiedosto)
+    varaukset = hae_varaukset(varaustiedosto, tilannekuva=False)
+
+    taulu: Dict[str, int] = {}
+    sarakkeet = {nimi: array(koodi) for nimi, koodi, _ in _SARAKKEET}
+    for v in varaukset:
+        sarakkeet["id"].append(v["id"])
+        sarakkeet["paiva"].append(v["paiva"].toordinal())
+        sarakkeet["kellonaika"].append(v["kellonaika"].hour * 60 + v["kellonaika"].minute)
+        sarakkeet["kesto"].append(v["kesto"])
+        sarakkeet["hinta"].append(v["hinta"])
+        sarakkeet["vahvistettu"].append(1 if v["vahvistettu"] else 0)
+        luotu = v["luotu"]
+        sarakkeet["luotu"].append(luotu.toordinal() * 86400 + luotu.hour * 3600 + luotu.minute * 60 + luotu.second)
+        for k in _MERKKIJONOT:
+            sarakkeet[k].append(taulu.setdefault(v[k], len(taulu)))
+
+    koodatut = [s.encode("utf-8") for s in taulu]
+    alut = array("I", [0])
+    for b in koodatut:
+        alut.append(alut[-1] + len(b))
+
+    osiot = _osiot(len(varaukset), len(koodatut))
+    runko = bytearray(osiot["_data"] - _tasaa(_OTSAKE.size))
+    pohja = _tasaa(_OTSAKE.size)
+    for nimi, _, _ in _SARAKKEET:
+        tavut = sarakkeet[nimi].tobytes()
+        runko[osiot[nimi] - pohja:osiot[nimi] - pohja + len(tavut)] = tavut
+    tavut = alut.tobytes()
+    runko[osiot["_alut"] - pohja:osiot["_alut"] - pohja + len(tavut)] = tavut
+    runko += b"".join(koodatut)
+
+    otsake = _OTSAKE.pack(MAGIC, VERSIO, len(varaukset), len(koodatut),
+                          st.st_size, st.st_mtime_ns, zlib.crc32(runko))
+    tmp = f"{kohde}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(otsake.ljust(pohja, b"\0"))
+        f.write(runko)
+    os.replace(tmp, kohde)
+    return kohde
+
+
+class Tilannekuva(Sequence):
+    """Muistikartoitettu tilannekuva. Käyttäytyy kuin hae_varaukset-lista:
+    len(), indeksointi ja läpikäynti palauttavat varaussanakirjoja.
+    Suljettava käytön jälkeen (close() tai with)."""
+
+    def __init__(self, polku: str, varaustiedosto: Optional[str] = None) -> None:
+        with open(polku, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._avaa(varaustiedosto)
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _avaa(self, varaustiedosto: Optional[str]) -> None:
+        if len(self._mm) < _OTSAKE.size:
+            raise TilannekuvaVirhe("Tilannekuva on liian lyhyt")
+        magic, versio, rivit, merkkijonot, koko, mtime, crc = _OTSAKE.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise TilannekuvaVirhe("Ei varausten tilannekuva")
+        if versio != VERSIO:
+            raise TilannekuvaVirhe(f"Tilannekuvan versio {versio}, odotettiin {VERSIO}")
+        if varaustiedosto is not None:
+            st = os.stat(varaustiedosto)
+            if (st.st_size, st.st_mtime_ns) != (koko, mtime):
+                raise TilannekuvaVirhe("Tilannekuva ei vastaa varaustiedostoa")
+        osiot = _osiot(rivit, merkkijonot)
+        viimeinen_alku = osiot["_alut"] + merkkijonot * 4
+        if len(self._mm) < viimeinen_alku + 4:
+            raise TilannekuvaVirhe("Tilannekuva on katkennut")
+        (datan_koko,) = struct.unpack_from("<I", self._mm, viimeinen_alku)
+        if len(self._mm) != osiot["_data"] + datan_koko:
+            raise TilannekuvaVirhe("Tilannekuvan koko ei täsmää otsakkeeseen")
+        nakyma = self._nakyma = memoryview(self._mm)
+        self._n = rivit
+        self._crc = crc
+        self._sarakkeet = {
+            nimi: nakyma[osiot[nimi]:osiot[nimi] + rivit * koko].cast(koodi)
+            for nimi, koodi, koko in _SARAKKEET
+        }
+        self._alut = nakyma[osiot["_alut"]:osiot["_alut"] + (merkkijonot + 1) * 4].cast("I")
+        self._data = osiot["_data"]
+        self._merkkijonot: Dict[int, str] = {}
+
+    def close(self) -> None:
+        """Vapauttaa sarakenäkymät ja sulkee muistikartoituksen."""
+        if self._mm.closed:
+            return
+        for nakyma in self._sarakkeet.values():
+            nakyma.release()
+        self._alut.release()
+        self._nakyma.release()
+        self._mm.close()
+
+    def __enter__(self) -> "Tilannekuva":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def tarkista(self) -> None:
+        """Tarkistaa koko datan CRC32-summan (lukee koko tiedoston)."""
+        if zlib.crc32(self._mm[_tasaa(_OTSAKE.size):]) != self._crc:
+            raise TilannekuvaVirhe("Tilannekuvan tarkistussumma ei täsmää")
+
+    def _merkkijono(self, i: int) -> str:
+        s = self._merkkijonot.get(i)
+        if s is None:
+            a, b = self._alut[i], self._alut[i + 1]
+            s = self._merkkijonot[i] = self._mm[self._data + a:self._data + b].decode("utf-8")
+        return s
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        s = self._sarakkeet
+        return {
+            "id": s["id"][i],
+            "nimi": self._merkkijono(s["nimi"][i]),
+            "sahkoposti": self._merkkijono(s["sahkoposti"][i]),
+            "puhelin": self._merkkijono(s["puhelin"][i]),
+            "paiva": _paiva(s["paiva"][i]),
+            "kellonaika": _kellonaika(s["kellonaika"][i]),
+            "kesto": s["kesto"][i],
+            "hinta": s["hinta"][i],
+            "vahvistettu": bool(s["vahvistettu"][i]),
+            "kohde": self._merkkijono(s["kohde"][i]),
+            "luotu": _ALKU + timedelta(seconds=s["luotu"][i] - 86400),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Tuottaa rivit järjestyksessä. Rivit muodostetaan ERA rivin erissä
+        sarakkeiden viipaleista (tolist, map ja zip ovat C-tasoisia), mikä on
+        selvästi nopeampaa kuin rivi kerrallaan indeksoiminen."""
+        s = self._sarakkeet
+        merkkijono = self._kaikki_merkkijonot().__getitem__
+        for alku in range(0, self._n, ERA):
+            c = {nimi: s[nimi][alku:alku + ERA].tolist() for nimi, _, _ in _SARAKKEET}
+            arvot = zip(
+                c["id"], map(merkkijono, c["nimi"]), map(merkkijono, c["sahkoposti"]),
+                map(merkkijono, c["puhelin"]), map(_paiva, c["paiva"]),
+                map(_kellonaika, c["kellonaika"]), c["kesto"], c["hinta"],
+                map(bool, c["vahvistettu"]), map(merkkijono, c["kohde"]),
+                map(_ALKU.__add__, map(timedelta, repeat(-1), c["luotu"])),
+            )
+            yield from map(dict, map(zip, repeat(KENTAT), arvot))
+
+    def _kaikki_merkkijonot(self) -> List[str]:
+        """Koko merkkijonotaulu purettuna (läpikäyntiä varten)."""
+        data = self._mm[self._data:self._data + self._alut[-1]]
+        alut = self._alut.tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(alut, alut[1:])]
+
+
+# Luontiaika on sekunteina ordinaalin 0 alusta; ordinaali 1 on _ALKU (1.1.0001)
+_ALKU = datetime(1, 1, 1)
+
+
+@lru_cache(maxsize=65536)
+def _paiva(ordinaali: int) -> date:
+    return date.fromordinal(ordinaali)
+
+
+@lru_cache(maxsize=1440)
+def _kellonaika(minuutit: int) -> time:
+    return time(*divmod(minuutit, 60))
+
+
+def avaa(varaustiedosto: str) -> Optional[Tilannekuva]:
+    """Avaa varaustiedoston tilannekuvan, jos se on olemassa, uudempi kuin
+    tekstitiedosto ja ehjä. Muuten None (käytetään tekstitiedostoa)."""
+    polku = tilannekuvan_polku(varaustiedosto)
+    try:
+        if os.stat(polku).st_mtime_ns < os.stat(varaustiedosto).st_mtime_ns:
+            return None
+        return Tilannekuva(polku, varaustiedosto)
+    except (OSError, TilannekuvaVirhe, struct.error, ValueError, TypeError):
+        return None
+
+
+def main():
+    tiedosto = sys.argv[1] if len(sys.argv) > 1 else "varaukset.txt"
+    kohde = kaanna(tiedosto)
+    with Tilannekuva(kohde, tiedosto) as kuva:
+        kuva.tarkista()
+        print(f"Tilannekuva kirjoitettu: {kohde} ({len(kuva)} varausta)")
+
+
+if __name__ == "__main__":
+    main()
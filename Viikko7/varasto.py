@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Juho Tiihonen
+# This code is licensed under the MIT License.
+# Indeksoitu varausvarasto: varaukset pidetään listassa (alkuperäinen järjestys)
+# ja niiden rinnalla toissijaiset indeksit sekä valmiiksi lasketut yhteenvedot.
+# Raportit käyvät läpi vain ne varaukset, jotka ne tulostavat.
+# Tulot ja tunnit tiloittain ja jaksoittain kootaan samalla kuutioihin (ks. kuutiot.py).
+
+from datetime import date
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from kuutiot import Kuutiot
+
+
+class Varausvarasto:
+    """
+    Varaukset ja niiden indeksit.
+    Indeksit: vahvistettu, kesto, paiva ja kohde -> rivien sijainnit listassa
+    (nousevassa järjestyksessä, joten tulostusjärjestys säilyy).
+    Lisäksi ylläpidetään vahvistettujen määrä ja tulot (kesto * hinta) sekä
+    tulo- ja tuntikuutiot tiloittain päivä-, viikko- ja kuukausitasolla (kuutiot).
+    """
+
+    def __init__(self, varaukset: Iterable[Dict] = ()) -> None:
+        self.varaukset: List[Dict] = []
+        self.vahvistettu: Dict[bool, List[int]] = {True: [], False: []}
+        self.kesto: Dict[int, List[int]] = {}
+        self.paiva: Dict[date, List[int]] = {}
+        self.kohde: Dict[str, List[int]] = {}
+        self.vahvistetut_lkm = 0
+        self._tulot: Optional[float] = None
+        self.kuutiot = Kuutiot()
+        for varaus in varaukset:
+            self.lisaa(varaus)
+
+    def lisaa(self, varaus: Dict) -> None:
+        """Lisää varauksen loppuun ja päivittää indeksit ja yhteenvedot."""
+        i = len(self.varaukset)
+        self.varaukset.append(varaus)
+        self.vahvistettu[varaus["vahvistettu"]].append(i)
+        self.kesto.setdefault(varaus["kesto"], []).append(i)
+        self.paiva.setdefault(varaus["paiva"], []).append(i)
+        self.kohde.setdefault(varaus["kohde"], []).append(i)
+        if varaus["vahvistettu"]:
+            self.vahvistetut_lkm += 1
+            self._tulot = None
+            self.kuutiot.lisaa(varaus)
+
+    @property
+    def vahvistetut_tulot(self) -> float:
+        """Vahvistettujen varausten tulot (kesto * hinta).
+
+        Lasketaan sum()-funktiolla kuten alkuperäisessä (Python 3.12+ summaa
+        kompensoidusti, joten += antaisi eri tuloksen) ja muistetaan, kunnes
+        uusi vahvistettu varaus lisätään.
+        """
+        if self._tulot is None:
+            self._tulot = sum(v["kesto"] * v["hinta"] for v in self.vahvistetut())
+        return self._tulot
+
+    def __len__(self) -> int:
+        return len(self.varaukset)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.varaukset)
+
+    def _hae(self, sijainnit: Iterable[int]) -> Iterator[Dict]:
+        return (self.varaukset[i] for i in sijainnit)
+
+    def vahvistetut(self, vahvistettu: bool = True) -> Iterator[Dict]:
+        """Vahvistetut (tai vahvistamattomat) varaukset alkuperäisessä järjestyksessä."""
+        return self._hae(self.vahvistettu[vahvistettu])
+
+    def kesto_vahintaan(self, tunnit: int) -> Iterator[Dict]:
+        """Varaukset, joiden kesto >= tunnit, alkuperäisessä järjestyksessä."""
+        listat = [s for k, s in self.kesto.items() if k >= tunnit]
+        return self._hae(merge(*listat))
+
+    def paivalla(self, paiva: date) -> Iterator[Dict]:
+        """Annetun päivän varaukset."""
+        return self._hae(self.paiva.get(paiva, []))
+
+    def kohteessa(self, kohde: str) -> Iterator[Dict]:
+        """Annetun tilan varaukset."""
+        return self._hae(self.kohde.get(kohde, []))
@@ -0,0 +1,9 @@
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Viikkokansioiden yhteiset apumoduulit (esim. raporttikirjoitin).
+
+Viikkokansiot ovat erillisiä skriptejä, joten ne lataavat tämän paketin
+tiedostopolusta importlibillä muuttamatta sys.pathia (ks.
+Viikko5b/kirjoitafunktio.py ja Viikko6/kirjaaja_v6.py).
+"""
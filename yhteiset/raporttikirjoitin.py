@@ -0,0 +1,46 @@
+
+# Copyright (c) 2025 Juho Tiihonen
+# License: MIT
+
+"""Yhteinen raporttien kirjoittaja (Viikko5b ja Viikko6).
+
+Rivit (lista tai generaattori) yhdistetään erissä suureen puskuriin ja
+kirjoitetaan väliaikaistiedostoon samaan hakemistoon, joka nimetään
+lopuksi atomisesti kohteen päälle. Kesken kaatunut ajo ei jätä katkennutta
+raporttia, eikä koko raporttia tarvitse pitää muistissa.
+
+Viikkokansiot ovat erillisiä skriptejä, joten ne lataavat yhteiset-paketin
+tiedostopolusta (ks. yhteiset/__init__.py).
+"""
+
+import os
+from itertools import islice
+from typing import Iterable
+
+# Kerralla yhdistettävien rivien määrä (yksi write-kutsu per erä)
+ERAKOKO = 10_000
+PUSKURI = 1 << 20
+
+
+def kirjoita_atomisesti(rivit: Iterable[str], polku: str) -> None:
+    """Kirjoittaa rivit polkuun UTF-8-koodauksella, kukin rivinvaihdolla päätettynä.
+
+    Virhetilanteessa väliaikaistiedosto poistetaan, vanha raportti säilyy
+    ehjänä ja virhe nostetaan kutsujalle.
+    """
+    tmp = f"{polku}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8", buffering=PUSKURI) as f:
+            rivit = iter(rivit)
+            while True:
+                era = list(islice(rivit, ERAKOKO))
+                if not era:
+                    break
+                f.write("\n".join(era) + "\n")
+        os.replace(tmp, polku)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise